@@ -3,19 +3,30 @@ FastAPI REST API for Sistema de Indicadores
 Provides endpoints for managing indicators, hitos, actividades, and monthly progress reporting
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
-from datetime import datetime
-
-from src.database import Database
+from fastapi.responses import StreamingResponse
+import asyncio
+import hashlib
+import time
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from typing import Dict, Iterator, List, Optional, Tuple, get_args
+from datetime import datetime, date
+
+from src.async_database import AsyncDatabase
+from src.database import _env_float, _env_int
+from src.instrumentation import current_request, serializing
+from src.pool import PoolTimeout
+from src import metrics, server_timing
 from src.schemas import (
     IndicadorCreate, IndicadorUpdate, IndicadorResponse,
     HitoCreate, HitoUpdate, HitoResponse,
     ActividadCreate, ActividadUpdate, ActividadResponse,
     AvanceMensualCreate, AvanceMensualResponse,
-    DashboardStats, IndicadorJerarquia, HitoJerarquia, ActividadJerarquia,
-    MessageResponse, ErrorResponse
+    AvanceMensualBatchCreate, AvanceMensualBatchResponse,
+    DashboardStats, DashboardBundle, IndicadorJerarquia, HitoJerarquia, ActividadJerarquia,
+    MessageResponse, AvanceMensualRegistroResponse, ErrorResponse
 )
 
 # Initialize FastAPI app
@@ -26,6 +37,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc"
 )
+# Time endpoints apart from validation/serialization (Server-Timing)
+app.router.route_class = server_timing.TimedRoute
 
 # Configure CORS
 app.add_middleware(
@@ -34,16 +47,200 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag", "Server-Timing"],
 )
 
-# Initialize database
-db = Database()
+# Request counters and latency histograms for /metrics
+request_metrics = metrics.RequestMetrics()
+app.add_middleware(metrics.MetricsMiddleware, metrics=request_metrics)
+
+# Server-Timing header and one JSON log line per request (env REQUEST_TIMING_LOG=0 to silence the log)
+request_log = _env_int('REQUEST_TIMING_LOG', 1) > 0
+if request_log:
+    server_timing.log_to_stderr()
+app.add_middleware(server_timing.ServerTimingMiddleware, log=request_log)
+
+# Initialize database (async facade; blocking driver calls run on its own threads)
+db = AsyncDatabase()
+
+# Readiness fails when the database probe takes longer than this (env HEALTH_DB_LATENCY_BUDGET_MS)
+HEALTH_LATENCY_BUDGET_MS = _env_float('HEALTH_DB_LATENCY_BUDGET_MS', 500.0)
+STARTED_AT = time.monotonic()
+
+
+def conditional(*entities: str, max_age: Optional[int] = None):
+    """
+    Dependency adding a strong ETag built from the data_version counters
+    
+    The tag covers the request path, query and Accept header plus the
+    versions of the given entities, so it is known before any table is read. A matching
+    If-None-Match short-circuits the request with 304 Not Modified.
+    
+    Args:
+        *entities: data_version entities the response depends on
+        max_age: Seconds clients/proxies may reuse the response without asking
+                 (default: must revalidate on every use)
+    """
+    cache_control = f"public, max-age={max_age}" if max_age else "no-cache"
+    
+    async def check(request: Request, response: Response):
+        versions = await db.get_data_version()
+        accept = request.headers.get("accept", "")
+        fingerprint = f"{request.url.path}?{request.url.query}|{accept}|" + ",".join(
+            f"{entity}={versions.get(entity, 0)}" for entity in entities
+        )
+        etag = '"' + hashlib.sha1(fingerprint.encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if etag in tags or "*" in tags:
+                raise HTTPException(status_code=304, headers=headers)
+        
+        response.headers.update(headers)
+    
+    return check
+
+
+# Precompiled validators/serializers for the list endpoints
+INDICADOR_LIST = TypeAdapter(List[IndicadorResponse])
+HITO_LIST = TypeAdapter(List[HitoResponse])
+ACTIVIDAD_LIST = TypeAdapter(List[ActividadResponse])
+AVANCE_MENSUAL_LIST = TypeAdapter(List[AvanceMensualResponse])
+
+
+def _forward_headers(response: Response) -> Dict[str, str]:
+    """Headers set on the injected response (ETag, Server-Timing, ...) to copy onto a returned one"""
+    return {key: value for key, value in response.headers.items() if key != "content-length"}
+
+
+def paginated(response: Response, page: Dict, adapter: TypeAdapter) -> Response:
+    """
+    Validate a page of plain records in bulk and encode it straight to JSON
+    
+    Skips the DataFrame and FastAPI's per-row response_model/jsonable_encoder
+    pass: the adapter validates the whole list against the schema and
+    pydantic-core writes the JSON bytes. X-Next-Cursor carries the cursor of
+    the next page (absent on the last one) and X-Total-Count the number of
+    matching rows when include_total was set.
+    """
+    headers = _forward_headers(response)
+    if page['next_cursor']:
+        headers["X-Next-Cursor"] = page['next_cursor']
+    if page['total'] is not None:
+        headers["X-Total-Count"] = str(page['total'])
+    
+    with serializing():
+        body = adapter.dump_json(adapter.validate_python(page['items']))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True if the client asked for newline-delimited JSON (Accept: application/x-ndjson)"""
+    return NDJSON in request.headers.get("accept", "")
+
+
+def ndjson(response: Response, rows: Iterator[Dict], model, batch_size: int = 500) -> StreamingResponse:
+    """
+    Stream rows as newline-delimited JSON, one validated object per line
+    
+    Rows come from a Database.stream_* generator, so memory stays bounded by
+    batch_size whatever the result size. Lines are sent in chunks of
+    batch_size to keep the per-chunk overhead low.
+    """
+    headers = _forward_headers(response)
+    
+    def lines():
+        # Rows are fetched lazily: only the encoding is timed as serialization
+        timing = current_request()
+        encode_ms = 0.0
+        chunk = []
+        for row in rows:
+            started = time.perf_counter()
+            chunk.append(model.model_validate(row).model_dump_json())
+            encode_ms += time.perf_counter() - started
+            if len(chunk) >= batch_size:
+                if timing is not None:
+                    timing.serialization(encode_ms * 1000)
+                    encode_ms = 0.0
+                yield "\n".join(chunk) + "\n"
+                chunk = []
+        if timing is not None:
+            timing.serialization(encode_ms * 1000)
+        if chunk:
+            yield "\n".join(chunk) + "\n"
+    
+    return StreamingResponse(lines(), media_type=NDJSON, headers=headers)
+
+
+# Columnar output formats (?format=...) and their media types
+COLUMNAR_FORMATS = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "columnar-json": "application/json",
+}
+FORMAT_PATTERN = "^(arrow|parquet|columnar-json)$"
+
+
+def column_types(model) -> Dict[str, type]:
+    """Column -> Python type of a response model (Optional unwrapped)"""
+    types = {}
+    for name, field in model.model_fields.items():
+        args = [arg for arg in get_args(field.annotation) if arg is not type(None)]
+        types[name] = args[0] if args else field.annotation
+    return types
+
+
+# Column types and per-column validators of each exportable listing
+COLUMN_TYPES = {
+    'indicadores': column_types(IndicadorResponse),
+    'hitos': column_types(HitoResponse),
+    'actividades': column_types(ActividadResponse),
+    'avance_mensual': column_types(AvanceMensualResponse),
+}
+COLUMN_ADAPTERS = {
+    entity: {col: TypeAdapter(List[Optional[tp]]) for col, tp in types.items()}
+    for entity, types in COLUMN_TYPES.items()
+}
+
+
+async def columnar(response: Response, fmt: str, entity: str, **filters) -> Response:
+    """
+    Return a full listing in a columnar format for analytics clients
+    
+    arrow is an Arrow IPC stream, parquet a Parquet file (both need pyarrow
+    on the server, 501 otherwise) and columnar-json an object mapping each
+    column name to the list of its values. Columns are typed after the
+    response model of the listing. Filters are those of the JSON listing;
+    pagination does not apply.
+    """
+    headers = _forward_headers(response)
+    try:
+        if fmt == "arrow":
+            body = await db.export_arrow(entity, COLUMN_TYPES[entity], **filters)
+        elif fmt == "parquet":
+            body = await db.export_parquet(entity, COLUMN_TYPES[entity], **filters)
+        else:
+            columns = await db.export_columns(entity, **filters)
+            adapters = COLUMN_ADAPTERS[entity]
+            with serializing():
+                for col, values in columns.items():
+                    if col in adapters:
+                        columns[col] = adapters[col].validate_python(values)
+                body = to_json(columns)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return Response(content=body, media_type=COLUMNAR_FORMATS[fmt], headers=headers)
 
 
 # ==================== ROOT ====================
 
 @app.get("/", tags=["Root"])
-def root():
+async def root():
     """API root endpoint"""
     return {
         "message": "Sistema de Indicadores API",
@@ -55,41 +252,73 @@ def root():
 
 # ==================== INDICADORES ====================
 
-@app.get("/api/indicadores", response_model=List[IndicadorResponse], tags=["Indicadores"])
-def get_indicadores(
-    area: Optional[str] = Query(None, description="Filtrar por área"),
-    año: Optional[int] = Query(None, description="Filtrar por año"),
-    unidad_organizacional: Optional[str] = Query(None, description="Filtrar por unidad organizacional"),
-    tipo_indicador: Optional[str] = Query(None, description="Filtrar por tipo de indicador"),
-    estado: Optional[str] = Query(None, description="Filtrar por estado"),
-    responsable: Optional[str] = Query(None, description="Filtrar por responsable")
+@app.get("/api/indicadores", response_model=List[IndicadorResponse], tags=["Indicadores"], dependencies=[Depends(conditional('indicadores'))])
+async def get_indicadores(
+    request: Request,
+    response: Response,
+    area: Optional[List[str]] = Query(None, description="Filtrar por área (repetible)"),
+    año: Optional[List[int]] = Query(None, description="Filtrar por año (repetible)"),
+    unidad_organizacional: Optional[List[str]] = Query(None, description="Filtrar por unidad organizacional (repetible)"),
+    tipo_indicador: Optional[List[str]] = Query(None, description="Filtrar por tipo de indicador (repetible)"),
+    estado: Optional[List[str]] = Query(None, description="Filtrar por estado (repetible)"),
+    responsable: Optional[List[str]] = Query(None, description="Filtrar por responsable (repetible)"),
+    fecha_inicio_desde: Optional[date] = Query(None, description="Fecha de inicio desde (inclusive)"),
+    fecha_inicio_hasta: Optional[date] = Query(None, description="Fecha de inicio hasta (inclusive)"),
+    fecha_fin_desde: Optional[date] = Query(None, description="Fecha de fin actual desde (inclusive)"),
+    fecha_fin_hasta: Optional[date] = Query(None, description="Fecha de fin actual hasta (inclusive)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página (sin límite si se omite)"),
+    cursor: Optional[str] = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    sort: str = Query("created_at", description="Orden: created_at o id"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Dirección del orden"),
+    include_total: bool = Query(False, description="Incluir X-Total-Count"),
+    fmt: Optional[str] = Query(None, alias="format", pattern=FORMAT_PATTERN, description="Formato columnar: arrow, parquet o columnar-json")
 ):
-    """Get all indicators with optional filters"""
+    """
+    Get all indicators with optional filters, paginated by cursor
+    
+    With Accept: application/x-ndjson every matching row is streamed instead.
+    """
     try:
-        df = db.get_all_indicadores(
+        filters = dict(
             area=area,
             año=año,
             unidad_organizacional=unidad_organizacional,
             tipo_indicador=tipo_indicador,
-            estado=estado
+            estado=estado,
+            responsable=responsable,
+            fecha_inicio_desde=fecha_inicio_desde,
+            fecha_inicio_hasta=fecha_inicio_hasta,
+            fecha_fin_desde=fecha_fin_desde,
+            fecha_fin_hasta=fecha_fin_hasta
         )
+        if fmt:
+            return await columnar(response, fmt, 'indicadores', **filters)
+        if wants_ndjson(request):
+            return ndjson(response, await db.stream_indicadores(**filters), IndicadorResponse)
         
-        # Apply responsable filter if provided
-        if responsable:
-            df = df[df['responsable'] == responsable]
-        
-        # Convert DataFrame to list of dicts
-        indicadores = df.to_dict('records')
-        return indicadores
+        page = await db.get_indicadores_page(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            descending=order == "desc",
+            with_total=include_total,
+            as_records=True,
+            **filters
+        )
+        return paginated(response, page, INDICADOR_LIST)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/indicadores/{indicador_id}", response_model=IndicadorResponse, tags=["Indicadores"])
-def get_indicador(indicador_id: int):
+@app.get("/api/indicadores/{indicador_id}", response_model=IndicadorResponse, tags=["Indicadores"], dependencies=[Depends(conditional('indicadores'))])
+async def get_indicador(indicador_id: int):
     """Get a specific indicator by ID"""
     try:
-        indicador = db.get_indicador_by_id(indicador_id)
+        indicador = await db.get_indicador_by_id(indicador_id)
         if not indicador:
             raise HTTPException(status_code=404, detail="Indicador no encontrado")
         return indicador
@@ -100,10 +329,10 @@ def get_indicador(indicador_id: int):
 
 
 @app.post("/api/indicadores", response_model=MessageResponse, status_code=201, tags=["Indicadores"])
-def create_indicador(indicador: IndicadorCreate):
+async def create_indicador(indicador: IndicadorCreate):
     """Create a new indicator (Admin only)"""
     try:
-        record_id = db.create_indicador(
+        record_id = await db.create_indicador(
             id_estrategico=indicador.id_estrategico,
             año=indicador.año,
             indicador=indicador.indicador,
@@ -127,10 +356,10 @@ def create_indicador(indicador: IndicadorCreate):
 
 
 @app.delete("/api/indicadores/{indicador_id}", response_model=MessageResponse, tags=["Indicadores"])
-def delete_indicador(indicador_id: int):
+async def delete_indicador(indicador_id: int):
     """Delete an indicator (Admin only)"""
     try:
-        success = db.delete_indicador(indicador_id)
+        success = await db.delete_indicador(indicador_id)
         if not success:
             raise HTTPException(status_code=404, detail="Indicador no encontrado")
         return MessageResponse(message="Indicador eliminado exitosamente", success=True)
@@ -140,50 +369,16 @@ def delete_indicador(indicador_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/indicadores/{indicador_id}/jerarquia", response_model=IndicadorJerarquia, tags=["Indicadores"])
-def get_indicador_jerarquia(indicador_id: int):
+@app.get("/api/indicadores/{indicador_id}/jerarquia", response_model=IndicadorJerarquia, tags=["Indicadores"], dependencies=[Depends(conditional('indicadores', 'hitos', 'actividades'))])
+async def get_indicador_jerarquia(indicador_id: int):
     """Get indicator with full hierarchy (hitos and actividades)"""
     try:
-        # Get indicator
-        indicador = db.get_indicador_by_id(indicador_id)
-        if not indicador:
+        # Indicator, hitos and actividades in a fixed number of queries
+        tree = await db.load_hierarchy([indicador_id])
+        if not tree:
             raise HTTPException(status_code=404, detail="Indicador no encontrado")
         
-        # Get hitos
-        hitos_df = db.get_hitos_by_indicador(indicador_id)
-        hitos = []
-        
-        for _, hito in hitos_df.iterrows():
-            # Get actividades for this hito
-            actividades_df = db.get_actividades_by_hito(hito['id'])
-            actividades = [
-                ActividadJerarquia(
-                    id=act['id'],
-                    descripcion_actividad=act['descripcion_actividad'],
-                    responsable=act.get('responsable'),
-                    estado_actividad=act['estado_actividad'],
-                    ultimo_avance_reportado=act.get('ultimo_avance_reportado', 0)
-                )
-                for _, act in actividades_df.iterrows()
-            ]
-            
-            hitos.append(HitoJerarquia(
-                id=hito['id'],
-                nombre=hito['nombre'],
-                responsable=hito.get('responsable'),
-                estado=hito['estado'],
-                ultimo_avance_reportado=hito.get('ultimo_avance_reportado', hito.get('avance_porcentaje', 0)),
-                actividades=actividades
-            ))
-        
-        return IndicadorJerarquia(
-            id=indicador['id'],
-            indicador=indicador['indicador'],
-            responsable=indicador.get('responsable'),
-            avance_porcentaje=indicador['avance_porcentaje'],
-            estado=indicador['estado'],
-            hitos=hitos
-        )
+        return IndicadorJerarquia.model_validate(tree[0])
     except HTTPException:
         raise
     except Exception as e:
@@ -192,40 +387,80 @@ def get_indicador_jerarquia(indicador_id: int):
 
 # ==================== HITOS ====================
 
-@app.get("/api/hitos", response_model=List[HitoResponse], tags=["Hitos"])
-def get_hitos(
-    responsable: Optional[str] = Query(None, description="Filtrar por responsable")
+@app.get("/api/hitos", response_model=List[HitoResponse], tags=["Hitos"], dependencies=[Depends(conditional('hitos', 'indicadores'))])
+async def get_hitos(
+    request: Request,
+    response: Response,
+    indicador_id: Optional[List[int]] = Query(None, description="Filtrar por indicador (repetible)"),
+    estado: Optional[List[str]] = Query(None, description="Filtrar por estado (repetible)"),
+    responsable: Optional[List[str]] = Query(None, description="Filtrar por responsable (repetible)"),
+    fecha_fin_desde: Optional[date] = Query(None, description="Fecha fin planificada desde (inclusive)"),
+    fecha_fin_hasta: Optional[date] = Query(None, description="Fecha fin planificada hasta (inclusive)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página (sin límite si se omite)"),
+    cursor: Optional[str] = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    include_total: bool = Query(False, description="Incluir X-Total-Count"),
+    fmt: Optional[str] = Query(None, alias="format", pattern=FORMAT_PATTERN, description="Formato columnar: arrow, parquet o columnar-json")
 ):
-    """Get all hitos with optional filters"""
+    """
+    Get all hitos with optional filters, paginated by cursor
+    
+    With Accept: application/x-ndjson every matching row is streamed instead.
+    """
     try:
-        if responsable:
-            df = db.get_hitos_by_responsable(responsable)
-        else:
-            # Get all hitos (need to implement this in database.py if not exists)
-            df = db.get_hitos_by_responsable("")  # Returns all for now
+        filters = dict(
+            indicador_id=indicador_id,
+            estado=estado,
+            responsable=responsable,
+            fecha_fin_desde=fecha_fin_desde,
+            fecha_fin_hasta=fecha_fin_hasta
+        )
+        if fmt:
+            return await columnar(response, fmt, 'hitos', **filters)
+        if wants_ndjson(request):
+            return ndjson(response, await db.stream_hitos(**filters), HitoResponse)
         
-        hitos = df.to_dict('records')
-        return hitos
+        page = await db.get_all_hitos(
+            **filters,
+            limit=limit,
+            cursor=cursor,
+            with_total=include_total,
+            as_records=True
+        )
+        return paginated(response, page, HITO_LIST)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/indicadores/{indicador_id}/hitos", response_model=List[HitoResponse], tags=["Hitos"])
-def get_hitos_by_indicador(indicador_id: int):
-    """Get all hitos for a specific indicator"""
+@app.get("/api/indicadores/{indicador_id}/hitos", response_model=List[HitoResponse], tags=["Hitos"], dependencies=[Depends(conditional('hitos'))])
+async def get_hitos_by_indicador(
+    indicador_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página (sin límite si se omite)"),
+    cursor: Optional[str] = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    include_total: bool = Query(False, description="Incluir X-Total-Count")
+):
+    """Get all hitos for a specific indicator, paginated by cursor"""
     try:
-        df = db.get_hitos_by_indicador(indicador_id)
-        hitos = df.to_dict('records')
-        return hitos
+        page = await db.get_hitos_page(
+            indicador_id, limit=limit, cursor=cursor, with_total=include_total,
+            as_records=True
+        )
+        return paginated(response, page, HITO_LIST)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/hitos", response_model=MessageResponse, status_code=201, tags=["Hitos"])
-def create_hito(hito: HitoCreate):
+async def create_hito(hito: HitoCreate):
     """Create a new hito (Admin only)"""
     try:
-        hito_id = db.create_hito(
+        hito_id = await db.create_hito(
             indicador_id=hito.indicador_id,
             nombre=hito.nombre,
             descripcion=hito.descripcion,
@@ -243,25 +478,20 @@ def create_hito(hito: HitoCreate):
 
 
 @app.delete("/api/hitos/{hito_id}", response_model=MessageResponse, tags=["Hitos"])
-def delete_hito(hito_id: int):
+async def delete_hito(hito_id: int):
     """Delete a hito (Admin only)"""
-    try:
+    def delete(uow):
         # Get indicator_id before deleting
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        placeholder = "%s" if db.db_type == 'postgresql' else "?"
-        cursor.execute(f"SELECT indicador_id FROM hitos WHERE id = {placeholder}", (hito_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        success = db.delete_hito(hito_id)
-        if not success:
+        indicador_id = uow.db.get_indicador_id_by_hito(hito_id, uow=uow)
+        if not uow.db.delete_hito(hito_id, uow=uow):
+            return False
+        if indicador_id:
+            uow.db.update_indicador_from_hitos(indicador_id, uow=uow)
+        return True
+    
+    try:
+        if not await db.transaction(delete):
             raise HTTPException(status_code=404, detail="Hito no encontrado")
-            
-        if row:
-            indicador_id = row['indicador_id'] if isinstance(row, dict) else row[0]
-            db.update_indicador_from_hitos(indicador_id)
-            
         return MessageResponse(message="Hito eliminado exitosamente", success=True)
     except HTTPException:
         raise
@@ -271,41 +501,71 @@ def delete_hito(hito_id: int):
 
 # ==================== ACTIVIDADES ====================
 
-@app.get("/api/actividades", response_model=List[ActividadResponse], tags=["Actividades"])
-def get_actividades(
-    responsable: Optional[str] = Query(None, description="Filtrar por responsable")
+@app.get("/api/actividades", response_model=List[ActividadResponse], tags=["Actividades"], dependencies=[Depends(conditional('actividades', 'hitos', 'indicadores'))])
+async def get_actividades(
+    request: Request,
+    response: Response,
+    hito_id: Optional[List[int]] = Query(None, description="Filtrar por hito (repetible)"),
+    indicador_id: Optional[List[int]] = Query(None, description="Filtrar por indicador (repetible)"),
+    estado: Optional[List[str]] = Query(None, description="Filtrar por estado de la actividad (repetible)"),
+    responsable: Optional[List[str]] = Query(None, description="Filtrar por responsable (repetible)"),
+    fecha_fin_desde: Optional[date] = Query(None, description="Fecha fin planificada desde (inclusive)"),
+    fecha_fin_hasta: Optional[date] = Query(None, description="Fecha fin planificada hasta (inclusive)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página (sin límite si se omite)"),
+    cursor: Optional[str] = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    include_total: bool = Query(False, description="Incluir X-Total-Count"),
+    fmt: Optional[str] = Query(None, alias="format", pattern=FORMAT_PATTERN, description="Formato columnar: arrow, parquet o columnar-json")
 ):
-    """Get all actividades with optional filters"""
+    """
+    Get all actividades with optional filters, paginated by cursor
+    
+    With Accept: application/x-ndjson every matching row is streamed instead.
+    """
     try:
-        if responsable:
-            df = db.get_actividades_by_responsable(responsable)
-        else:
-            # For now, return empty list if no filter
-            # Could implement get_all_actividades in database.py
-            return []
+        filters = dict(
+            hito_id=hito_id,
+            indicador_id=indicador_id,
+            estado=estado,
+            responsable=responsable,
+            fecha_fin_desde=fecha_fin_desde,
+            fecha_fin_hasta=fecha_fin_hasta
+        )
+        if fmt:
+            return await columnar(response, fmt, 'actividades', **filters)
+        if wants_ndjson(request):
+            return ndjson(response, await db.stream_actividades(**filters), ActividadResponse)
         
-        actividades = df.to_dict('records')
-        return actividades
+        page = await db.get_all_actividades(
+            **filters,
+            limit=limit,
+            cursor=cursor,
+            with_total=include_total,
+            as_records=True
+        )
+        return paginated(response, page, ACTIVIDAD_LIST)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/hitos/{hito_id}/actividades", response_model=List[ActividadResponse], tags=["Actividades"])
-def get_actividades_by_hito(hito_id: int):
+@app.get("/api/hitos/{hito_id}/actividades", response_model=List[ActividadResponse], tags=["Actividades"], dependencies=[Depends(conditional('actividades'))])
+async def get_actividades_by_hito(hito_id: int, response: Response):
     """Get all actividades for a specific hito"""
     try:
-        df = db.get_actividades_by_hito(hito_id)
-        actividades = df.to_dict('records')
-        return actividades
+        actividades = await db.get_actividades_by_hito(hito_id, as_records=True)
+        return paginated(response, {'items': actividades, 'next_cursor': None, 'total': None}, ACTIVIDAD_LIST)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/actividades", response_model=MessageResponse, status_code=201, tags=["Actividades"])
-def create_actividad(actividad: ActividadCreate):
+async def create_actividad(actividad: ActividadCreate):
     """Create a new actividad (Admin only)"""
     try:
-        actividad_id = db.create_actividad(
+        actividad_id = await db.create_actividad(
             hito_id=actividad.hito_id,
             descripcion_actividad=actividad.descripcion_actividad,
             fecha_inicio_plan=str(actividad.fecha_inicio_plan) if actividad.fecha_inicio_plan else None,
@@ -320,10 +580,10 @@ def create_actividad(actividad: ActividadCreate):
 
 
 @app.delete("/api/actividades/{actividad_id}", response_model=MessageResponse, tags=["Actividades"])
-def delete_actividad(actividad_id: int):
+async def delete_actividad(actividad_id: int):
     """Delete an actividad (Admin only)"""
     try:
-        success = db.delete_actividad(actividad_id)
+        success = await db.delete_actividad(actividad_id)
         if not success:
             raise HTTPException(status_code=404, detail="Actividad no encontrada")
         return MessageResponse(message="Actividad eliminada exitosamente", success=True)
@@ -335,49 +595,130 @@ def delete_actividad(actividad_id: int):
 
 # ==================== AVANCE MENSUAL ====================
 
-@app.post("/api/avance-mensual", response_model=MessageResponse, status_code=201, tags=["Avance Mensual"])
-def registrar_avance_mensual(avance: AvanceMensualCreate):
-    """Register monthly progress report (Owner only)"""
-    try:
-        success = db.registrar_avance_mensual(
+@app.post("/api/avance-mensual", response_model=AvanceMensualRegistroResponse, status_code=201, tags=["Avance Mensual"])
+async def registrar_avance_mensual(avance: AvanceMensualCreate, response: Response):
+    """
+    Register monthly progress report (Owner only)
+    
+    on_conflict decides what happens if the month was already reported:
+    reject (400), overwrite or keep_latest (200 with status updated/skipped).
+    """
+    def register(uow):
+        result = uow.db.upsert_avance_mensual(
             entidad=avance.entidad,
             id_entidad=avance.id_entidad,
             avance_reportado=avance.avance_reportado,
             usuario=avance.usuario,
-            mes=avance.mes
+            mes=avance.mes,
+            on_conflict=avance.on_conflict,
+            fecha_reporte=avance.fecha_reporte.isoformat() if avance.fecha_reporte else None,
+            uow=uow
         )
+        # Update indicator progress if it's a hito
+        if result.written and avance.entidad == 'hito':
+            indicador_id = uow.db.get_indicador_id_by_hito(avance.id_entidad, uow=uow)
+            if indicador_id:
+                uow.db.update_indicador_from_hitos(indicador_id, uow=uow)
+        return result
+    
+    try:
+        result = await db.transaction(register)
         
-        if not success:
+        if result.status == 'skipped' and avance.on_conflict == 'reject':
             raise HTTPException(
                 status_code=400, 
                 detail="Ya existe un reporte para este mes. No se puede reportar dos veces en el mismo mes."
             )
         
-        # Update indicator progress if it's a hito
-        if avance.entidad == 'hito':
-            # Get the indicador_id from the hito
-            indicador_id = db.get_indicador_id_by_hito(avance.id_entidad)
-            if indicador_id:
-                db.update_indicador_from_hitos(indicador_id)
+        messages = {
+            'inserted': "Avance mensual registrado exitosamente",
+            'updated': "Avance mensual actualizado",
+            'skipped': "Se mantiene el reporte existente (más reciente)",
+        }
+        if result.status != 'inserted':
+            response.status_code = 200
+        return AvanceMensualRegistroResponse(
+            message=f"{messages[result.status]} para {avance.entidad} ID {avance.id_entidad}",
+            success=result.written,
+            status=result.status,
+            mes=result.mes,
+            avance_reportado=result.avance_reportado,
+            avance_anterior=result.avance_anterior
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/avance-mensual/batch", response_model=AvanceMensualBatchResponse, status_code=201, tags=["Avance Mensual"])
+async def registrar_avances_mensuales_batch(batch: AvanceMensualBatchCreate):
+    """
+    Register monthly progress for many hitos/actividades in one transaction (Owner only)
+    
+    Items already reported for the month are listed in 'duplicados' instead of failing the batch.
+    """
+    try:
+        result = await db.registrar_avances_mensuales_bulk(
+            reportes=[item.model_dump() for item in batch.reportes],
+            usuario=batch.usuario,
+            mes=batch.mes
+        )
+        return AvanceMensualBatchResponse(**result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/avance-mensual", response_model=List[AvanceMensualResponse], tags=["Avance Mensual"], dependencies=[Depends(conditional('avance_mensual'))])
+async def get_avances_mensuales(
+    request: Request,
+    response: Response,
+    entidad: Optional[str] = Query(None, pattern="^(hito|actividad)$", description="Filtrar por entidad"),
+    mes_desde: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Mes desde (YYYY-MM, inclusive)"),
+    mes_hasta: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Mes hasta (YYYY-MM, inclusive)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página (sin límite si se omite)"),
+    cursor: Optional[str] = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    include_total: bool = Query(False, description="Incluir X-Total-Count"),
+    fmt: Optional[str] = Query(None, alias="format", pattern=FORMAT_PATTERN, description="Formato columnar: arrow, parquet o columnar-json")
+):
+    """
+    Get the monthly reports of every hito and actividad, paginated by cursor
+    
+    With Accept: application/x-ndjson every matching report is streamed instead.
+    """
+    try:
+        filters = dict(entidad=entidad, mes_desde=mes_desde, mes_hasta=mes_hasta)
+        if fmt:
+            return await columnar(response, fmt, 'avance_mensual', **filters)
+        if wants_ndjson(request):
+            return ndjson(response, await db.stream_avance_mensual(**filters), AvanceMensualResponse)
         
-        return MessageResponse(
-            message=f"Avance mensual registrado exitosamente para {avance.entidad} ID {avance.id_entidad}",
-            success=True
+        page = await db.get_all_avances_mensuales(
+            **filters,
+            limit=limit,
+            cursor=cursor,
+            with_total=include_total,
+            as_records=True
         )
+        return paginated(response, page, AVANCE_MENSUAL_LIST)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/avance-mensual/{entidad}/{id_entidad}", response_model=AvanceMensualResponse, tags=["Avance Mensual"])
-def get_avance_mensual_actual(entidad: str, id_entidad: int):
+@app.get("/api/avance-mensual/{entidad}/{id_entidad}", response_model=AvanceMensualResponse, tags=["Avance Mensual"], dependencies=[Depends(conditional('avance_mensual'))])
+async def get_avance_mensual_actual(entidad: str, id_entidad: int):
     """Get the latest monthly progress report for an entity"""
     try:
         if entidad not in ['hito', 'actividad']:
             raise HTTPException(status_code=400, detail="entidad debe ser 'hito' o 'actividad'")
         
-        avance = db.get_avance_mensual_actual(entidad, id_entidad)
+        avance = await db.get_avance_mensual_actual(entidad, id_entidad)
         if not avance:
             raise HTTPException(status_code=404, detail="No se encontró reporte de avance")
         
@@ -388,48 +729,81 @@ def get_avance_mensual_actual(entidad: str, id_entidad: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/avance-mensual/{entidad}/{id_entidad}/historico", response_model=List[AvanceMensualResponse], tags=["Avance Mensual"])
-def get_historico_avance(entidad: str, id_entidad: int):
-    """Get complete historical progress for an entity"""
+@app.get("/api/avance-mensual/{entidad}/{id_entidad}/historico", response_model=List[AvanceMensualResponse], tags=["Avance Mensual"], dependencies=[Depends(conditional('avance_mensual'))])
+async def get_historico_avance(
+    entidad: str,
+    id_entidad: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Tamaño de página (sin límite si se omite)"),
+    cursor: Optional[str] = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    include_total: bool = Query(False, description="Incluir X-Total-Count"),
+    fmt: Optional[str] = Query(None, alias="format", pattern=FORMAT_PATTERN, description="Formato columnar: arrow, parquet o columnar-json")
+):
+    """
+    Get complete historical progress for an entity, paginated by cursor
+    
+    With Accept: application/x-ndjson every report is streamed instead.
+    """
     try:
         if entidad not in ['hito', 'actividad']:
             raise HTTPException(status_code=400, detail="entidad debe ser 'hito' o 'actividad'")
         
-        df = db.get_historico_avance(entidad, id_entidad)
-        historico = df.to_dict('records')
-        return historico
+        if fmt:
+            return await columnar(response, fmt, 'avance_mensual', entidad=entidad, id_entidad=id_entidad)
+        if wants_ndjson(request):
+            rows = await db.stream_avance_mensual(entidad=entidad, id_entidad=id_entidad)
+            return ndjson(response, rows, AvanceMensualResponse)
+        
+        page = await db.get_historico_avance_page(
+            entidad, id_entidad, limit=limit, cursor=cursor, with_total=include_total,
+            as_records=True
+        )
+        return paginated(response, page, AVANCE_MENSUAL_LIST)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ==================== DASHBOARD & SEGUIMIENTO ====================
 
-@app.get("/api/dashboard/stats", response_model=DashboardStats, tags=["Dashboard"])
-def get_dashboard_stats():
+@app.get("/api/dashboard", response_model=DashboardBundle, tags=["Dashboard"], dependencies=[Depends(conditional('indicadores'))])
+async def get_dashboard():
+    """Get dashboard statistics and filter values in a single call"""
+    try:
+        return await db.get_dashboard_bundle()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/dashboard/stats", response_model=DashboardStats, tags=["Dashboard"], dependencies=[Depends(conditional('indicadores'))])
+async def get_dashboard_stats():
     """Get dashboard statistics"""
     try:
-        stats = db.get_summary_stats()
+        stats = await db.get_summary_stats()
         return DashboardStats(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/seguimiento/responsable/{responsable}", tags=["Seguimiento"])
-def get_items_by_responsable(responsable: str):
+@app.get("/api/seguimiento/responsable/{responsable}", tags=["Seguimiento"], dependencies=[Depends(conditional('hitos', 'actividades', 'indicadores'))])
+async def get_items_by_responsable(responsable: str):
     """Get all hitos and actividades for a specific responsable"""
     try:
-        hitos_df = db.get_hitos_by_responsable(responsable)
-        actividades_df = db.get_actividades_by_responsable(responsable)
+        def load(uow):
+            return (uow.db.get_hitos_by_responsable(responsable, as_records=True, uow=uow),
+                    uow.db.get_actividades_by_responsable(responsable, as_records=True, uow=uow))
         
-        # Filter hitos by responsable
-        if 'responsable' in hitos_df.columns:
-            hitos_df = hitos_df[hitos_df['responsable'] == responsable]
+        hitos, actividades = await db.transaction(load)
         
         return {
             "responsable": responsable,
-            "hitos": hitos_df.to_dict('records'),
-            "actividades": actividades_df.to_dict('records'),
-            "total_items": len(hitos_df) + len(actividades_df)
+            "hitos": hitos,
+            "actividades": actividades,
+            "total_items": len(hitos) + len(actividades)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -437,49 +811,49 @@ def get_items_by_responsable(responsable: str):
 
 # ==================== UTILIDADES ====================
 
-@app.get("/api/responsables", response_model=List[str], tags=["Utilidades"])
-def get_responsables():
+@app.get("/api/responsables", response_model=List[str], tags=["Utilidades"], dependencies=[Depends(conditional('indicadores', max_age=300))])
+async def get_responsables():
     """Get list of all responsables"""
     try:
-        responsables = db.get_unique_values('responsable')
+        responsables = await db.get_unique_values('responsable')
         return responsables
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/areas", response_model=List[str], tags=["Utilidades"])
-def get_areas():
+@app.get("/api/areas", response_model=List[str], tags=["Utilidades"], dependencies=[Depends(conditional('indicadores', max_age=300))])
+async def get_areas():
     """Get list of all areas"""
     try:
-        areas = db.get_unique_values('area')
+        areas = await db.get_unique_values('area')
         return areas
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/unidades-organizacionales", response_model=List[str], tags=["Utilidades"])
-def get_unidades_organizacionales():
+@app.get("/api/unidades-organizacionales", response_model=List[str], tags=["Utilidades"], dependencies=[Depends(conditional('indicadores', max_age=300))])
+async def get_unidades_organizacionales():
     """Get list of all organizational units"""
     try:
-        unidades = db.get_unique_values('unidad_organizacional')
+        unidades = await db.get_unique_values('unidad_organizacional')
         return unidades
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/años", response_model=List[int], tags=["Utilidades"])
-def get_años():
+@app.get("/api/años", response_model=List[int], tags=["Utilidades"], dependencies=[Depends(conditional('indicadores', max_age=300))])
+async def get_años():
     """Get list of all years"""
     try:
-        años = db.get_unique_values('año')
+        años = await db.get_unique_values('año')
         return [int(a) for a in años if a is not None]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/tipos-indicador", response_model=List[str], tags=["Utilidades"])
-def get_tipos_indicador():
+@app.get("/api/tipos-indicador", response_model=List[str], tags=["Utilidades"], dependencies=[Depends(conditional('indicadores', max_age=300))])
+async def get_tipos_indicador():
     """Get list of all indicator types"""
     try:
-        tipos = db.get_unique_values('tipo_indicador')
+        tipos = await db.get_unique_values('tipo_indicador')
         return tipos
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -487,16 +861,130 @@ def get_tipos_indicador():
 
 # ==================== HEALTH CHECK ====================
 
-@app.get("/health", tags=["Health"])
-def health_check():
-    """Health check endpoint"""
+async def readiness() -> Tuple[bool, Dict]:
+    """
+    Probe the database the way a request would use it
+    
+    The probe queues for a database thread and a pooled connection, runs
+    SELECT 1 and reads the schema version, all within the latency budget.
+    
+    Returns:
+        (ready, report) where report has the probe timings, schema version,
+        pool usage and the problems that made the instance not ready
+    """
+    budget = HEALTH_LATENCY_BUDGET_MS / 1000
+    problems = []
+    probe = {}
+    started = time.perf_counter()
+    try:
+        probe = await asyncio.wait_for(db.ping(timeout=budget), timeout=budget)
+    except (asyncio.TimeoutError, PoolTimeout):
+        problems.append(f"La base de datos no respondió en {HEALTH_LATENCY_BUDGET_MS:g} ms")
+    except Exception as e:
+        problems.append(f"Error de base de datos: {e}")
+    latency_ms = round((time.perf_counter() - started) * 1000, 3)
+    
+    if probe and latency_ms > HEALTH_LATENCY_BUDGET_MS:
+        problems.append(f"Latencia de {latency_ms:g} ms por encima del presupuesto de {HEALTH_LATENCY_BUDGET_MS:g} ms")
+    if probe and probe['schema_version'] != probe['expected_schema_version']:
+        problems.append(
+            f"Esquema v{probe['schema_version']} en la base de datos, se esperaba v{probe['expected_schema_version']}"
+        )
+    
+    # Read straight from the pool: queuing behind the database threads would hide saturation
+    pool = db.db.get_pool_stats()
+    report = {
+        "status": "ready" if not problems else "not_ready",
+        "timestamp": datetime.now().isoformat(),
+        "database": {
+            "type": db.db_type,
+            "latency_ms": latency_ms,
+            "acquire_ms": probe.get('acquire_ms'),
+            "query_ms": probe.get('query_ms'),
+            "budget_ms": HEALTH_LATENCY_BUDGET_MS,
+        },
+        "schema": {
+            "version": probe.get('schema_version'),
+            "expected": probe.get('expected_schema_version'),
+        },
+        "pool": {
+            "kind": pool['kind'],
+            "in_use": pool['in_use'],
+            "size": pool['size'],
+            "max_size": pool['max_size'],
+            "waiting": pool['waiting'],
+            "timeouts": pool['timeouts'],
+            "saturation": round(pool['in_use'] / pool['max_size'], 3) if pool['max_size'] else None,
+        },
+        "problems": problems,
+    }
+    return not problems, report
+
+
+@app.get("/health/live", tags=["Health"])
+async def liveness(response: Response):
+    """Liveness probe: the process is serving requests (never touches the database)"""
+    response.headers["Cache-Control"] = "no-store"
     return {
-        "status": "healthy",
+        "status": "alive",
         "timestamp": datetime.now().isoformat(),
-        "database": "connected"
+        "uptime_s": round(time.monotonic() - STARTED_AT, 3)
     }
 
 
+@app.get("/health/ready", tags=["Health"])
+async def readiness_check(response: Response):
+    """Readiness probe: 200 when the database answers within budget, 503 otherwise"""
+    ready, report = await readiness()
+    response.headers["Cache-Control"] = "no-store"
+    response.status_code = 200 if ready else 503
+    return report
+
+
+@app.get("/health", tags=["Health"])
+async def health_check(response: Response):
+    """Health check endpoint (summary of /health/ready)"""
+    ready, report = await readiness()
+    response.headers["Cache-Control"] = "no-store"
+    response.status_code = 200 if ready else 503
+    return {
+        "status": "healthy" if ready else "unhealthy",
+        "timestamp": report["timestamp"],
+        "database": "connected" if ready else "error",
+        "latency_ms": report["database"]["latency_ms"],
+        "problems": report["problems"]
+    }
+
+
+# ==================== DEBUG ====================
+
+@app.get("/metrics", tags=["Debug"], include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition: requests, latency, DB pool, queries and read cache"""
+    lines = request_metrics.render()
+    # In-memory counters, read directly: a saturated executor must not delay the scrape
+    lines += metrics.render_pool(db.db.get_pool_stats())
+    lines += metrics.render_queries(db.db.get_query_stats())
+    lines += metrics.render_cache(db.db.get_cache_stats())
+    return Response(content="\n".join(lines) + "\n", media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/debug/queries", tags=["Debug"])
+async def get_query_stats(
+    sort: str = Query("total_ms", pattern="^(total_ms|count|avg_ms|p50_ms|p95_ms|max_ms|rows)$", description="Orden de las consultas"),
+    limit: Optional[int] = Query(50, ge=1, le=1000, description="Número de consultas a mostrar")
+):
+    """Per-query timings (by SQL fingerprint), connection waits and recent slow queries"""
+    return await db.get_query_stats(sort=sort, limit=limit)
+
+
+@app.delete("/debug/queries", response_model=MessageResponse, tags=["Debug"])
+async def reset_query_stats():
+    """Reset the query timings"""
+    await db.reset_query_stats()
+    return MessageResponse(message="Estadísticas de consultas reiniciadas", success=True)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -3,6 +3,7 @@ Sistema de Indicadores e Hitos - Role-Based Version
 Modern web-based indicator and milestone tracking system with strict role separation
 """
 
+import os
 import streamlit as st
 import pandas as pd
 from datetime import datetime
@@ -52,8 +53,14 @@ UNIDADES_ORGANIZACIONALES = [
 # Apply custom CSS
 st.markdown(get_custom_css(), unsafe_allow_html=True)
 
-# Initialize database
-db = Database()
+# Initialize database once per server process (shared by every session and rerun)
+@st.cache_resource
+def get_database() -> Database:
+    # Unlike the API, the app enables the read cache by default (see .env.example)
+    return Database(read_cache_size=int(os.getenv('DB_READ_CACHE_SIZE', '256')))
+
+
+db = get_database()
 
 # Initialize session state
 if 'page' not in st.session_state:
@@ -66,8 +73,10 @@ def render_dashboard():
     """Render the main dashboard with metrics and data table"""
     st.title("📊 Dashboard de Indicadores")
     
-    # Get summary statistics
-    stats = db.get_summary_stats()
+    # Get summary statistics and filter values in one go
+    bundle = db.get_dashboard_bundle()
+    stats = bundle['stats']
+    facets = bundle['facets']
     
     # Display metrics in columns
     col1, col2, col3, col4 = st.columns(4)
@@ -108,23 +117,23 @@ def render_dashboard():
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
-        areas = ["Todos"] + db.get_unique_values('area')
+        areas = ["Todos"] + facets['area']
         selected_area = st.selectbox("Área", areas)
     
     with col2:
-        años = ["Todos"] + [str(y) for y in db.get_unique_values('año')]
+        años = ["Todos"] + [str(y) for y in facets['año']]
         selected_año = st.selectbox("Año", años)
     
     with col3:
-        unidades = ["Todos"] + db.get_unique_values('unidad_organizacional')
+        unidades = ["Todos"] + facets['unidad_organizacional']
         selected_unidad = st.selectbox("Unidad Organizacional", unidades)
     
     with col4:
-        tipos = ["Todos"] + db.get_unique_values('tipo_indicador')
+        tipos = ["Todos"] + facets['tipo_indicador']
         selected_tipo = st.selectbox("Tipo Indicador", tipos)
     
     with col5:
-        responsables = ["Todos"] + db.get_unique_values('responsable')
+        responsables = ["Todos"] + facets['responsable']
         selected_responsable = st.selectbox("Responsable", responsables)
     
     # Apply filters
@@ -139,13 +148,10 @@ def render_dashboard():
         area=filter_area,
         año=filter_año,
         unidad_organizacional=filter_unidad,
-        tipo_indicador=filter_tipo
+        tipo_indicador=filter_tipo,
+        responsable=filter_responsable
     )
     
-    # Apply responsable filter manually
-    if filter_responsable:
-        df = df[df['responsable'] == filter_responsable]
-    
     st.markdown("---")
     
     # Display data table
@@ -481,8 +487,11 @@ def render_gestion_hitos_admin():
                     
                     with col4:
                         if st.button("🗑️", key=f"del_hito_{hito['id']}", help="Eliminar hito"):
-                            if db.delete_hito(hito['id']):
-                                db.update_indicador_from_hitos(selected_id)
+                            with db.unit_of_work() as uow:
+                                deleted = db.delete_hito(hito['id'], uow=uow)
+                                if deleted:
+                                    db.update_indicador_from_hitos(selected_id, uow=uow)
+                            if deleted:
                                 st.success("Hito eliminado")
                                 st.rerun()
                     
@@ -733,10 +742,6 @@ def render_actualizacion_mensual_owner():
         hitos_df = db.get_hitos_by_responsable(selected_responsable)
         actividades_df = db.get_actividades_by_responsable(selected_responsable)
         
-        # Filter by responsable (since get_hitos_by_responsable returns all hitos)
-        if 'responsable' in hitos_df.columns:
-            hitos_df = hitos_df[hitos_df['responsable'] == selected_responsable]
-        
         total_items = len(hitos_df) + len(actividades_df)
         
         if total_items == 0:
@@ -823,29 +828,23 @@ def render_actualizacion_mensual_owner():
                 
                 if submitted:
                     try:
-                        success_count = 0
-                        already_reported = []
-                        errors = []
-                        
-                        for reporte in reportes:
-                            result = db.registrar_avance_mensual(
-                                entidad=reporte['entidad'],
-                                id_entidad=reporte['id_entidad'],
-                                avance_reportado=reporte['avance'],
-                                usuario=selected_responsable,
-                                mes=current_month
-                            )
-                            
-                            if result:
-                                success_count += 1
-                            else:
-                                already_reported.append(reporte['nombre'])
+                        # One transaction: inserts, estado updates and indicator recompute
+                        result = db.registrar_avances_mensuales_bulk(
+                            reportes=[
+                                {
+                                    'entidad': reporte['entidad'],
+                                    'id_entidad': int(reporte['id_entidad']),
+                                    'avance_reportado': reporte['avance']
+                                }
+                                for reporte in reportes
+                            ],
+                            usuario=selected_responsable,
+                            mes=current_month
+                        )
                         
-                        # Update indicator progress for all affected indicators
-                        # Get unique indicator IDs from hitos
-                        if len(hitos_df) > 0:
-                            for indicador_id in hitos_df['indicador_id'].unique():
-                                db.update_indicador_from_hitos(indicador_id)
+                        nombres = {(r['entidad'], int(r['id_entidad'])): r['nombre'] for r in reportes}
+                        success_count = len(result['registrados'])
+                        already_reported = [nombres[(d['entidad'], d['id_entidad'])] for d in result['duplicados']]
                         
                         if success_count > 0:
                             st.success(f"✅ {success_count} reportes guardados exitosamente")
@@ -872,33 +871,36 @@ def render_vista_seguimiento():
     
     st.info("ℹ️ Vista de solo lectura con jerarquía completa y avances calculados automáticamente")
     
-    # Get all indicators
-    df = db.get_all_indicadores()
-    
-    if len(df) == 0:
-        st.info("No hay indicadores registrados.")
-        return
+    # Filter options from the same bundle the dashboard uses
+    facets = db.get_dashboard_bundle()['facets']
     
     # Filters
     col1, col2 = st.columns(2)
     
     with col1:
-        responsables = ["Todos"] + db.get_unique_values('responsable')
+        responsables = ["Todos"] + facets['responsable']
         selected_responsable = st.selectbox("Filtrar por Responsable", responsables)
     
     with col2:
-        años = ["Todos"] + [str(y) for y in db.get_unique_values('año')]
+        años = ["Todos"] + [str(y) for y in facets['año']]
         selected_año = st.selectbox("Filtrar por Año", años)
     
-    # Apply filters
-    if selected_responsable != "Todos":
-        df = df[df['responsable'] == selected_responsable]
+    # Get filtered indicators
+    df = db.get_all_indicadores(
+        responsable=None if selected_responsable == "Todos" else selected_responsable,
+        año=None if selected_año == "Todos" else int(selected_año)
+    )
     
-    if selected_año != "Todos":
-        df = df[df['año'] == int(selected_año)]
+    if len(df) == 0:
+        st.info("No hay indicadores que coincidan con los filtros.")
+        return
     
     st.markdown("---")
     
+    # Load hitos/actividades of every listed indicator in one go
+    ids_con_hitos = [int(row['id']) for _, row in df.iterrows() if row.get('tiene_hitos')]
+    jerarquia = {ind['id']: ind for ind in db.load_hierarchy(ids_con_hitos)}
+    
     # Display indicators with hierarchy
     for _, indicador in df.iterrows():
         with st.expander(f"📊 {indicador['indicador']} - {indicador['avance_porcentaje']}%", expanded=False):
@@ -916,12 +918,12 @@ def render_vista_seguimiento():
             
             # Show hitos if exists
             if indicador.get('tiene_hitos'):
-                hitos_df = db.get_hitos_by_indicador(indicador['id'])
+                hitos = jerarquia.get(int(indicador['id']), {}).get('hitos', [])
                 
-                if len(hitos_df) > 0:
+                if len(hitos) > 0:
                     st.markdown("### 🎯 Hitos")
                     
-                    for _, hito in hitos_df.iterrows():
+                    for hito in hitos:
                         col1, col2, col3 = st.columns([3, 1, 1])
                         
                         with col1:
@@ -937,12 +939,12 @@ def render_vista_seguimiento():
                             st.markdown(get_status_badge(hito['estado']), unsafe_allow_html=True)
                         
                         # Show actividades for this hito
-                        actividades_df = db.get_actividades_by_hito(hito['id'])
+                        actividades = hito['actividades']
                         
-                        if len(actividades_df) > 0:
+                        if len(actividades) > 0:
                             st.markdown("**📋 Actividades:**")
                             
-                            for _, actividad in actividades_df.iterrows():
+                            for actividad in actividades:
                                 col1, col2, col3 = st.columns([3, 1, 1])
                                 
                                 with col1:
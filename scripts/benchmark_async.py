@@ -0,0 +1,127 @@
+"""
+Benchmark de carga: endpoints síncronos (Database) vs asíncronos (AsyncDatabase)
+Lanza el mismo conjunto de peticiones concurrentes contra dos apps FastAPI
+equivalentes, en proceso (httpx + ASGITransport), y compara el rendimiento
+
+Uso:
+    python scripts/benchmark_async.py [peticiones] [concurrencia] [n_indicadores]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+from fastapi import FastAPI
+
+from src.async_database import AsyncDatabase
+from src.database import Database
+
+
+def seed(db, n_indicadores):
+    """Crear indicadores con 3 hitos cada uno"""
+    with db.unit_of_work() as uow:
+        for i in range(n_indicadores):
+            indicador_id = db.create_indicador(
+                año=2025, indicador=f"Indicador {i}", tipo_indicador="Estratégico",
+                area=f"Área {i % 5}", responsable=f"Responsable {i % 20}", tiene_hitos=True, uow=uow
+            )
+            for h in range(3):
+                db.create_hito(indicador_id=indicador_id, nombre=f"Hito {i}.{h}", orden=h, uow=uow)
+
+
+def sync_app(db):
+    """Camino anterior: endpoints def sobre Database (threadpool de Starlette)"""
+    app = FastAPI()
+
+    @app.get("/indicadores/{indicador_id}")
+    def get_indicador(indicador_id: int):
+        return db.get_indicador_by_id(indicador_id)
+
+    @app.get("/indicadores")
+    def get_indicadores():
+        return db.get_indicadores_page(limit=50, as_records=True)['items']
+
+    @app.get("/dashboard/stats")
+    def get_stats():
+        return db.get_summary_stats()
+
+    return app
+
+
+def async_app(adb):
+    """Camino nuevo: endpoints async def sobre AsyncDatabase"""
+    app = FastAPI()
+
+    @app.get("/indicadores/{indicador_id}")
+    async def get_indicador(indicador_id: int):
+        return await adb.get_indicador_by_id(indicador_id)
+
+    @app.get("/indicadores")
+    async def get_indicadores():
+        return (await adb.get_indicadores_page(limit=50, as_records=True))['items']
+
+    @app.get("/dashboard/stats")
+    async def get_stats():
+        return await adb.get_summary_stats()
+
+    return app
+
+
+async def load(app, paths, concurrencia):
+    """Ejecutar las peticiones con N clientes concurrentes; devuelve (segundos, latencias en ms)"""
+    latencias = []
+    cola = list(reversed(paths))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while cola:
+                path = cola.pop()
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencias.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.text
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrencia)))
+        return time.perf_counter() - start, latencias
+
+
+def main():
+    peticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    concurrencia = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    n_indicadores = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(db_path=os.path.join(tmp, "benchmark.db"))
+        print(f"\n📦 Creando {n_indicadores} indicadores...")
+        seed(db, n_indicadores)
+        adb = AsyncDatabase(db)
+
+        rutas = ["/indicadores/{}", "/indicadores", "/dashboard/stats"]
+        paths = [rutas[i % 3].format(i % n_indicadores + 1) for i in range(peticiones)]
+
+        print()
+        print("=" * 72)
+        print(f"{'Camino':<28} {'Req/s':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'Total (s)':>10}")
+        print("=" * 72)
+
+        for nombre, app in [("sync (def + Database)", sync_app(db)), ("async (AsyncDatabase)", async_app(adb))]:
+            asyncio.run(load(app, paths[:50], concurrencia))  # calentamiento
+            segundos, latencias = asyncio.run(load(app, paths, concurrencia))
+            p95 = statistics.quantiles(latencias, n=20)[-1]
+            print(f"{nombre:<28} {peticiones / segundos:>10.0f} {statistics.median(latencias):>10.1f} {p95:>10.1f} {segundos:>10.2f}")
+
+        print("=" * 72)
+        print(f"{peticiones} peticiones, {concurrencia} clientes concurrentes, {adb.max_workers} hilos de base de datos (async)")
+        asyncio.run(adb.close())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark de serialización de los listados de la API
+Compara el camino anterior (DataFrame -> to_dict -> validación por fila -> jsonable_encoder -> json)
+con el camino rápido (filas del cursor -> TypeAdapter -> dump_json) por endpoint
+
+Uso:
+    python scripts/benchmark_serialization.py [n_indicadores] [repeticiones]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from typing import List
+
+from src.database import Database
+from src.schemas import IndicadorResponse, HitoResponse, ActividadResponse
+
+
+def seed(db, n_indicadores):
+    """Crear indicadores con 3 hitos y 2 actividades por hito"""
+    with db.unit_of_work() as uow:
+        for i in range(n_indicadores):
+            indicador_id = db.create_indicador(
+                año=2025, indicador=f"Indicador {i}", tipo_indicador="Estratégico",
+                area=f"Área {i % 5}", responsable=f"Responsable {i % 20}",
+                meta="100%", medida="Porcentaje", tiene_hitos=True,
+                fecha_inicio="2025-01-01", fecha_fin_original="2025-12-31", fecha_fin_actual="2025-12-31",
+                uow=uow
+            )
+            for h in range(3):
+                hito_id = db.create_hito(
+                    indicador_id=indicador_id, nombre=f"Hito {i}.{h}", orden=h,
+                    responsable=f"Responsable {i % 20}", fecha_fin_planificada="2025-06-30", uow=uow
+                )
+                for a in range(2):
+                    db.create_actividad(
+                        hito_id=hito_id, descripcion_actividad=f"Actividad {i}.{h}.{a}",
+                        responsable=f"Responsable {i % 20}", uow=uow
+                    )
+
+
+def legacy(model, df):
+    """Camino anterior: DataFrame, validación fila a fila y encoder estándar"""
+    records = df.to_dict('records')
+    models = [model.model_validate(record) for record in records]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+
+def fast(adapter, records):
+    """Camino rápido: validación en bloque y JSON desde pydantic-core"""
+    return adapter.dump_json(adapter.validate_python(records))
+
+
+def best_of(func, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        start = time.perf_counter()
+        result = func()
+        tiempos.append(time.perf_counter() - start)
+    return min(tiempos) * 1000, result
+
+
+def main():
+    n_indicadores = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(db_path=os.path.join(tmp, "benchmark.db"))
+        print(f"\n📦 Creando {n_indicadores} indicadores ({n_indicadores * 3} hitos, {n_indicadores * 6} actividades)...")
+        seed(db, n_indicadores)
+
+        endpoints = [
+            ("/api/indicadores", IndicadorResponse,
+             lambda: db.get_all_indicadores(),
+             lambda: db.get_indicadores_page(limit=None, as_records=True)['items']),
+            ("/api/hitos", HitoResponse,
+             lambda: db.get_all_hitos()['items'],
+             lambda: db.get_all_hitos(as_records=True)['items']),
+            ("/api/actividades", ActividadResponse,
+             lambda: db.get_all_actividades()['items'],
+             lambda: db.get_all_actividades(as_records=True)['items']),
+        ]
+
+        print()
+        print("=" * 78)
+        print(f"{'Endpoint':<20} {'Filas':>7} {'Antes (ms)':>12} {'Después (ms)':>14} {'Mejora':>8} {'Igual':>7}")
+        print("=" * 78)
+
+        for path, model, load_df, load_records in endpoints:
+            adapter = TypeAdapter(List[model])
+            antes_ms, antes = best_of(lambda: legacy(model, load_df()), repeticiones)
+            despues_ms, despues = best_of(lambda: fast(adapter, load_records()), repeticiones)
+            igual = "✅" if json.loads(antes) == json.loads(despues) else "❌"
+            filas = len(json.loads(despues))
+            print(f"{path:<20} {filas:>7} {antes_ms:>12.1f} {despues_ms:>14.1f} {antes_ms / despues_ms:>7.1f}x {igual:>6}")
+
+        print("=" * 78)
+        print("Tiempos: mejor de", repeticiones, "ejecuciones, incluyendo la consulta a la base de datos")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
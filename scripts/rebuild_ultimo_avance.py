@@ -0,0 +1,25 @@
+"""
+Script para recalcular ultimo_avance / ultimo_avance_mes de hitos y actividades
+a partir del histórico de avance_mensual (SQLite o PostgreSQL según DATABASE_URL)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import Database
+
+
+def main():
+    db = Database()
+
+    print("🔄 Recalculando último avance desde avance_mensual...")
+    counts = db.rebuild_ultimo_avance()
+
+    print(f"✅ Hitos actualizados: {counts['hitos']}")
+    print(f"✅ Actividades actualizadas: {counts['actividades']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Script para verificar que las consultas frecuentes usan sus índices
+Ejecuta EXPLAIN sobre cada consulta de HOT_QUERIES (SQLite o PostgreSQL según DATABASE_URL)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import Database
+
+
+def main():
+    db = Database()
+
+    print("=" * 60)
+    print("VERIFICANDO USO DE ÍNDICES")
+    print("=" * 60)
+    print()
+
+    results = db.verify_indexes()
+    missing = [r for r in results if not r['used']]
+
+    for result in results:
+        status = "✅" if result['used'] else "❌"
+        print(f"{status} {result['name']} -> {result['index']}")
+        if not result['used']:
+            for line in result['plan'].splitlines():
+                print(f"     {line}")
+
+    print()
+    print("=" * 60)
+    if missing:
+        print(f"❌ {len(missing)} consulta(s) no usan su índice")
+        sys.exit(1)
+    print(f"✅ Las {len(results)} consultas usan su índice")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Async facade for the Database manager
+Runs the blocking psycopg2 / sqlite3 calls on a dedicated thread pool so
+async endpoints never block the event loop
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.database import Database, UnitOfWork, _env_int
+from src.instrumentation import current_request
+
+
+class AsyncDatabase:
+    """
+    Async version of Database with the same method surface
+
+    Every public Database method is available as a coroutine taking the same
+    arguments. Calls run on a thread pool sized to the connection pool, so
+    the number of threads blocked on the database never exceeds the number
+    of connections that can actually serve them. Attributes (db_type,
+    cache, pool, ...) are read from the wrapped Database.
+
+    No connection is held between awaits: each call checks out, uses and
+    returns its connection on one database thread. Several calls that must
+    share a transaction go through transaction(), which runs them as a
+    single task. (A unit of work kept open across awaits would hold a pooled
+    connection, and on SQLite the writer lock, while waiting for a thread
+    that may be blocked on that very connection or lock.)
+
+    stream_* methods return the usual row generator; iterate it off the
+    event loop (StreamingResponse does so for sync iterators).
+
+    Args:
+        db: Database to wrap (a new one is created from kwargs if omitted)
+        max_workers: Threads running database calls (env DB_ASYNC_WORKERS,
+                     default: pool max size for PostgreSQL, 4 for SQLite)
+        **kwargs: Database arguments when db is omitted
+    """
+
+    def __init__(self, db: Optional[Database] = None, max_workers: Optional[int] = None, **kwargs):
+        self.db = db if db is not None else Database(**kwargs)
+        if max_workers is None:
+            default = self.db.pool.max_size if self.db.db_type == 'postgresql' else 4
+            max_workers = _env_int('DB_ASYNC_WORKERS', default)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking call on the database threads (context variables included)"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        request = current_request()
+        if request is None:
+            return await loop.run_in_executor(self._executor, call)
+
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        finally:
+            request.database_call((time.perf_counter() - started) * 1000)
+
+    def __getattr__(self, name):
+        if name == 'unit_of_work':
+            raise AttributeError("AsyncDatabase.unit_of_work is not available; use transaction()")
+        attr = getattr(self.db, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self._run(attr, *args, **kwargs)
+
+        return method
+
+    async def transaction(self, func: Callable[[UnitOfWork], Any], *args, **kwargs) -> Any:
+        """
+        Run several Database calls in one unit of work, as one database task
+
+        The connection, and on SQLite the writer lock, are taken and released
+        on the same thread without yielding to the event loop in between.
+
+        Args:
+            func: Blocking callable receiving the UnitOfWork (and args); pass
+                  ``uow=uow`` to the Database methods it calls (``uow.db``)
+
+        Returns:
+            What func returns, once the unit of work has been committed
+            (it is rolled back if func raises)
+
+        Usage:
+            def delete(uow):
+                uow.db.delete_hito(hito_id, uow=uow)
+                uow.db.update_indicador_from_hitos(indicador_id, uow=uow)
+            await adb.transaction(delete)
+        """
+        def run():
+            with self.db.unit_of_work() as uow:
+                return func(uow, *args, **kwargs)
+        return await self._run(run)
+
+    async def close(self):
+        """Close the pooled connections and stop the database threads"""
+        await self._run(self.db.close)
+        self._executor.shutdown(wait=True)
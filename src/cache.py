@@ -0,0 +1,117 @@
+"""
+Read cache for the Database manager
+Bounded LRU cache whose entries are invalidated by a data version
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+
+def make_key(name: str, args: tuple, kwargs: Dict) -> Hashable:
+    """Hashable cache key for a method call (lists and dicts are frozen)"""
+    return (name, _freeze(args), _freeze(kwargs))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+class ReadCache:
+    """
+    Thread-safe LRU cache of read results tagged with the data version
+
+    Every entry remembers the data version that was current when it was
+    loaded. Once the version moves on (a write happened) all entries are
+    stale and are dropped on the next lookup.
+
+    Cached values are deep-copied on the way out, so callers can modify the
+    DataFrames/dicts they get back without corrupting the cache.
+
+    Args:
+        version: Callable returning the current data version
+        max_entries: Upper bound on cached results; least recently used are evicted
+    """
+
+    def __init__(self, version: Callable[[], Hashable], max_entries: int = 256):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._version = version
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> value
+        self._entries_version = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable):
+        """Return the cached value for key, calling loader() on a miss"""
+        version = self._version()
+
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                value = self._entries[key]
+                hit = True
+            else:
+                self._misses += 1
+                hit = False
+
+        if hit:
+            return copy.deepcopy(value)
+
+        # Loaded outside the lock; tagged with the version read before loading,
+        # so a write that lands meanwhile makes this entry stale right away
+        value = loader()
+
+        with self._lock:
+            self._check_version(version)
+            if self._entries_version == version:
+                self._entries[key] = copy.deepcopy(value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        return value
+
+    def _check_version(self, version: Hashable):
+        """Drop every entry if the data version changed (lock held)"""
+        if version != self._entries_version:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+            self._entries_version = version
+
+    def invalidate(self):
+        """Drop every entry regardless of the data version"""
+        with self._lock:
+            if self._entries:
+                self._invalidations += 1
+            self._entries.clear()
+            self._entries_version = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'version': self._entries_version,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+            }
@@ -5,23 +5,403 @@ Supports both SQLite (local dev) and PostgreSQL (production)
 
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import base64
+import json
+import time
+import functools
+import uuid
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Iterator, List, Dict, Optional, Tuple, Union
 import pandas as pd
 
+from src.pool import ConnectionPool, ThreadLocalConnectionPool, PoolTimeout
+from src.cache import ReadCache, make_key
+from src.instrumentation import InstrumentedCursor, QueryStats, current_method, current_request, track_methods
+
 # Try to import PostgreSQL adapter
 try:
     import psycopg2
+    import psycopg2.extensions
     from psycopg2.extras import RealDictCursor
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
+# Optional columnar export (Arrow IPC / Parquet)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+# Bump whenever tables, columns or INDEXES change so init_db re-applies the DDL
+SCHEMA_VERSION = 3
+
+# Per-entity counters in the data_version table, bumped by every write
+DATA_VERSION_ENTITIES = ['indicadores', 'hitos', 'actividades', 'avance_mensual']
+
+# Secondary indexes maintained by init_db: (name, table, columns)
+# Chosen from the WHERE/ORDER BY clauses of the queries in this module
+INDEXES = [
+    ('idx_indicadores_anio_area', 'indicadores', 'año, area'),
+    ('idx_indicadores_responsable', 'indicadores', 'responsable'),
+    ('idx_indicadores_estado', 'indicadores', 'estado'),
+    ('idx_indicadores_unidad', 'indicadores', 'unidad_organizacional'),
+    ('idx_indicadores_tipo', 'indicadores', 'tipo_indicador'),
+    ('idx_indicadores_created_id', 'indicadores', 'created_at, id'),
+    ('idx_indicadores_fecha_inicio', 'indicadores', 'fecha_inicio'),
+    ('idx_indicadores_fecha_fin_actual', 'indicadores', 'fecha_fin_actual'),
+    # Hitos are ordered by COALESCE(orden, 0) so keyset pages and NULL orden sort alike
+    ('idx_hitos_indicador_orden', 'hitos', 'indicador_id, COALESCE(orden, 0), id'),
+    ('idx_hitos_responsable', 'hitos', 'responsable'),
+    ('idx_hitos_estado', 'hitos', 'estado'),
+    ('idx_actividades_hito', 'actividades', 'hito_id'),
+    ('idx_actividades_estado', 'actividades', 'estado_actividad'),
+    ('idx_actividades_responsable', 'actividades', 'responsable'),
+    # Covering index for "latest report of an entity" lookups
+    ('idx_avance_mensual_ultimo', 'avance_mensual', 'entidad, id_entidad, mes DESC, avance_reportado'),
+    ('idx_avance_mensual_entidad_mes', 'avance_mensual', 'entidad, mes, id_entidad'),
+]
+
+# SQLite connection profile applied to every pooled connection; each pragma
+# can be overridden with env SQLITE_<NAME> (e.g. SQLITE_SYNCHRONOUS=FULL)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',      # readers and the writer don't block each other
+    'synchronous': 'NORMAL',    # fsync at checkpoints only (durable enough with WAL)
+    'busy_timeout': 5000,       # ms to wait for another process' lock
+    'cache_size': -20000,       # page cache in KiB (~20 MB)
+    'mmap_size': 268435456,     # 256 MB of memory-mapped reads
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+# Indexes superseded by an entry in INDEXES, dropped by init_db
+OBSOLETE_INDEXES = ['idx_indicadores_created_at', 'idx_hitos_indicador']
+
+# Keyset sort orders accepted by get_indicadores_page: name -> columns (last one unique)
+INDICADOR_SORTS = {
+    'created_at': ('created_at', 'id'),
+    'id': ('id',),
+}
+
+DEFAULT_PAGE_SIZE = 100
+
+# Rows fetched per round trip when streaming (server-side cursor / fetchmany)
+STREAM_BATCH_SIZE = 500
+
+# Entities accepted by the stream_* / export_* readers
+LISTING_ENTITIES = ('indicadores', 'hitos', 'actividades', 'avance_mensual')
+
+# FROM / SELECT of the cross-parent listings (get_all_* and stream_*)
+HITOS_LISTING_FROM = "hitos h JOIN indicadores i ON h.indicador_id = i.id"
+HITOS_LISTING_SELECT = (
+    "h.*, i.indicador as nombre_indicador, COALESCE(h.ultimo_avance, 0) as ultimo_avance_reportado"
+)
+ACTIVIDADES_LISTING_FROM = (
+    "actividades a JOIN hitos h ON a.hito_id = h.id JOIN indicadores i ON h.indicador_id = i.id"
+)
+ACTIVIDADES_LISTING_SELECT = (
+    "a.*, h.nombre as nombre_hito, i.indicador as nombre_indicador, "
+    "COALESCE(a.ultimo_avance, 0) as ultimo_avance_reportado"
+)
+
+# Indicadores columns offered as filters on the dashboard
+FACET_COLUMNS = ['area', 'año', 'unidad_organizacional', 'tipo_indicador', 'responsable']
+
+# Denormalized "latest monthly report" columns kept on hitos/actividades:
+# (table, column, type); maintained by registrar_avance_mensual
+ULTIMO_AVANCE_COLUMNS = [
+    ('hitos', 'ultimo_avance', 'INTEGER'),
+    ('hitos', 'ultimo_avance_mes', 'TEXT'),
+    ('actividades', 'ultimo_avance', 'INTEGER'),
+    ('actividades', 'ultimo_avance_mes', 'TEXT'),
+]
+
+# Hot query shapes checked by Database.verify_indexes(): (name, sql, sample params, expected index)
+# {p} is replaced by the dialect's placeholder
+HOT_QUERIES = [
+    ('indicadores_por_anio_area',
+     "SELECT * FROM indicadores WHERE año = {p} AND area = {p}",
+     (2025, ''), 'idx_indicadores_anio_area'),
+    ('indicadores_por_responsable',
+     "SELECT * FROM indicadores WHERE responsable = {p}",
+     ('',), 'idx_indicadores_responsable'),
+    ('indicadores_por_estados',
+     "SELECT * FROM indicadores WHERE estado IN ({p}, {p})",
+     ('En progreso', 'Completado'), 'idx_indicadores_estado'),
+    ('indicadores_por_fecha_fin',
+     "SELECT * FROM indicadores WHERE fecha_fin_actual >= {p} AND fecha_fin_actual <= {p}",
+     ('2025-01-01', '2025-12-31'), 'idx_indicadores_fecha_fin_actual'),
+    ('indicadores_pagina',
+     "SELECT * FROM indicadores WHERE (created_at, id) < ({p}, {p}) ORDER BY created_at DESC, id DESC LIMIT 101",
+     ('2025-01-01 00:00:00', 0), 'idx_indicadores_created_id'),
+    ('hitos_por_indicador',
+     "SELECT * FROM hitos WHERE indicador_id = {p} ORDER BY COALESCE(orden, 0), id",
+     (0,), 'idx_hitos_indicador_orden'),
+    ('hitos_pagina',
+     "SELECT * FROM hitos WHERE indicador_id = {p} AND (COALESCE(orden, 0), id) > ({p}, {p}) "
+     "ORDER BY COALESCE(orden, 0), id LIMIT 101",
+     (0, 0, 0), 'idx_hitos_indicador_orden'),
+    ('hitos_por_responsable',
+     "SELECT * FROM hitos WHERE responsable = {p} ORDER BY id",
+     ('',), 'idx_hitos_responsable'),
+    ('actividades_por_hito',
+     "SELECT * FROM actividades WHERE hito_id = {p} ORDER BY id",
+     (0,), 'idx_actividades_hito'),
+    ('actividades_por_responsable',
+     "SELECT * FROM actividades WHERE responsable = {p} ORDER BY id",
+     ('',), 'idx_actividades_responsable'),
+    ('ultimo_avance',
+     "SELECT avance_reportado FROM avance_mensual WHERE entidad = {p} AND id_entidad = {p} ORDER BY mes DESC LIMIT 1",
+     ('hito', 0), 'idx_avance_mensual_ultimo'),
+    ('reportados_del_mes',
+     "SELECT id_entidad FROM avance_mensual WHERE entidad = {p} AND mes = {p}",
+     ('hito', '2025-01'), 'idx_avance_mensual_entidad_mes'),
+]
+
+
+# How upsert_avance_mensual handles a month that was already reported
+AVANCE_CONFLICT_MODES = ('reject', 'overwrite', 'keep_latest')
+
+# INSERT ... RETURNING needs SQLite 3.35+
+SQLITE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+@dataclass
+class AvanceMensualResult:
+    """Outcome of upsert_avance_mensual"""
+    status: str  # 'inserted', 'updated' or 'skipped'
+    entidad: str
+    id_entidad: int
+    mes: str
+    avance_reportado: int  # value stored for the month after the call
+    avance_anterior: Optional[int] = None  # value found when the month was already reported
+    
+    @property
+    def written(self) -> bool:
+        return self.status != 'skipped'
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _estado_from_avance(avance: int) -> str:
+    """Status that corresponds to a progress percentage"""
+    if avance == 0:
+        return "Por comenzar"
+    elif avance < 100:
+        return "En progreso"
+    return "Completado"
+
+
+def _encode_cursor(sort: str, values: List) -> str:
+    """Opaque pagination cursor: urlsafe base64 of the sort name and last key"""
+    def _plain(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat(sep=' ') if isinstance(value, datetime) else value.isoformat()
+        return value.item() if hasattr(value, 'item') else value
+    payload = json.dumps({'s': sort, 'k': [_plain(v) for v in values]}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str, sort: str, size: int) -> List:
+    """
+    Decode a cursor produced by _encode_cursor for the same sort order
+    
+    Raises:
+        ValueError: if the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload['k']
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get('s') != sort or not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor does not match the requested sort order")
+    return values
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, '') else default
+
+
+def _cached(method):
+    """Serve a read from Database.cache when enabled (never inside a unit of work)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None or kwargs.get('uow') is not None:
+            return method(self, *args, **kwargs)
+        key = make_key(method.__name__, args, kwargs)
+        return self.cache.get_or_load(key, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+
+def _writes(*entities):
+    """
+    Bump the data_version counters of entities in the write's own transaction
+    
+    Without a caller-supplied unit of work the method runs in a fresh one, so
+    the write and its version bump are always committed (or rolled back) together.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, uow: Optional['UnitOfWork'] = None, **kwargs):
+            if uow is None:
+                with self.unit_of_work() as own_uow:
+                    own_uow.begin_write()
+                    result = method(self, *args, uow=own_uow, **kwargs)
+                    own_uow.touch(entities)
+                return result
+            uow.begin_write()
+            result = method(self, *args, uow=uow, **kwargs)
+            uow.touch(entities)
+            return result
+        return wrapper
+    return decorator
+
+
+class UnitOfWork:
+    """
+    One connection and one transaction shared by several Database calls
+    
+    Every Database method accepts an optional ``uow``; calls made with the same
+    unit of work run on the same connection and are committed together when
+    the ``with`` block exits (or rolled back if it raises).
+    
+    Usage:
+        with db.unit_of_work() as uow:
+            db.delete_hito(hito_id, uow=uow)
+            db.update_indicador_from_hitos(indicador_id, uow=uow)
+    """
+    
+    def __init__(self, db: 'Database'):
+        self.db = db
+        self._touched = set()
+        self._conn = None
+        self._finished = False
+        self._writing = False
+    
+    @property
+    def connection(self):
+        """Connection of this unit of work, checked out on first use"""
+        if self._finished:
+            raise RuntimeError("Unit of work already finished")
+        if self._conn is None:
+            self._conn = self.db.get_connection()
+        return self._conn
+    
+    def commit(self):
+        """Commit the work done so far; the unit of work stays usable"""
+        try:
+            if self._conn is not None:
+                self._conn.commit()
+        finally:
+            self._touched.clear()
+            self._end_write()
+    
+    def rollback(self):
+        """Discard the work done since the last commit"""
+        try:
+            if self._conn is not None:
+                self._conn.rollback()
+        finally:
+            self._touched.clear()
+            self._end_write()
+    
+    def begin_write(self):
+        """
+        Start writing in this unit of work (no-op on PostgreSQL)
+        
+        SQLite has a single writer. Writers of this process queue on the
+        database's writer lock, and the transaction is opened with BEGIN
+        IMMEDIATE so the file lock is taken up front, waiting up to
+        busy_timeout for other processes, instead of failing later with
+        "database is locked" when a read transaction tries to upgrade.
+        The lock is held until commit or rollback.
+        """
+        if self._writing or self.db.db_type != 'sqlite':
+            return
+        self.db._acquire_write_lock()
+        self._writing = True
+        try:
+            conn = self.connection
+            if not conn.in_transaction:
+                conn.cursor().execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._end_write()
+            raise
+    
+    def _end_write(self):
+        if self._writing:
+            self._writing = False
+            self.db._write_lock.release()
+    
+    def touch(self, entities):
+        """Bump the data_version counters of entities, once per transaction"""
+        pending = [entity for entity in entities if entity not in self._touched]
+        if pending:
+            self.db._bump_data_version(self.connection.cursor(), pending)
+            self._touched.update(pending)
+    
+    def close(self):
+        """Return the connection to the pool"""
+        self._finished = True
+        self._end_write()
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.close()
+    
+    def __enter__(self) -> 'UnitOfWork':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
+        return False
+
 
+@track_methods
 class Database:
     """Database manager for indicator tracking system"""
     
-    def __init__(self, db_path: str = "indicadores.db"):
+    def __init__(
+        self,
+        db_path: str = "indicadores.db",
+        pool_min_size: Optional[int] = None,
+        pool_max_size: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        read_cache_size: Optional[int] = None,
+        sqlite_pragmas: Optional[Dict[str, Union[str, int]]] = None,
+        query_stats: Optional[bool] = None
+    ):
+        """
+        Args:
+            db_path: SQLite file used when DATABASE_URL is not set
+            pool_min_size: PostgreSQL connections kept open (env DB_POOL_MIN_SIZE, default 1)
+            pool_max_size: PostgreSQL connection limit (env DB_POOL_MAX_SIZE, default 10)
+            pool_timeout: Seconds to wait for a free connection (env DB_POOL_TIMEOUT, default 30)
+            read_cache_size: Entries of the read cache, 0 disables it (env DB_READ_CACHE_SIZE, default 0)
+            sqlite_pragmas: Overrides of SQLITE_PRAGMAS (env SQLITE_<NAME>); None values drop a pragma
+            query_stats: Time every query per SQL fingerprint (env DB_QUERY_STATS, default on);
+                         slow query log tuned with DB_SLOW_QUERY_MS (100) and DB_SLOW_QUERY_LOG_SIZE (100)
+        """
         # Simple debug logging
         print("=" * 50)
         print("Initializing database...")
@@ -40,210 +420,642 @@ class Database:
             self.db_type = 'sqlite'
             self.db_path = db_path
             print(f"   Using SQLite database: {db_path}")
+            
+            self.sqlite_pragmas = {}
+            for name, default in SQLITE_PRAGMAS.items():
+                self.sqlite_pragmas[name] = os.getenv(f'SQLITE_{name.upper()}', default)
+            self.sqlite_pragmas.update(sqlite_pragmas or {})
+            self.sqlite_pragmas = {k: v for k, v in self.sqlite_pragmas.items() if v is not None}
+            print("   SQLite profile: " + ", ".join(f"{k}={v}" for k, v in self.sqlite_pragmas.items()))
+        
+        # Single-writer queue (SQLite); see UnitOfWork.begin_write
+        self._write_lock = threading.Lock()
+        
+        self.pool = self._create_pool(
+            min_size=pool_min_size if pool_min_size is not None else _env_int('DB_POOL_MIN_SIZE', 1),
+            max_size=pool_max_size if pool_max_size is not None else _env_int('DB_POOL_MAX_SIZE', 10),
+            timeout=pool_timeout if pool_timeout is not None else _env_float('DB_POOL_TIMEOUT', 30.0),
+            check_interval=_env_float('DB_POOL_CHECK_INTERVAL', 30.0)
+        )
+        print(f"   Connection pool: {self.pool.kind}")
+        
+        # Read cache, invalidated by the data_version counters every write bumps
+        if read_cache_size is None:
+            read_cache_size = _env_int('DB_READ_CACHE_SIZE', 0)
+        self.cache = ReadCache(self._data_version_key, read_cache_size) if read_cache_size > 0 else None
+        if self.cache is not None:
+            print(f"   Read cache: {read_cache_size} entries")
+        
+        # Query instrumentation (see get_query_stats)
+        if query_stats is None:
+            query_stats = _env_int('DB_QUERY_STATS', 1) > 0
+        self.query_stats = QueryStats(
+            slow_ms=_env_float('DB_SLOW_QUERY_MS', 100.0),
+            slow_log_size=_env_int('DB_SLOW_QUERY_LOG_SIZE', 100)
+        ) if query_stats else None
         
         print("=" * 50)
         
         # Initialize database tables
         self.init_db()
     
-    def get_connection(self, use_dict_cursor: bool = True):
+    # ==================== CONNECTIONS ====================
+    
+    def _create_pool(self, min_size: int, max_size: int, timeout: float, check_interval: float):
+        """Build the connection pool for the configured backend"""
+        if self.db_type == 'postgresql':
+            def connect():
+                return psycopg2.connect(self.database_url)
+            
+            def reset(conn):
+                if conn.closed:
+                    raise psycopg2.InterfaceError("connection already closed")
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            
+            def check(conn):
+                if conn.closed:
+                    return False
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                conn.rollback()
+                return True
+            
+            return ConnectionPool(
+                connect,
+                min_size=min_size,
+                max_size=max_size,
+                timeout=timeout,
+                reset=reset,
+                check=check,
+                check_interval=check_interval
+            )
+        
+        def connect():
+            # Connections may be released from a different worker thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self._busy_timeout())
+            for name, value in self.sqlite_pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            return conn
+        
+        def reset(conn):
+            if conn.in_transaction:
+                conn.rollback()
+        
+        def check(conn):
+            conn.execute("SELECT 1").fetchone()
+            return True
+        
+        return ThreadLocalConnectionPool(connect, reset=reset, check=check, check_interval=check_interval)
+    
+    def get_connection(self, use_dict_cursor: bool = True, timeout: Optional[float] = None):
         """
-        Create and return a database connection
+        Check out a pooled database connection
+        
+        Calling close() on the returned connection hands it back to the pool.
         
         Args:
             use_dict_cursor: If True, returns dict-like rows (RealDictCursor for PG, sqlite3.Row for SQLite)
                              If False, returns tuples (Standard Cursor for PG, plain tuple for SQLite)
+            timeout: Seconds to wait for a free connection (default: the pool timeout)
+        
+        Raises:
+            PoolTimeout: if the pool is exhausted for longer than the timeout
         """
+        started = time.perf_counter()
+        conn = self.pool.connection(timeout)
         if self.db_type == 'postgresql':
-            cursor_factory = RealDictCursor if use_dict_cursor else None
-            conn = psycopg2.connect(self.database_url, cursor_factory=cursor_factory)
-            return conn
+            conn.cursor_factory = RealDictCursor if use_dict_cursor else None
         else:
-            conn = sqlite3.connect(self.db_path)
-            if use_dict_cursor:
-                conn.row_factory = sqlite3.Row
-            return conn
+            conn.row_factory = sqlite3.Row if use_dict_cursor else None
+        
+        acquire_ms = (time.perf_counter() - started) * 1000
+        request = current_request()
+        if request is not None:
+            request.connection(acquire_ms)
+        
+        if self.query_stats is not None:
+            stats = self.query_stats
+            # The checkout wait is reported once, with the first cursor's first query
+            acquire = [acquire_ms]
+            conn.wrap_cursors(lambda cursor: InstrumentedCursor(cursor, stats, acquire.pop() if acquire else None))
+        return conn
+    
+    def get_query_stats(self, sort: str = 'total_ms', limit: Optional[int] = None) -> Dict:
+        """
+        Get per-query timings gathered since startup (or the last reset)
+        
+        Args:
+            sort: Rank fingerprints by total_ms, count, avg_ms, p50_ms, p95_ms, max_ms or rows
+            limit: Keep only the top fingerprints
+        
+        Returns:
+            Dictionary with 'queries' (fingerprint, count, p50/p95/max ms, rows,
+            calling methods), 'acquire' (connection checkout timings) and
+            'slow' (recent slow queries with redacted parameters); empty
+            when instrumentation is disabled
+        """
+        if self.query_stats is None:
+            return {'enabled': False, 'queries': [], 'acquire': {}, 'slow': []}
+        return {'enabled': True, **self.query_stats.snapshot(sort=sort, limit=limit)}
+    
+    def reset_query_stats(self):
+        """Forget the query timings gathered so far"""
+        if self.query_stats is not None:
+            self.query_stats.reset()
+    
+    def _busy_timeout(self) -> float:
+        """Seconds a SQLite writer waits for the database lock"""
+        return int(self.sqlite_pragmas.get('busy_timeout', 5000)) / 1000
+    
+    def _acquire_write_lock(self):
+        """Queue for the single-writer lock (SQLite), up to busy_timeout"""
+        if not self._write_lock.acquire(timeout=self._busy_timeout()):
+            raise sqlite3.OperationalError("database is locked (timed out waiting for the writer queue)")
+    
+    def get_pool_stats(self) -> Dict:
+        """
+        Get connection pool statistics (in use, idle, waiting, wait times)
+        
+        Returns:
+            Dictionary with pool metrics
+        """
+        return self.pool.stats().to_dict()
     
-    def init_db(self):
-        """Initialize database and create tables if they don't exist"""
+    def ping(self, timeout: Optional[float] = None) -> Dict:
+        """
+        Timed round trip through the pool, for readiness probes
+        
+        Checks out a connection like any request would, runs SELECT 1 and
+        reads the stored schema version. A connection that fails the probe
+        is discarded instead of going back to the pool.
+        
+        Args:
+            timeout: Seconds to wait for a free connection (default: the pool timeout)
+        
+        Returns:
+            Dictionary with acquire_ms, query_ms, latency_ms (their sum),
+            schema_version and expected_schema_version
+        
+        Raises:
+            PoolTimeout: if no connection frees up within the timeout
+            Exception: driver errors when the database is unreachable
+        """
+        started = time.perf_counter()
+        conn = self.get_connection(timeout=timeout)
         try:
-            conn = self.get_connection()
+            acquired = time.perf_counter()
             cursor = conn.cursor()
-            
-            # Adjust SQL syntax based on database type
-            if self.db_type == 'postgresql':
-                # PostgreSQL syntax
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS indicadores (
-                        id SERIAL PRIMARY KEY,
-                        id_estrategico TEXT,
-                        año INTEGER NOT NULL,
-                        indicador TEXT NOT NULL,
-                        unidad_organizacional TEXT,
-                        unidad_organizacional_colaboradora TEXT,
-                        area TEXT,
-                        lineamientos_estrategicos TEXT,
-                        meta TEXT,
-                        medida TEXT,
-                        avance REAL,
-                        avance_porcentaje INTEGER DEFAULT 0,
-                        estado TEXT DEFAULT 'Por comenzar',
-                        fecha_inicio DATE,
-                        fecha_fin_original DATE,
-                        fecha_fin_actual DATE,
-                        fecha_carga DATE DEFAULT CURRENT_DATE,
-                        tipo_indicador TEXT,
-                        tiene_hitos BOOLEAN DEFAULT FALSE,
-                        responsable TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Create hitos table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS hitos (
-                        id SERIAL PRIMARY KEY,
-                        indicador_id INTEGER NOT NULL,
-                        nombre TEXT NOT NULL,
-                        descripcion TEXT,
-                        fecha_inicio DATE,
-                        fecha_fin_planificada DATE,
-                        fecha_fin_real DATE,
-                        avance_porcentaje INTEGER DEFAULT 0,
-                        estado TEXT DEFAULT 'Por comenzar',
-                        orden INTEGER,
-                        responsable TEXT,
-                        fecha_carga DATE DEFAULT CURRENT_DATE,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (indicador_id) REFERENCES indicadores(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # Create actividades table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS actividades (
-                        id SERIAL PRIMARY KEY,
-                        hito_id INTEGER NOT NULL,
-                        descripcion_actividad TEXT NOT NULL,
-                        fecha_inicio_plan DATE,
-                        fecha_fin_plan DATE,
-                        responsable TEXT,
-                        fecha_real DATE,
-                        estado_actividad TEXT DEFAULT 'Por comenzar',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (hito_id) REFERENCES hitos(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # Create avance_mensual table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS avance_mensual (
-                        id SERIAL PRIMARY KEY,
-                        entidad TEXT NOT NULL,
-                        id_entidad INTEGER NOT NULL,
-                        mes TEXT NOT NULL,
-                        avance_reportado INTEGER NOT NULL,
-                        fecha_reporte DATE DEFAULT CURRENT_DATE,
-                        usuario TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(entidad, id_entidad, mes)
-                    )
-                """)
-                print(" PostgreSQL tables created successfully")
-            else:
-                # SQLite syntax
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS indicadores (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        id_estrategico TEXT,
-                        año INTEGER NOT NULL,
-                        indicador TEXT NOT NULL,
-                        unidad_organizacional TEXT,
-                        unidad_organizacional_colaboradora TEXT,
-                        area TEXT,
-                        lineamientos_estrategicos TEXT,
-                        meta TEXT,
-                        medida TEXT,
-                        avance REAL,
-                        avance_porcentaje INTEGER DEFAULT 0,
-                        estado TEXT DEFAULT 'Por comenzar',
-                        fecha_inicio DATE,
-                        fecha_fin_original DATE,
-                        fecha_fin_actual DATE,
-                        fecha_carga DATE DEFAULT (date('now')),
-                        tipo_indicador TEXT,
-                        tiene_hitos INTEGER DEFAULT 0,
-                        responsable TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Create hitos table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS hitos (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        indicador_id INTEGER NOT NULL,
-                        nombre TEXT NOT NULL,
-                        descripcion TEXT,
-                        fecha_inicio DATE,
-                        fecha_fin_planificada DATE,
-                        fecha_fin_real DATE,
-                        avance_porcentaje INTEGER DEFAULT 0,
-                        estado TEXT DEFAULT 'Por comenzar',
-                        orden INTEGER,
-                        responsable TEXT,
-                        fecha_carga DATE DEFAULT (date('now')),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (indicador_id) REFERENCES indicadores(id) ON DELETE CASCADE
-                    )
-                """)
-
-                # Create actividades table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS actividades (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        hito_id INTEGER NOT NULL,
-                        descripcion_actividad TEXT NOT NULL,
-                        fecha_inicio_plan DATE,
-                        fecha_fin_plan DATE,
-                        responsable TEXT,
-                        fecha_real DATE,
-                        estado_actividad TEXT DEFAULT 'Por comenzar',
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (hito_id) REFERENCES hitos(id) ON DELETE CASCADE
-                    )
-                """)
-                
-                # Create avance_mensual table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS avance_mensual (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        entidad TEXT NOT NULL,
-                        id_entidad INTEGER NOT NULL,
-                        mes TEXT NOT NULL,
-                        avance_reportado INTEGER NOT NULL,
-                        fecha_reporte DATE DEFAULT (date('now')),
-                        usuario TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        UNIQUE(entidad, id_entidad, mes)
-                    )
-                """)
-                print(" SQLite tables created successfully")
-            
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            version = self._schema_version(cursor)
+            cursor.close()
+            conn.rollback()
+            finished = time.perf_counter()
+        except Exception:
+            conn.discard()
+            raise
+        finally:
+            conn.close()
+        
+        return {
+            'acquire_ms': round((acquired - started) * 1000, 3),
+            'query_ms': round((finished - acquired) * 1000, 3),
+            'latency_ms': round((finished - started) * 1000, 3),
+            'schema_version': version,
+            'expected_schema_version': SCHEMA_VERSION,
+        }
+    
+    def get_data_version(self, uow: Optional[UnitOfWork] = None) -> Dict[str, int]:
+        """
+        Per-entity write counters from the data_version table
+        
+        Shared by every process using the database, so a cache can check
+        whether anything changed with this single primary-key-sized query.
+        
+        Args:
+            uow: Optional unit of work to run in
+        
+        Returns:
+            Dictionary entity -> version (see DATA_VERSION_ENTITIES)
+        """
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT entidad, version FROM data_version")
+            return {row['entidad']: int(row['version']) for row in cursor.fetchall()}
+    
+    def _data_version_key(self) -> Tuple:
+        """Hashable snapshot of get_data_version() for the read cache"""
+        return tuple(sorted(self.get_data_version().items()))
+    
+    def _bump_data_version(self, cursor, entities):
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        entities = sorted(entities)
+        cursor.execute(f"""
+            UPDATE data_version SET version = version + 1
+            WHERE entidad IN ({', '.join([placeholder] * len(entities))})
+        """, entities)
+    
+    def get_cache_stats(self) -> Optional[Dict]:
+        """
+        Get read cache statistics (hits, misses, evictions, size)
+        
+        Returns:
+            Dictionary with cache metrics, or None if the cache is disabled
+        """
+        return self.cache.stats() if self.cache is not None else None
+    
+    def close(self):
+        """Close all idle pooled connections"""
+        self.pool.close()
+    
+    def unit_of_work(self) -> UnitOfWork:
+        """Start a unit of work (one connection, one transaction)"""
+        return UnitOfWork(self)
+    
+    @contextmanager
+    def _connection(self, uow: Optional[UnitOfWork] = None):
+        """
+        Yield the connection to run a method on
+        
+        Inside a unit of work the shared connection is used and transaction
+        control is left to the caller; otherwise a pooled connection is checked
+        out, committed on success, rolled back on error and returned.
+        """
+        if uow is not None:
+            yield uow.connection
+            return
+        
+        conn = self.get_connection()
+        try:
+            yield conn
             conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
             conn.close()
+    
+    def _insert(self, cursor, query: str, params) -> int:
+        """Execute an INSERT and return the new row id"""
+        if self.db_type == 'postgresql':
+            cursor.execute(query + " RETURNING id", params)
+            return cursor.fetchone()['id']
+        cursor.execute(query, params)
+        return cursor.lastrowid
+    
+    @staticmethod
+    def _read_records(query: str, conn, params=None) -> Tuple[List[str], List[Dict]]:
+        """Run a query and return its column names and rows as plain dicts"""
+        cursor = conn.cursor()
+        cursor.execute(query, params or [])
+        columns = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+        return columns, [
+            dict(zip(columns, row.values() if isinstance(row, dict) else row)) for row in rows
+        ]
+    
+    @staticmethod
+    def _read_sql(query: str, conn, params=None) -> pd.DataFrame:
+        """Run a query on a pooled connection and return a DataFrame"""
+        cursor = conn.cursor()
+        cursor.execute(query, params or [])
+        columns = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+        records = [tuple(row.values()) if isinstance(row, dict) else tuple(row) for row in rows]
+        return pd.DataFrame.from_records(records, columns=columns, coerce_float=True)
+    
+    def init_db(self, force: bool = False):
+        """
+        Initialize database and create tables if they don't exist
+        
+        The DDL is skipped when the stored schema version already matches
+        SCHEMA_VERSION, so opening an up-to-date database costs one query.
+        
+        Args:
+            force: Re-run the DDL even if the schema version matches
+        """
+        started = time.perf_counter()
+        try:
+            added = False
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                applied = force or self._schema_version(cursor) != SCHEMA_VERSION
+                if applied:
+                    self._create_tables(cursor)
+                    added = self._add_missing_columns(cursor)
+                    self._create_indexes(cursor)
+                    self._create_data_version(cursor)
+                    self._store_schema_version(cursor)
+            
+            if added:
+                # Columns added to an existing database: backfill from history
+                print("   Backfilling ultimo_avance from avance_mensual...")
+                self.rebuild_ultimo_avance()
+            
+            self.init_ms = (time.perf_counter() - started) * 1000
+            action = "applied" if applied else "up to date"
+            print(f"   Schema v{SCHEMA_VERSION} {action} ({self.init_ms:.1f} ms)")
         except Exception as e:
             print(f" ERROR creating database tables: {str(e)}")
             import traceback
             traceback.print_exc()
             raise
     
+    def _schema_version(self, cursor) -> Optional[int]:
+        """Schema version stored by the last init_db, None for unversioned databases"""
+        if self.db_type == 'postgresql':
+            cursor.execute("""
+                SELECT 1 FROM information_schema.tables
+                WHERE table_name = 'schema_version'
+            """)
+        else:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'")
+        if cursor.fetchone() is None:
+            return None
+        
+        cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+        row = cursor.fetchone()
+        return row['version'] if row else None
+    
+    def _create_data_version(self, cursor):
+        """Create and seed the data_version counters"""
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_version (
+                entidad TEXT PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0
+            )
+        """)
+        for entity in DATA_VERSION_ENTITIES:
+            cursor.execute(f"""
+                INSERT INTO data_version (entidad, version) VALUES ({placeholder}, 0)
+                ON CONFLICT (entidad) DO NOTHING
+            """, (entity,))
+    
+    def _store_schema_version(self, cursor):
+        """Record SCHEMA_VERSION as the applied schema"""
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("DELETE FROM schema_version")
+        cursor.execute(f"INSERT INTO schema_version (version) VALUES ({placeholder})", (SCHEMA_VERSION,))
+    
+    def _create_tables(self, cursor):
+        """Create tables if they don't exist"""
+        # Adjust SQL syntax based on database type
+        if self.db_type == 'postgresql':
+            # PostgreSQL syntax
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS indicadores (
+                    id SERIAL PRIMARY KEY,
+                    id_estrategico TEXT,
+                    año INTEGER NOT NULL,
+                    indicador TEXT NOT NULL,
+                    unidad_organizacional TEXT,
+                    unidad_organizacional_colaboradora TEXT,
+                    area TEXT,
+                    lineamientos_estrategicos TEXT,
+                    meta TEXT,
+                    medida TEXT,
+                    avance REAL,
+                    avance_porcentaje INTEGER DEFAULT 0,
+                    estado TEXT DEFAULT 'Por comenzar',
+                    fecha_inicio DATE,
+                    fecha_fin_original DATE,
+                    fecha_fin_actual DATE,
+                    fecha_carga DATE DEFAULT CURRENT_DATE,
+                    tipo_indicador TEXT,
+                    tiene_hitos BOOLEAN DEFAULT FALSE,
+                    tiene_actividades BOOLEAN DEFAULT FALSE,
+                    responsable TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Create hitos table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS hitos (
+                    id SERIAL PRIMARY KEY,
+                    indicador_id INTEGER NOT NULL,
+                    nombre TEXT NOT NULL,
+                    descripcion TEXT,
+                    fecha_inicio DATE,
+                    fecha_fin_planificada DATE,
+                    fecha_fin_real DATE,
+                    avance_porcentaje INTEGER DEFAULT 0,
+                    estado TEXT DEFAULT 'Por comenzar',
+                    orden INTEGER,
+                    responsable TEXT,
+                    ultimo_avance INTEGER,
+                    ultimo_avance_mes TEXT,
+                    fecha_carga DATE DEFAULT CURRENT_DATE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (indicador_id) REFERENCES indicadores(id) ON DELETE CASCADE
+                )
+            """)
+            
+            # Create actividades table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS actividades (
+                    id SERIAL PRIMARY KEY,
+                    hito_id INTEGER NOT NULL,
+                    descripcion_actividad TEXT NOT NULL,
+                    fecha_inicio_plan DATE,
+                    fecha_fin_plan DATE,
+                    responsable TEXT,
+                    fecha_real DATE,
+                    estado_actividad TEXT DEFAULT 'Por comenzar',
+                    ultimo_avance INTEGER,
+                    ultimo_avance_mes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (hito_id) REFERENCES hitos(id) ON DELETE CASCADE
+                )
+            """)
+            
+            # Create avance_mensual table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS avance_mensual (
+                    id SERIAL PRIMARY KEY,
+                    entidad TEXT NOT NULL,
+                    id_entidad INTEGER NOT NULL,
+                    mes TEXT NOT NULL,
+                    avance_reportado INTEGER NOT NULL,
+                    fecha_reporte DATE DEFAULT CURRENT_DATE,
+                    usuario TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(entidad, id_entidad, mes)
+                )
+            """)
+            print(" PostgreSQL tables created successfully")
+        else:
+            # SQLite syntax
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS indicadores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id_estrategico TEXT,
+                    año INTEGER NOT NULL,
+                    indicador TEXT NOT NULL,
+                    unidad_organizacional TEXT,
+                    unidad_organizacional_colaboradora TEXT,
+                    area TEXT,
+                    lineamientos_estrategicos TEXT,
+                    meta TEXT,
+                    medida TEXT,
+                    avance REAL,
+                    avance_porcentaje INTEGER DEFAULT 0,
+                    estado TEXT DEFAULT 'Por comenzar',
+                    fecha_inicio DATE,
+                    fecha_fin_original DATE,
+                    fecha_fin_actual DATE,
+                    fecha_carga DATE DEFAULT (date('now')),
+                    tipo_indicador TEXT,
+                    tiene_hitos INTEGER DEFAULT 0,
+                    tiene_actividades INTEGER DEFAULT 0,
+                    responsable TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Create hitos table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS hitos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    indicador_id INTEGER NOT NULL,
+                    nombre TEXT NOT NULL,
+                    descripcion TEXT,
+                    fecha_inicio DATE,
+                    fecha_fin_planificada DATE,
+                    fecha_fin_real DATE,
+                    avance_porcentaje INTEGER DEFAULT 0,
+                    estado TEXT DEFAULT 'Por comenzar',
+                    orden INTEGER,
+                    responsable TEXT,
+                    ultimo_avance INTEGER,
+                    ultimo_avance_mes TEXT,
+                    fecha_carga DATE DEFAULT (date('now')),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (indicador_id) REFERENCES indicadores(id) ON DELETE CASCADE
+                )
+            """)
+
+            # Create actividades table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS actividades (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    hito_id INTEGER NOT NULL,
+                    descripcion_actividad TEXT NOT NULL,
+                    fecha_inicio_plan DATE,
+                    fecha_fin_plan DATE,
+                    responsable TEXT,
+                    fecha_real DATE,
+                    estado_actividad TEXT DEFAULT 'Por comenzar',
+                    ultimo_avance INTEGER,
+                    ultimo_avance_mes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (hito_id) REFERENCES hitos(id) ON DELETE CASCADE
+                )
+            """)
+            
+            # Create avance_mensual table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS avance_mensual (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entidad TEXT NOT NULL,
+                    id_entidad INTEGER NOT NULL,
+                    mes TEXT NOT NULL,
+                    avance_reportado INTEGER NOT NULL,
+                    fecha_reporte DATE DEFAULT (date('now')),
+                    usuario TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(entidad, id_entidad, mes)
+                )
+            """)
+            print(" SQLite tables created successfully")
+    
+    def _add_missing_columns(self, cursor) -> bool:
+        """
+        Add ULTIMO_AVANCE_COLUMNS to tables created before they existed
+        
+        Returns:
+            True if any column was added
+        """
+        added = False
+        for table, column, column_type in ULTIMO_AVANCE_COLUMNS:
+            if self.db_type == 'postgresql':
+                cursor.execute("""
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = %s AND column_name = %s
+                """, (table, column))
+                exists = cursor.fetchone() is not None
+            else:
+                cursor.execute(f"PRAGMA table_info({table})")
+                exists = any(row['name'] == column for row in cursor.fetchall())
+            
+            if not exists:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                added = True
+        return added
+    
+    def _create_indexes(self, cursor):
+        """Create the secondary indexes listed in INDEXES (same syntax on both dialects)"""
+        for name in OBSOLETE_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        for name, table, columns in INDEXES:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+    
+    def verify_indexes(self) -> List[Dict]:
+        """
+        Run EXPLAIN on each hot query and check that it uses its index
+        
+        On PostgreSQL sequential scans are disabled for the check, so small
+        tables don't hide a missing or unusable index.
+        
+        Returns:
+            List of dicts with name, expected index, used flag and the plan text
+        """
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        results = []
+        
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            if self.db_type == 'postgresql':
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            
+            for name, query, params, index in HOT_QUERIES:
+                query = query.format(p=placeholder)
+                if self.db_type == 'postgresql':
+                    cursor.execute(f"EXPLAIN {query}", params)
+                    plan = "\n".join(row['QUERY PLAN'] for row in cursor.fetchall())
+                else:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+                    plan = "\n".join(row['detail'] for row in cursor.fetchall())
+                
+                results.append({
+                    'name': name,
+                    'index': index,
+                    'used': index in plan,
+                    'plan': plan
+                })
+            
+            # Never keep the planner override around
+            conn.rollback()
+        
+        return results
+    
+    @_writes('indicadores')
     def create_indicador(
         self,
         año: int,
@@ -263,7 +1075,8 @@ class Database:
         fecha_fin_actual: str = None,
         tiene_hitos: bool = False,
         tiene_actividades: bool = False,
-        responsable: str = None
+        responsable: str = None,
+        uow: Optional[UnitOfWork] = None
     ) -> int:
         """
         Create a new indicator
@@ -276,6 +1089,7 @@ class Database:
             responsable: Person responsible for the indicator
             meta: Target value (for quantitative indicators, should be numeric)
             avance: Current progress value (for quantitative indicators)
+            uow: Optional unit of work to run in
             ... (other args)
         
         Returns:
@@ -285,9 +1099,6 @@ class Database:
             - avance_porcentaje is calculated automatically for quantitative indicators (without hitos)
             - fecha_carga is set automatically by database DEFAULT
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         # Calculate avance_porcentaje for quantitative indicators (without hitos)
         avance_porcentaje = 0
         if not tiene_hitos and meta and avance is not None:
@@ -302,122 +1113,283 @@ class Database:
         
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
-        # fecha_carga will be set automatically by DEFAULT CURRENT_DATE / date('now')
-        cursor.execute(f"""
-            INSERT INTO indicadores 
-            (id_estrategico, año, indicador, unidad_organizacional, 
-             unidad_organizacional_colaboradora, area, lineamientos_estrategicos,
-             meta, medida, avance, avance_porcentaje, estado,
-             fecha_inicio, fecha_fin_original, fecha_fin_actual,
-             tipo_indicador, tiene_hitos, tiene_actividades, responsable)
-            VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, 
-                    {placeholder}, {placeholder}, {placeholder}, {placeholder}, 
-                    {placeholder}, {placeholder}, {placeholder}, {placeholder}, 
-                    {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-        """, (id_estrategico, año, indicador, unidad_organizacional,
-              unidad_organizacional_colaboradora, area, lineamientos_estrategicos,
-              meta, medida, avance, avance_porcentaje, estado,
-              fecha_inicio, fecha_fin_original, fecha_fin_actual,
-              tipo_indicador, tiene_hitos, tiene_actividades, responsable))
-        
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            
+            # fecha_carga will be set automatically by DEFAULT CURRENT_DATE / date('now')
+            record_id = self._insert(cursor, f"""
+                INSERT INTO indicadores 
+                (id_estrategico, año, indicador, unidad_organizacional, 
+                 unidad_organizacional_colaboradora, area, lineamientos_estrategicos,
+                 meta, medida, avance, avance_porcentaje, estado,
+                 fecha_inicio, fecha_fin_original, fecha_fin_actual,
+                 tipo_indicador, tiene_hitos, tiene_actividades, responsable)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, 
+                        {placeholder}, {placeholder}, {placeholder}, {placeholder}, 
+                        {placeholder}, {placeholder}, {placeholder}, {placeholder}, 
+                        {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+            """, (id_estrategico, año, indicador, unidad_organizacional,
+                  unidad_organizacional_colaboradora, area, lineamientos_estrategicos,
+                  meta, medida, avance, avance_porcentaje, estado,
+                  fecha_inicio, fecha_fin_original, fecha_fin_actual,
+                  tipo_indicador, tiene_hitos, tiene_actividades, responsable))
         
         return record_id
     
+    @_cached
     def get_all_indicadores(
         self,
-        area: Optional[str] = None,
-        año: Optional[int] = None,
-        unidad_organizacional: Optional[str] = None,
-        tipo_indicador: Optional[str] = None,
-        estado: Optional[str] = None
+        area: Union[str, List[str], None] = None,
+        año: Union[int, List[int], None] = None,
+        unidad_organizacional: Union[str, List[str], None] = None,
+        tipo_indicador: Union[str, List[str], None] = None,
+        estado: Union[str, List[str], None] = None,
+        responsable: Union[str, List[str], None] = None,
+        fecha_inicio_desde: Optional[str] = None,
+        fecha_inicio_hasta: Optional[str] = None,
+        fecha_fin_desde: Optional[str] = None,
+        fecha_fin_hasta: Optional[str] = None,
+        uow: Optional[UnitOfWork] = None
     ) -> pd.DataFrame:
         """
         Retrieve all indicators with optional filtering
         
+        Every filter accepts a single value or a list of values (IN).
+        
         Args:
             area: Filter by area
             año: Filter by year
             unidad_organizacional: Filter by organizational unit
             tipo_indicador: Filter by indicator type
             estado: Filter by status
+            responsable: Filter by responsable
+            fecha_inicio_desde / fecha_inicio_hasta: Inclusive range on fecha_inicio (YYYY-MM-DD)
+            fecha_fin_desde / fecha_fin_hasta: Inclusive range on fecha_fin_actual (YYYY-MM-DD)
+            uow: Optional unit of work to run in
         
         Returns:
             DataFrame with all matching records
         """
-        conn = self.get_connection(use_dict_cursor=False)
+        where, params = self._indicadores_where(
+            area=area, año=año, unidad_organizacional=unidad_organizacional,
+            tipo_indicador=tipo_indicador, estado=estado, responsable=responsable,
+            fecha_inicio_desde=fecha_inicio_desde, fecha_inicio_hasta=fecha_inicio_hasta,
+            fecha_fin_desde=fecha_fin_desde, fecha_fin_hasta=fecha_fin_hasta
+        )
+        query = f"SELECT * FROM indicadores WHERE {where} ORDER BY created_at DESC, id DESC"
+        
+        with self._connection(uow) as conn:
+            return self._read_sql(query, conn, params=params)
+    
+    @_cached
+    def get_indicadores_page(
+        self,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: str = 'created_at',
+        descending: bool = True,
+        with_total: bool = False,
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None,
+        **filters
+    ) -> Dict:
+        """
+        Keyset-paginated version of get_all_indicadores
         
-        query = "SELECT * FROM indicadores WHERE 1=1"
-        params = []
+        Args:
+            limit: Page size (None returns every remaining row)
+            cursor: next_cursor of the previous page
+            sort: Key of INDICADOR_SORTS
+            descending: Sort direction
+            with_total: Also count every row matching the filters
+            as_records: Return items as a list of dicts instead of a DataFrame
+            uow: Optional unit of work to run in
+            **filters: Same filters as get_all_indicadores
         
-        if area:
-            query += " AND area = %s" if self.db_type == 'postgresql' else " AND area = ?"
-            params.append(area)
+        Returns:
+            Dict with 'items' (DataFrame), 'next_cursor' and 'total'
         
-        if año:
-            query += " AND año = %s" if self.db_type == 'postgresql' else " AND año = ?"
-            params.append(año)
+        Raises:
+            ValueError: for an unknown sort or an invalid cursor
+        """
+        if sort not in INDICADOR_SORTS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of {list(INDICADOR_SORTS)}")
+        
+        where, params = self._indicadores_where(**filters)
+        return self._keyset_page(
+            "indicadores", where, params, INDICADOR_SORTS[sort], sort,
+            limit=limit, cursor=cursor, descending=descending,
+            with_total=with_total, as_records=as_records, uow=uow
+        )
+    
+    def _keyset_page(
+        self,
+        table: str,
+        where: str,
+        params: List,
+        keys: Tuple[str, ...],
+        sort: str,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        with_total: bool = False,
+        select: str = "*",
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        Fetch one page ordered by keys, continuing after the cursor position
         
-        if unidad_organizacional:
-            query += " AND unidad_organizacional = %s" if self.db_type == 'postgresql' else " AND unidad_organizacional = ?"
-            params.append(unidad_organizacional)
+        The page is read with a row-value comparison on the sort keys, so every
+        page is an index range scan instead of an OFFSET over skipped rows.
+        The last key must be unique; key expressions are exposed as _k0.._kn.
+        With as_records the items are plain dicts built from the cursor rows
+        (no DataFrame), for callers that serialize them directly.
+        """
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        direction = "DESC" if descending else "ASC"
+        key_list = ", ".join(keys)
+        key_columns = [f"_k{i}" for i in range(len(keys))]
+        
+        page_where = where
+        page_params = list(params)
+        if cursor:
+            values = _decode_cursor(cursor, sort, len(keys))
+            operator = "<" if descending else ">"
+            marks = ", ".join([placeholder] * len(keys))
+            page_where += f" AND ({key_list}) {operator} ({marks})"
+            page_params.extend(values)
+        
+        aliases = ", ".join(f"{key} AS {name}" for key, name in zip(keys, key_columns))
+        query = f"""
+            SELECT {select}, {aliases} FROM {table}
+            WHERE {page_where}
+            ORDER BY {", ".join(f"{key} {direction}" for key in keys)}
+        """
+        if limit is not None:
+            query += f" LIMIT {int(limit) + 1}"
         
-        if tipo_indicador:
-            query += " AND tipo_indicador = %s" if self.db_type == 'postgresql' else " AND tipo_indicador = ?"
-            params.append(tipo_indicador)
+        with self._connection(uow) as conn:
+            columns, records = self._read_records(query, conn, params=page_params)
+            
+            total = None
+            if with_total:
+                count_cursor = conn.cursor()
+                count_cursor.execute(f"SELECT COUNT(*) AS total FROM {table} WHERE {where}", params)
+                row = count_cursor.fetchone()
+                total = row['total'] if isinstance(row, dict) else row[0]
+        
+        next_cursor = None
+        if limit is not None and len(records) > limit:
+            records = records[:limit]
+            next_cursor = _encode_cursor(sort, [records[-1][name] for name in key_columns])
+        
+        for record in records:
+            for name in key_columns:
+                del record[name]
+        
+        if not as_records:
+            columns = [column for column in columns if column not in key_columns]
+            records = pd.DataFrame.from_records(records, columns=columns, coerce_float=True)
         
-        if estado:
-            query += " AND estado = %s" if self.db_type == 'postgresql' else " AND estado = ?"
-            params.append(estado)
+        return {
+            'items': records,
+            'next_cursor': next_cursor,
+            'total': total
+        }
+    
+    def _indicadores_where(
+        self,
+        fecha_inicio_desde: Optional[str] = None,
+        fecha_inicio_hasta: Optional[str] = None,
+        fecha_fin_desde: Optional[str] = None,
+        fecha_fin_hasta: Optional[str] = None,
+        **equals
+    ) -> Tuple[str, List]:
+        """
+        Build the WHERE clause shared by the indicadores list queries
         
-        query += " ORDER BY created_at DESC"
+        Args:
+            fecha_*: Inclusive date bounds
+            **equals: column -> value or list of values; empty values are ignored
+        
+        Returns:
+            (where_sql, params)
+        """
+        return self._where(equals, [
+            ('fecha_inicio', '>=', fecha_inicio_desde),
+            ('fecha_inicio', '<=', fecha_inicio_hasta),
+            ('fecha_fin_actual', '>=', fecha_fin_desde),
+            ('fecha_fin_actual', '<=', fecha_fin_hasta),
+        ])
+    
+    def _where(self, equals: Dict, ranges: List[Tuple] = ()) -> Tuple[str, List]:
+        """
+        Build a WHERE clause from equality/IN filters and range bounds
         
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
+        Args:
+            equals: column -> value or list of values; empty values are ignored
+            ranges: (column, operator, value) bounds; empty values are ignored
+        
+        Returns:
+            (where_sql, params)
+        """
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        conditions = ["1=1"]
+        params = []
         
-        return df
+        for column, value in equals.items():
+            if isinstance(value, (list, tuple, set)):
+                values = [v for v in value if v is not None and v != '']
+                if len(values) == 1:
+                    value = values[0]
+                elif values:
+                    conditions.append(f"{column} IN ({', '.join([placeholder] * len(values))})")
+                    params.extend(values)
+                    continue
+                else:
+                    continue
+            if value:
+                conditions.append(f"{column} = {placeholder}")
+                params.append(value)
+        
+        for column, operator, value in ranges:
+            if value:
+                conditions.append(f"{column} {operator} {placeholder}")
+                params.append(str(value))
+        
+        return " AND ".join(conditions), params
     
-    def get_indicador_by_id(self, indicador_id: int) -> Optional[Dict]:
+    @_cached
+    def get_indicador_by_id(self, indicador_id: int, uow: Optional[UnitOfWork] = None) -> Optional[Dict]:
         """
         Get a single indicator by ID
         
         Args:
             indicador_id: ID of the indicator
+            uow: Optional unit of work to run in
         
         Returns:
             Dictionary with indicator data or None if not found
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"SELECT * FROM indicadores WHERE id = {placeholder}", (indicador_id,))
-        row = cursor.fetchone()
-        conn.close()
         
-        if row:
-            if self.db_type == 'postgresql':
-                # PostgreSQL with RealDictCursor already returns a dict-like object
-                # But we need to be careful if we change cursor factory in future
-                if hasattr(row, 'keys') or isinstance(row, dict):
-                    return dict(row)
-                
-                # Fallback for tuple cursor
-                columns = [desc[0] for desc in cursor.description]
-                return dict(zip(columns, row))
-            else:
-                # SQLite with row_factory returns dict-like object
-                return dict(row)
-        return None
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT * FROM indicadores WHERE id = {placeholder}", (indicador_id,))
+            row = cursor.fetchone()
+        
+        # RealDictCursor (PG) and sqlite3.Row (SQLite) both convert with dict()
+        return dict(row) if row else None
     
+    @_writes('indicadores')
     def update_avance(
         self,
         indicador_id: int,
         nuevo_avance: float = None,
         nueva_meta: str = None,
-        nuevo_estado: str = None
+        nuevo_estado: str = None,
+        uow: Optional[UnitOfWork] = None
     ) -> bool:
         """
         Update progress for a quantitative indicator (without hitos)
@@ -428,17 +1400,14 @@ class Database:
             nuevo_avance: New progress value
             nueva_meta: New target value
             nuevo_estado: New status
+            uow: Optional unit of work to run in
         
         Returns:
             True if update was successful, False otherwise
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         # Get current values
-        indicador = self.get_indicador_by_id(indicador_id)
+        indicador = self.get_indicador_by_id(indicador_id, uow=uow)
         if not indicador:
-            conn.close()
             return False
         
         # Use new values or keep current ones
@@ -460,102 +1429,217 @@ class Database:
         
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
-        cursor.execute(f"""
-            UPDATE indicadores 
-            SET avance = {placeholder},
-                meta = {placeholder},
-                avance_porcentaje = {placeholder},
-                estado = {placeholder},
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = {placeholder}
-        """, (avance, meta, avance_porcentaje, estado, indicador_id))
-        
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        
-        return success
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE indicadores 
+                SET avance = {placeholder},
+                    meta = {placeholder},
+                    avance_porcentaje = {placeholder},
+                    estado = {placeholder},
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = {placeholder}
+            """, (avance, meta, avance_porcentaje, estado, indicador_id))
+            
+            return cursor.rowcount > 0
     
-    def delete_indicador(self, indicador_id: int) -> bool:
+    @_writes('indicadores', 'hitos', 'actividades')
+    def delete_indicador(self, indicador_id: int, uow: Optional[UnitOfWork] = None) -> bool:
         """
         Delete an indicator by ID
         
         Args:
             indicador_id: ID of the indicator to delete
+            uow: Optional unit of work to run in
         
         Returns:
             True if successful, False otherwise
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"DELETE FROM indicadores WHERE id = {placeholder}", (indicador_id,))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
         
-        return success
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DELETE FROM indicadores WHERE id = {placeholder}", (indicador_id,))
+            return cursor.rowcount > 0
     
-    def get_summary_stats(self) -> Dict:
+    @_cached
+    def get_summary_stats(self, uow: Optional[UnitOfWork] = None) -> Dict:
         """
         Get summary statistics for dashboard
         
+        Args:
+            uow: Optional unit of work to run in
+        
         Returns:
             Dictionary with summary metrics
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Total indicators
-        cursor.execute("SELECT COUNT(*) as total FROM indicadores")
-        total = cursor.fetchone()['total']
-        
-        # By status
+        with self._connection(uow) as conn:
+            return self._summary_stats(conn.cursor())
+    
+    @staticmethod
+    def _summary_stats(cursor) -> Dict:
+        """Totals by estado and average progress in a single GROUP BY"""
         cursor.execute("""
-            SELECT estado, COUNT(*) as count 
-            FROM indicadores 
+            SELECT estado, COUNT(*) as count, SUM(avance) as sum_avance, COUNT(avance) as n_avance
+            FROM indicadores
             GROUP BY estado
         """)
-        status_counts = {row['estado']: row['count'] for row in cursor.fetchall()}
-        
-        # Average progress
-        cursor.execute("SELECT AVG(avance) as avg_avance FROM indicadores")
-        avg_avance = cursor.fetchone()['avg_avance'] or 0
+        rows = cursor.fetchall()
         
-        conn.close()
+        status_counts = {row['estado']: row['count'] for row in rows}
+        sum_avance = sum(row['sum_avance'] or 0 for row in rows)
+        n_avance = sum(row['n_avance'] for row in rows)
+        avg_avance = float(sum_avance) / n_avance if n_avance else 0
         
         return {
-            'total': total,
+            'total': sum(status_counts.values()),
             'por_comenzar': status_counts.get('Por comenzar', 0),
             'en_progreso': status_counts.get('En progreso', 0),
             'completado': status_counts.get('Completado', 0),
             'avg_avance': round(avg_avance, 1)
         }
     
-    def get_unique_values(self, column: str) -> List[str]:
+    @_cached
+    def get_dashboard_bundle(self, uow: Optional[UnitOfWork] = None) -> Dict:
+        """
+        Summary statistics plus the distinct values of every facet column
+        
+        Two queries on one connection: the estado GROUP BY and a UNION ALL of
+        one DISTINCT per column in FACET_COLUMNS.
+        
+        Args:
+            uow: Optional unit of work to run in
+        
+        Returns:
+            Dict with 'stats' (as get_summary_stats) and 'facets'
+            (column -> sorted list of values, as get_unique_values)
+        """
+        facet_query = " UNION ALL ".join(
+            f"SELECT '{column}' AS facet, CAST({column} AS TEXT) AS value "
+            f"FROM indicadores WHERE {column} IS NOT NULL GROUP BY {column}"
+            for column in FACET_COLUMNS
+        )
+        
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            stats = self._summary_stats(cursor)
+            cursor.execute(facet_query)
+            rows = cursor.fetchall()
+        
+        facets = {column: [] for column in FACET_COLUMNS}
+        for row in rows:
+            facets[row['facet']].append(row['value'])
+        facets['año'] = [int(value) for value in facets['año']]
+        for column in FACET_COLUMNS:
+            facets[column].sort()
+        
+        return {'stats': stats, 'facets': facets}
+    
+    @_cached
+    def get_unique_values(self, column: str, uow: Optional[UnitOfWork] = None) -> List[str]:
         """
         Get unique values for a column (useful for filters)
         
         Args:
             column: Column name
+            uow: Optional unit of work to run in
         
         Returns:
             List of unique values
         """
-        conn = self.get_connection(use_dict_cursor=False)
-        cursor = conn.cursor()
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            
+            # Use parameterized query safely (column name is validated by caller)
+            cursor.execute(f"SELECT DISTINCT {column} AS value FROM indicadores WHERE {column} IS NOT NULL ORDER BY {column}")
+            return [row['value'] for row in cursor.fetchall()]
+    
+    @_cached
+    def load_hierarchy(self, indicador_ids: Optional[List[int]] = None, uow: Optional[UnitOfWork] = None) -> List[Dict]:
+        """
+        Load indicadores with their hitos, actividades and latest avances
+        
+        Runs three queries (indicadores, hitos, actividades) per batch of IDs,
+        regardless of how many hitos/actividades there are, and assembles the
+        tree in memory.
         
-        # Use parameterized query safely (column name is validated by caller)
-        cursor.execute(f"SELECT DISTINCT {column} FROM indicadores WHERE {column} IS NOT NULL ORDER BY {column}")
-        values = [row[0] for row in cursor.fetchall()]
+        Args:
+            indicador_ids: IDs to load (None loads every indicator)
+            uow: Optional unit of work to run in
+        
+        Returns:
+            List of indicator dicts, each with a 'hitos' list whose items carry
+            an 'actividades' list. Ordered like indicador_ids, or by created_at
+            DESC when loading everything.
+        """
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
-        conn.close()
-        return values
+        if indicador_ids is None:
+            batches = [None]
+        else:
+            indicador_ids = list(dict.fromkeys(int(i) for i in indicador_ids))
+            if not indicador_ids:
+                return []
+            batches = list(self._chunks(indicador_ids, 500))
+        
+        indicadores, hitos, actividades = [], [], []
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            for batch in batches:
+                if batch is None:
+                    where_ind, where_hito, params = "", "", []
+                else:
+                    in_list = ', '.join([placeholder] * len(batch))
+                    where_ind = f"WHERE i.id IN ({in_list})"
+                    where_hito = f"WHERE h.indicador_id IN ({in_list})"
+                    params = batch
+                
+                cursor.execute(f"""
+                    SELECT i.* FROM indicadores i
+                    {where_ind}
+                    ORDER BY i.created_at DESC, i.id DESC
+                """, params)
+                indicadores.extend(dict(row) for row in cursor.fetchall())
+                
+                cursor.execute(f"""
+                    SELECT h.*, COALESCE(h.ultimo_avance, 0) as ultimo_avance_reportado
+                    FROM hitos h
+                    {where_hito}
+                    ORDER BY h.indicador_id, COALESCE(h.orden, 0), h.id
+                """, params)
+                hitos.extend(dict(row) for row in cursor.fetchall())
+                
+                cursor.execute(f"""
+                    SELECT a.*, COALESCE(a.ultimo_avance, 0) as ultimo_avance_reportado
+                    FROM actividades a
+                    JOIN hitos h ON a.hito_id = h.id
+                    {where_hito}
+                    ORDER BY a.hito_id, a.id
+                """, params)
+                actividades.extend(dict(row) for row in cursor.fetchall())
+        
+        # Assemble the tree
+        actividades_by_hito = {}
+        for actividad in actividades:
+            actividades_by_hito.setdefault(actividad['hito_id'], []).append(actividad)
+        
+        hitos_by_indicador = {}
+        for hito in hitos:
+            hito['actividades'] = actividades_by_hito.get(hito['id'], [])
+            hitos_by_indicador.setdefault(hito['indicador_id'], []).append(hito)
+        
+        for indicador in indicadores:
+            indicador['hitos'] = hitos_by_indicador.get(indicador['id'], [])
+        
+        if indicador_ids is not None:
+            position = {indicador_id: i for i, indicador_id in enumerate(indicador_ids)}
+            indicadores.sort(key=lambda ind: position[ind['id']])
+        
+        return indicadores
     
     # ==================== HITOS METHODS ====================
     
+    @_writes('hitos')
     def create_hito(
         self,
         indicador_id: int,
@@ -567,137 +1651,132 @@ class Database:
         avance_porcentaje: int = 0,
         estado: str = "Por comenzar",
         orden: int = None,
-        responsable: str = None
+        responsable: str = None,
+        uow: Optional[UnitOfWork] = None
     ) -> int:
         """Create a new hito for an indicator"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"""
-            INSERT INTO hitos 
-            (indicador_id, nombre, descripcion, fecha_inicio, fecha_fin_planificada,
-             fecha_fin_real, avance_porcentaje, estado, orden, responsable)
-            VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
-                    {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-        """, (indicador_id, nombre, descripcion, fecha_inicio, fecha_fin_planificada,
-              fecha_fin_real, avance_porcentaje, estado, orden, responsable))
         
-        hito_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            return self._insert(cursor, f"""
+                INSERT INTO hitos 
+                (indicador_id, nombre, descripcion, fecha_inicio, fecha_fin_planificada,
+                 fecha_fin_real, avance_porcentaje, estado, orden, responsable)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
+                        {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+            """, (indicador_id, nombre, descripcion, fecha_inicio, fecha_fin_planificada,
+                  fecha_fin_real, avance_porcentaje, estado, orden, responsable))
+    
+    @_cached
+    def get_hitos_by_indicador(self, indicador_id: int, uow: Optional[UnitOfWork] = None) -> pd.DataFrame:
+        """Get all hitos for a specific indicator"""
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        query = f"""
+            SELECT h.*, COALESCE(h.ultimo_avance, 0) as ultimo_avance_reportado
+            FROM hitos h
+            WHERE h.indicador_id = {placeholder}
+            ORDER BY COALESCE(h.orden, 0), h.id
+        """
         
-        return hito_id
+        with self._connection(uow) as conn:
+            return self._read_sql(query, conn, params=[indicador_id])
     
-    def get_hitos_by_indicador(self, indicador_id: int) -> pd.DataFrame:
-        """Get all hitos for a specific indicator"""
-        conn = self.get_connection(use_dict_cursor=False)
+    @_cached
+    def get_hitos_page(
+        self,
+        indicador_id: int,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        Keyset-paginated version of get_hitos_by_indicador (ordered by orden, id)
         
+        Returns:
+            Dict with 'items' (DataFrame), 'next_cursor' and 'total'
+        """
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        query = f"SELECT * FROM hitos WHERE indicador_id = {placeholder} ORDER BY orden, id"
-        
-        df = pd.read_sql_query(query, conn, params=[indicador_id])
-        conn.close()
-        
-        return df
+        return self._keyset_page(
+            "hitos", f"indicador_id = {placeholder}", [indicador_id],
+            ("COALESCE(orden, 0)", "id"), 'orden',
+            limit=limit, cursor=cursor, with_total=with_total,
+            select="*, COALESCE(ultimo_avance, 0) as ultimo_avance_reportado",
+            as_records=as_records, uow=uow
+        )
     
-    def update_hito_avance(self, hito_id: int, nuevo_avance_porcentaje: int) -> bool:
+    @_writes('hitos')
+    def update_hito_avance(self, hito_id: int, nuevo_avance_porcentaje: int, uow: Optional[UnitOfWork] = None) -> bool:
         """Update progress for a hito"""
         # Determine status based on progress
-        if nuevo_avance_porcentaje == 0:
-            estado = "Por comenzar"
-        elif nuevo_avance_porcentaje < 100:
-            estado = "En progreso"
-        else:
-            estado = "Completado"
-        
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        estado = _estado_from_avance(nuevo_avance_porcentaje)
         
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"""
-            UPDATE hitos 
-            SET avance_porcentaje = {placeholder}, estado = {placeholder}, updated_at = CURRENT_TIMESTAMP
-            WHERE id = {placeholder}
-        """, (nuevo_avance_porcentaje, estado, hito_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
         
-        return success
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                UPDATE hitos 
+                SET avance_porcentaje = {placeholder}, estado = {placeholder}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = {placeholder}
+            """, (nuevo_avance_porcentaje, estado, hito_id))
+            return cursor.rowcount > 0
     
-    def delete_hito(self, hito_id: int) -> bool:
+    @_writes('hitos', 'actividades')
+    def delete_hito(self, hito_id: int, uow: Optional[UnitOfWork] = None) -> bool:
         """Delete a hito"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"DELETE FROM hitos WHERE id = {placeholder}", (hito_id,))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
         
-        return success
-    
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DELETE FROM hitos WHERE id = {placeholder}", (hito_id,))
+            return cursor.rowcount > 0
     
-    def update_indicador_from_hitos(self, indicador_id: int) -> bool:
+    @_writes('indicadores')
+    def update_indicador_from_hitos(self, indicador_id: int, uow: Optional[UnitOfWork] = None) -> bool:
         """
         Update indicator progress based on average of its hitos
         For qualitative indicators (with hitos)
         Uses the LATEST monthly report for each hito
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
-        # Get average progress from hitos using latest monthly reports
-        cursor.execute(f"""
-            SELECT h.id, COALESCE(
-                (SELECT avance_reportado 
-                 FROM avance_mensual 
-                 WHERE entidad = 'hito' AND id_entidad = h.id 
-                 ORDER BY mes DESC LIMIT 1), 
-                h.avance_porcentaje
-            ) as ultimo_avance
-            FROM hitos h
-            WHERE h.indicador_id = {placeholder}
-        """, (indicador_id,))
-        
-        hitos = cursor.fetchall()
-        
-        if not hitos or len(hitos) == 0:
-            avg_avance = 0
-        else:
-            # Calculate average from latest monthly reports
-            total_avance = sum(row[1] if row[1] is not None else 0 for row in hitos)
-            avg_avance = int(total_avance / len(hitos))
-        
-        # Determine status
-        if avg_avance == 0:
-            estado = "Por comenzar"
-        elif avg_avance < 100:
-            estado = "En progreso"
-        else:
-            estado = "Completado"
-        
-        # Update indicator
-        cursor.execute(f"""
-            UPDATE indicadores
-            SET avance_porcentaje = {placeholder}, estado = {placeholder}, updated_at = CURRENT_TIMESTAMP
-            WHERE id = {placeholder}
-        """, (avg_avance, estado, indicador_id))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
-        
-        return success
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            
+            # Get average progress from hitos using latest monthly reports
+            cursor.execute(f"""
+                SELECT COUNT(*) as total_hitos,
+                       SUM(COALESCE(h.ultimo_avance, h.avance_porcentaje, 0)) as total_avance
+                FROM hitos h
+                WHERE h.indicador_id = {placeholder}
+            """, (indicador_id,))
+            
+            row = cursor.fetchone()
+            
+            if not row['total_hitos']:
+                avg_avance = 0
+            else:
+                # Calculate average from latest monthly reports
+                avg_avance = int(row['total_avance'] / row['total_hitos'])
+            
+            # Determine status
+            estado = _estado_from_avance(avg_avance)
+            
+            # Update indicator
+            cursor.execute(f"""
+                UPDATE indicadores
+                SET avance_porcentaje = {placeholder}, estado = {placeholder}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = {placeholder}
+            """, (avg_avance, estado, indicador_id))
+            
+            return cursor.rowcount > 0
     
     # ==================== ACTIVIDADES METHODS ====================
     
+    @_writes('actividades')
     def create_actividad(
         self,
         hito_id: int,
@@ -706,65 +1785,58 @@ class Database:
         fecha_fin_plan: str = None,
         responsable: str = None,
         fecha_real: str = None,
-        estado_actividad: str = "Por comenzar"
+        estado_actividad: str = "Por comenzar",
+        uow: Optional[UnitOfWork] = None
     ) -> int:
         """Create a new actividad for a hito (Admin only)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"""
-            INSERT INTO actividades 
-            (hito_id, descripcion_actividad, fecha_inicio_plan, fecha_fin_plan,
-             responsable, fecha_real, estado_actividad)
-            VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder},
-                    {placeholder}, {placeholder}, {placeholder})
-        """, (hito_id, descripcion_actividad, fecha_inicio_plan, fecha_fin_plan,
-              responsable, fecha_real, estado_actividad))
-        
-        actividad_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return actividad_id
-    
-    def get_actividades_by_hito(self, hito_id: int) -> pd.DataFrame:
-        """Get all actividades for a specific hito"""
-        conn = self.get_connection()
         
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            return self._insert(cursor, f"""
+                INSERT INTO actividades 
+                (hito_id, descripcion_actividad, fecha_inicio_plan, fecha_fin_plan,
+                 responsable, fecha_real, estado_actividad)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder},
+                        {placeholder}, {placeholder}, {placeholder})
+            """, (hito_id, descripcion_actividad, fecha_inicio_plan, fecha_fin_plan,
+                  responsable, fecha_real, estado_actividad))
+    
+    @_cached
+    def get_actividades_by_hito(self, hito_id: int, as_records: bool = False,
+                                uow: Optional[UnitOfWork] = None) -> Union[pd.DataFrame, List[Dict]]:
+        """
+        Get all actividades for a specific hito
+        
+        Args:
+            hito_id: Hito ID
+            as_records: Return a list of dicts (NULL columns stay None instead
+                        of becoming NaN) instead of a DataFrame
+            uow: Optional unit of work to run in
+        """
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         query = f"""
             SELECT a.*, 
-                   COALESCE(
-                       (SELECT avance_reportado 
-                        FROM avance_mensual 
-                        WHERE entidad = 'actividad' AND id_entidad = a.id 
-                        ORDER BY mes DESC LIMIT 1), 
-                       0
-                   ) as ultimo_avance_reportado
+                   COALESCE(a.ultimo_avance, 0) as ultimo_avance_reportado
             FROM actividades a
             WHERE a.hito_id = {placeholder} 
             ORDER BY a.id
         """
         
-        df = pd.read_sql_query(query, conn, params=[hito_id])
-        conn.close()
-        
-        return df
+        with self._connection(uow) as conn:
+            if as_records:
+                return self._read_records(query, conn, params=[hito_id])[1]
+            return self._read_sql(query, conn, params=[hito_id])
     
-    def delete_actividad(self, actividad_id: int) -> bool:
+    @_writes('actividades')
+    def delete_actividad(self, actividad_id: int, uow: Optional[UnitOfWork] = None) -> bool:
         """Delete an actividad"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"DELETE FROM actividades WHERE id = {placeholder}", (actividad_id,))
-        
-        success = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
         
-        return success
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"DELETE FROM actividades WHERE id = {placeholder}", (actividad_id,))
+            return cursor.rowcount > 0
     
     # ==================== AVANCE MENSUAL METHODS ====================
     
@@ -774,110 +1846,363 @@ class Database:
         id_entidad: int,
         avance_reportado: int,
         usuario: str = None,
-        mes: str = None  # Optional, defaults to current month
+        mes: str = None,  # Optional, defaults to current month
+        on_conflict: str = 'reject',
+        uow: Optional[UnitOfWork] = None
     ) -> bool:
         """
         Register monthly progress report (Owner only)
         
+        Shortcut for upsert_avance_mensual returning only whether it was written.
+        
+        Returns:
+            True if successful, False if the month was already reported and kept
+        """
+        return self.upsert_avance_mensual(
+            entidad, id_entidad, avance_reportado,
+            usuario=usuario, mes=mes, on_conflict=on_conflict, uow=uow
+        ).written
+    
+    @_writes('avance_mensual', 'hitos', 'actividades')
+    def upsert_avance_mensual(
+        self,
+        entidad: str,  # 'hito' or 'actividad'
+        id_entidad: int,
+        avance_reportado: int,
+        usuario: str = None,
+        mes: str = None,  # Optional, defaults to current month
+        on_conflict: str = 'reject',
+        fecha_reporte: Optional[str] = None,
+        uow: Optional[UnitOfWork] = None
+    ) -> AvanceMensualResult:
+        """
+        Register a monthly progress report with INSERT ... ON CONFLICT
+        
+        A month that was already reported never makes the statement fail, so
+        the transaction stays usable and no exception has to be parsed. The
+        report and the estado update are written in a single transaction.
+        
         Args:
             entidad: 'hito' or 'actividad'
             id_entidad: ID of the hito or actividad
             avance_reportado: Progress percentage (0-100)
             usuario: User reporting (responsable)
             mes: Month in YYYY-MM format (defaults to current month)
+            on_conflict: What to do if the month was already reported:
+                'reject' keeps the existing report, 'overwrite' replaces it
+                (admin correction), 'keep_latest' replaces it unless it was
+                reported on a later date than fecha_reporte
+            fecha_reporte: Date of the report, YYYY-MM-DD (defaults to today)
+            uow: Optional unit of work to run in
         
         Returns:
-            True if successful, False if already reported for this month
+            AvanceMensualResult with status 'inserted', 'updated' or 'skipped'
         """
-        from datetime import datetime
-        
         if entidad not in ['hito', 'actividad']:
             raise ValueError("entidad must be 'hito' or 'actividad'")
         
         if not (0 <= avance_reportado <= 100):
             raise ValueError("avance_reportado must be between 0 and 100")
         
+        if on_conflict not in AVANCE_CONFLICT_MODES:
+            raise ValueError(f"on_conflict must be one of {', '.join(AVANCE_CONFLICT_MODES)}")
+        
         # Default to current month if not specified
         if mes is None:
             mes = datetime.now().strftime('%Y-%m')
         
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        key = (entidad, id_entidad, mes)
+        existing_query = f"""
+            SELECT avance_reportado FROM avance_mensual
+            WHERE entidad = {placeholder} AND id_entidad = {placeholder} AND mes = {placeholder}
+        """
         
-        try:
-            placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        if on_conflict == 'reject':
+            action = "DO NOTHING"
+        else:
+            action = """DO UPDATE SET avance_reportado = excluded.avance_reportado,
+                                      usuario = excluded.usuario,
+                                      fecha_reporte = excluded.fecha_reporte"""
+            if on_conflict == 'keep_latest':
+                action += " WHERE avance_mensual.fecha_reporte <= excluded.fecha_reporte"
+        
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            
+            anterior = None
+            if on_conflict != 'reject':
+                # Tells an update from an insert (and locks the row on PostgreSQL)
+                lock = " FOR UPDATE" if self.db_type == 'postgresql' else ""
+                cursor.execute(existing_query + lock, key)
+                row = cursor.fetchone()
+                anterior = row['avance_reportado'] if row else None
             
-            # Try to insert (will fail if already exists for this month)
             cursor.execute(f"""
-                INSERT INTO avance_mensual 
-                (entidad, id_entidad, mes, avance_reportado, usuario)
-                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
-            """, (entidad, id_entidad, mes, avance_reportado, usuario))
+                INSERT INTO avance_mensual
+                (entidad, id_entidad, mes, avance_reportado, usuario, fecha_reporte)
+                VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder},
+                        COALESCE({placeholder}, CURRENT_DATE))
+                ON CONFLICT (entidad, id_entidad, mes) {action}
+            """, (entidad, id_entidad, mes, avance_reportado, usuario, fecha_reporte))
             
-            conn.commit()
+            if cursor.rowcount == 0:
+                if on_conflict == 'reject':
+                    cursor.execute(existing_query, key)
+                    anterior = cursor.fetchone()['avance_reportado']
+                return AvanceMensualResult('skipped', entidad, id_entidad, mes, anterior, anterior)
+            
+            status = 'updated' if anterior is not None else 'inserted'
             
             # Update estado based on avance
-            if avance_reportado == 0:
-                estado = "Por comenzar"
-            elif avance_reportado < 100:
-                estado = "En progreso"
-            else:
-                estado = "Completado"
+            estado = _estado_from_avance(avance_reportado)
             
-            # Update the entity's estado
-            if entidad == 'hito':
-                cursor.execute(f"""
-                    UPDATE hitos 
-                    SET estado = {placeholder}, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = {placeholder}
-                """, (estado, id_entidad))
-            else:  # actividad
+            # Update the entity's estado and its latest report (unless a
+            # later month was already reported)
+            table, estado_column = ('hitos', 'estado') if entidad == 'hito' else ('actividades', 'estado_actividad')
+            cursor.execute(f"""
+                UPDATE {table} 
+                SET {estado_column} = {placeholder},
+                    ultimo_avance = CASE WHEN ultimo_avance_mes IS NULL OR ultimo_avance_mes <= {placeholder}
+                                         THEN {placeholder} ELSE ultimo_avance END,
+                    ultimo_avance_mes = CASE WHEN ultimo_avance_mes IS NULL OR ultimo_avance_mes <= {placeholder}
+                                             THEN {placeholder} ELSE ultimo_avance_mes END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = {placeholder}
+            """, (estado, mes, avance_reportado, mes, mes, id_entidad))
+        
+        return AvanceMensualResult(status, entidad, id_entidad, mes, avance_reportado, anterior)
+    
+    @_writes('avance_mensual', 'hitos', 'actividades')
+    def registrar_avances_mensuales_bulk(
+        self,
+        reportes: List[Dict],
+        usuario: str = None,
+        mes: str = None,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        Register many monthly progress reports in one transaction (Owner only)
+        
+        Set-based equivalent of calling registrar_avance_mensual per item and
+        update_indicador_from_hitos per indicator: one lookup of already
+        reported items, multi-row INSERTs, one estado/ultimo_avance UPDATE per
+        entity type and one set-based recompute of the affected indicators.
+        
+        Args:
+            reportes: List of dicts with 'entidad', 'id_entidad' and 'avance_reportado'
+            usuario: User reporting (responsable)
+            mes: Month in YYYY-MM format (defaults to current month)
+            uow: Optional unit of work to run in
+        
+        Returns:
+            Dictionary with 'mes', 'registrados' and 'duplicados' (lists of
+            {'entidad', 'id_entidad'}) and 'indicadores_actualizados' (IDs)
+        """
+        if mes is None:
+            mes = datetime.now().strftime('%Y-%m')
+        
+        # Validate everything before touching the database
+        items = []
+        for reporte in reportes:
+            entidad = reporte['entidad']
+            avance = reporte['avance_reportado']
+            if entidad not in ['hito', 'actividad']:
+                raise ValueError("entidad must be 'hito' or 'actividad'")
+            if not (0 <= avance <= 100):
+                raise ValueError("avance_reportado must be between 0 and 100")
+            items.append((entidad, int(reporte['id_entidad']), int(avance)))
+        
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        cursor = uow.connection.cursor()
+        
+        # Items already reported this month (one query per entity type)
+        existing = set()
+        for entidad in ('hito', 'actividad'):
+            ids = sorted({id_entidad for e, id_entidad, _ in items if e == entidad})
+            for chunk in self._chunks(ids):
                 cursor.execute(f"""
-                    UPDATE actividades 
-                    SET estado_actividad = {placeholder}, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = {placeholder}
-                """, (estado, id_entidad))
+                    SELECT id_entidad FROM avance_mensual
+                    WHERE entidad = {placeholder} AND mes = {placeholder}
+                    AND id_entidad IN ({', '.join([placeholder] * len(chunk))})
+                """, [entidad, mes] + chunk)
+                existing.update((entidad, row['id_entidad']) for row in cursor.fetchall())
+        
+        duplicados, candidatos = [], []
+        for entidad, id_entidad, avance in items:
+            if (entidad, id_entidad) in existing:
+                duplicados.append({'entidad': entidad, 'id_entidad': id_entidad})
+            else:
+                existing.add((entidad, id_entidad))  # repeated item within the batch
+                candidatos.append((entidad, id_entidad, avance))
+        
+        # Multi-row INSERT; ON CONFLICT guards against a concurrent submission,
+        # so the rows it actually inserted are read back
+        inserted = set()
+        row_sql = f"({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})"
+        for chunk in self._chunks(candidatos):
+            params = []
+            for entidad, id_entidad, avance in chunk:
+                params.extend([entidad, id_entidad, mes, avance, usuario])
+            query = f"""
+                INSERT INTO avance_mensual (entidad, id_entidad, mes, avance_reportado, usuario)
+                VALUES {', '.join([row_sql] * len(chunk))}
+                ON CONFLICT (entidad, id_entidad, mes) DO NOTHING
+            """
+            if self.db_type == 'postgresql' or SQLITE_RETURNING:
+                cursor.execute(query + " RETURNING entidad, id_entidad", params)
+                inserted.update((row['entidad'], row['id_entidad']) for row in cursor.fetchall())
+                continue
             
-            conn.commit()
-            conn.close()
-            return True
+            # Older SQLite: compare the rowcount and, if rows were dropped,
+            # re-select the ones allocated after the previous AUTOINCREMENT
+            # value (nothing else inserts while the writer lock is held)
+            cursor.execute("SELECT COALESCE(MAX(seq), 0) as seq FROM sqlite_sequence WHERE name = 'avance_mensual'")
+            last_id = cursor.fetchone()['seq']
+            cursor.execute(query, params)
+            if cursor.rowcount == len(chunk):
+                inserted.update((entidad, id_entidad) for entidad, id_entidad, _ in chunk)
+            elif cursor.rowcount > 0:
+                cursor.execute(f"SELECT entidad, id_entidad FROM avance_mensual WHERE id > {placeholder}", [last_id])
+                inserted.update((row['entidad'], row['id_entidad']) for row in cursor.fetchall())
+        
+        registrados, nuevos = [], []
+        for entidad, id_entidad, avance in candidatos:
+            if (entidad, id_entidad) in inserted:
+                registrados.append({'entidad': entidad, 'id_entidad': id_entidad})
+                nuevos.append((entidad, id_entidad, avance))
+            else:
+                duplicados.append({'entidad': entidad, 'id_entidad': id_entidad})
+        
+        # One estado/ultimo_avance UPDATE per entity type
+        for entidad, table, estado_column in (('hito', 'hitos', 'estado'),
+                                              ('actividad', 'actividades', 'estado_actividad')):
+            rows = [(id_entidad, avance) for e, id_entidad, avance in nuevos if e == entidad]
+            for chunk in self._chunks(rows):
+                when = " ".join([f"WHEN {placeholder} THEN {placeholder}"] * len(chunk))
+                estado_params, avance_params = [], []
+                for id_entidad, avance in chunk:
+                    estado_params.extend([id_entidad, _estado_from_avance(avance)])
+                    avance_params.extend([id_entidad, avance])
+                ids = [id_entidad for id_entidad, _ in chunk]
+                cursor.execute(f"""
+                    UPDATE {table}
+                    SET {estado_column} = CASE id {when} END,
+                        ultimo_avance = CASE WHEN ultimo_avance_mes IS NULL OR ultimo_avance_mes <= {placeholder}
+                                             THEN CASE id {when} END ELSE ultimo_avance END,
+                        ultimo_avance_mes = CASE WHEN ultimo_avance_mes IS NULL OR ultimo_avance_mes <= {placeholder}
+                                                 THEN {placeholder} ELSE ultimo_avance_mes END,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN ({', '.join([placeholder] * len(ids))})
+                """, estado_params + [mes] + avance_params + [mes, mes] + ids)
+        
+        # Recompute each affected indicator once
+        indicadores = set()
+        hito_ids = [id_entidad for e, id_entidad, _ in nuevos if e == 'hito']
+        for chunk in self._chunks(hito_ids):
+            cursor.execute(f"""
+                SELECT DISTINCT indicador_id FROM hitos
+                WHERE id IN ({', '.join([placeholder] * len(chunk))})
+            """, chunk)
+            indicadores.update(row['indicador_id'] for row in cursor.fetchall())
+        
+        if indicadores:
+            self._recompute_indicadores(cursor, sorted(indicadores))
+            uow.touch(('indicadores',))
+        
+        return {
+            'mes': mes,
+            'registrados': registrados,
+            'duplicados': duplicados,
+            'indicadores_actualizados': sorted(indicadores)
+        }
+    
+    def _recompute_indicadores(self, cursor, indicador_ids: List[int]):
+        """Set-based update_indicador_from_hitos: one aggregate and one UPDATE per chunk of indicators"""
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        for chunk in self._chunks(indicador_ids):
+            in_list = ', '.join([placeholder] * len(chunk))
+            cursor.execute(f"""
+                SELECT indicador_id, COUNT(*) as total_hitos,
+                       SUM(COALESCE(ultimo_avance, avance_porcentaje, 0)) as total_avance
+                FROM hitos
+                WHERE indicador_id IN ({in_list})
+                GROUP BY indicador_id
+            """, chunk)
+            totals = {row['indicador_id']: (row['total_hitos'], row['total_avance']) for row in cursor.fetchall()}
             
-        except Exception as e:
-            conn.rollback()
-            conn.close()
-            # Check if it's a duplicate entry error
-            if "UNIQUE constraint failed" in str(e) or "duplicate key" in str(e):
-                return False
-            raise
+            when = " ".join([f"WHEN {placeholder} THEN {placeholder}"] * len(chunk))
+            avance_params, estado_params = [], []
+            for indicador_id in chunk:
+                total_hitos, total_avance = totals.get(indicador_id, (0, 0))
+                avg_avance = int(total_avance / total_hitos) if total_hitos else 0
+                avance_params.extend([indicador_id, avg_avance])
+                estado_params.extend([indicador_id, _estado_from_avance(avg_avance)])
+            cursor.execute(f"""
+                UPDATE indicadores
+                SET avance_porcentaje = CASE id {when} END,
+                    estado = CASE id {when} END,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id IN ({in_list})
+            """, avance_params + estado_params + chunk)
     
-    def get_avance_mensual_actual(self, entidad: str, id_entidad: int) -> Optional[Dict]:
-        """Get the latest monthly progress report for an entity"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    @staticmethod
+    def _chunks(values: List, size: int = 100):
+        """Split a list for IN lists / multi-row VALUES (SQLite bound-parameter limit)"""
+        values = list(values)
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+    
+    @_writes('hitos', 'actividades')
+    def rebuild_ultimo_avance(self, uow: Optional[UnitOfWork] = None) -> Dict[str, int]:
+        """
+        Recompute ultimo_avance / ultimo_avance_mes of every hito and actividad from avance_mensual
         
-        placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"""
-            SELECT * FROM avance_mensual
-            WHERE entidad = {placeholder} AND id_entidad = {placeholder}
-            ORDER BY mes DESC
-            LIMIT 1
-        """, (entidad, id_entidad))
+        Args:
+            uow: Optional unit of work to run in
         
-        row = cursor.fetchone()
-        conn.close()
+        Returns:
+            Dictionary with the number of hitos and actividades rewritten
+        """
+        counts = {}
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            for table, entidad in (('hitos', 'hito'), ('actividades', 'actividad')):
+                cursor.execute(f"""
+                    UPDATE {table}
+                    SET ultimo_avance = (
+                            SELECT am.avance_reportado FROM avance_mensual am
+                            WHERE am.entidad = '{entidad}' AND am.id_entidad = {table}.id
+                            ORDER BY am.mes DESC LIMIT 1
+                        ),
+                        ultimo_avance_mes = (
+                            SELECT MAX(am.mes) FROM avance_mensual am
+                            WHERE am.entidad = '{entidad}' AND am.id_entidad = {table}.id
+                        )
+                """)
+                counts[table] = cursor.rowcount
+        return counts
+    
+    @_cached
+    def get_avance_mensual_actual(self, entidad: str, id_entidad: int, uow: Optional[UnitOfWork] = None) -> Optional[Dict]:
+        """Get the latest monthly progress report for an entity"""
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
-        if row:
-            if self.db_type == 'postgresql':
-                columns = [desc[0] for desc in cursor.description]
-                return dict(zip(columns, row))
-            else:
-                return dict(row)
-        return None
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT * FROM avance_mensual
+                WHERE entidad = {placeholder} AND id_entidad = {placeholder}
+                ORDER BY mes DESC
+                LIMIT 1
+            """, (entidad, id_entidad))
+            row = cursor.fetchone()
+        
+        return dict(row) if row else None
     
-    def get_historico_avance(self, entidad: str, id_entidad: int) -> pd.DataFrame:
+    @_cached
+    def get_historico_avance(self, entidad: str, id_entidad: int, uow: Optional[UnitOfWork] = None) -> pd.DataFrame:
         """Get complete historical progress for an entity"""
-        conn = self.get_connection(use_dict_cursor=False)
-        
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         query = f"""
             SELECT * FROM avance_mensual
@@ -885,28 +2210,98 @@ class Database:
             ORDER BY mes ASC
         """
         
-        df = pd.read_sql_query(query, conn, params=[entidad, id_entidad])
-        conn.close()
+        with self._connection(uow) as conn:
+            return self._read_sql(query, conn, params=[entidad, id_entidad])
+    
+    @_cached
+    def get_historico_avance_page(
+        self,
+        entidad: str,
+        id_entidad: int,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        Keyset-paginated version of get_historico_avance (ordered by mes)
+        
+        Returns:
+            Dict with 'items' (DataFrame), 'next_cursor' and 'total'
+        """
+        placeholder = "%s" if self.db_type == 'postgresql' else "?"
+        return self._keyset_page(
+            "avance_mensual", f"entidad = {placeholder} AND id_entidad = {placeholder}",
+            [entidad, id_entidad], ("mes",), 'mes',
+            limit=limit, cursor=cursor, with_total=with_total, as_records=as_records, uow=uow
+        )
+    
+    @_cached
+    def get_all_avances_mensuales(
+        self,
+        entidad: Optional[str] = None,
+        id_entidad: Optional[int] = None,
+        mes_desde: Optional[str] = None,
+        mes_hasta: Optional[str] = None,
+        limit: Optional[int] = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        Monthly reports of every entity, ordered by entidad, id_entidad and mes
+        
+        Args:
+            entidad: 'hito' or 'actividad'
+            id_entidad: ID of the hito or actividad
+            mes_desde / mes_hasta: Inclusive range of months (YYYY-MM)
+            limit: Page size (None returns every row)
+            cursor: next_cursor of the previous page
+            with_total: Also count every matching row
+            as_records: Return items as a list of dicts instead of a DataFrame
+            uow: Optional unit of work to run in
         
-        return df
+        Returns:
+            Dict with 'items', 'next_cursor' and 'total'
+        """
+        where, params = self._avance_mensual_where(
+            entidad=entidad, id_entidad=id_entidad, mes_desde=mes_desde, mes_hasta=mes_hasta
+        )
+        return self._keyset_page(
+            "avance_mensual", where, params, ("entidad", "id_entidad", "mes"), 'entidad_mes',
+            limit=limit, cursor=cursor, with_total=with_total, as_records=as_records, uow=uow
+        )
     
-    def get_avances_pendientes_mes(self, responsable: str, mes: str = None) -> Dict:
+    def _avance_mensual_where(
+        self,
+        entidad: Optional[str] = None,
+        id_entidad: Optional[int] = None,
+        mes_desde: Optional[str] = None,
+        mes_hasta: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """WHERE clause of the avance_mensual listing"""
+        return self._where(
+            {'entidad': entidad, 'id_entidad': id_entidad},
+            [('mes', '>=', mes_desde), ('mes', '<=', mes_hasta)]
+        )
+    
+    def get_avances_pendientes_mes(self, responsable: str, mes: str = None, uow: Optional[UnitOfWork] = None) -> Dict:
         """
         Get list of hitos and actividades that haven't been reported for the month
         
         Args:
             responsable: Name of the responsible person
             mes: Month in YYYY-MM format (defaults to current month)
+            uow: Optional unit of work to run in
         
         Returns:
             Dictionary with 'hitos' and 'actividades' DataFrames
         """
-        from datetime import datetime
-        
         if mes is None:
             mes = datetime.now().strftime('%Y-%m')
         
-        conn = self.get_connection(use_dict_cursor=False)
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
         # Get hitos without report for this month
@@ -924,8 +2319,6 @@ class Database:
         # Note: We need to check if hitos table has responsable field
         # For now, we'll get all hitos and filter in the app layer
         
-        df_hitos = pd.read_sql_query(query_hitos, conn, params=[mes])
-        
         # Get actividades without report for this month
         query_actividades = f"""
             SELECT a.*, h.nombre as nombre_hito, i.indicador as nombre_indicador
@@ -939,71 +2332,187 @@ class Database:
             )
         """
         
-        df_actividades = pd.read_sql_query(query_actividades, conn, params=[responsable, mes])
-        
-        conn.close()
+        with self._connection(uow) as conn:
+            df_hitos = self._read_sql(query_hitos, conn, params=[mes])
+            df_actividades = self._read_sql(query_actividades, conn, params=[responsable, mes])
         
         return {
             'hitos': df_hitos,
             'actividades': df_actividades
         }
     
-    def get_indicador_id_by_hito(self, hito_id: int) -> Optional[int]:
+    @_cached
+    def get_indicador_id_by_hito(self, hito_id: int, uow: Optional[UnitOfWork] = None) -> Optional[int]:
         """Get the indicator ID for a specific hito"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
-        cursor.execute(f"SELECT indicador_id FROM hitos WHERE id = {placeholder}", (hito_id,))
-        row = cursor.fetchone()
-        conn.close()
         
-        if row:
-            try:
-                return row['indicador_id']
-            except (TypeError, IndexError, KeyError):
-                return row[0]
-        return None
+        with self._connection(uow) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT indicador_id FROM hitos WHERE id = {placeholder}", (hito_id,))
+            row = cursor.fetchone()
+        
+        return row['indicador_id'] if row else None
 
-    def get_hitos_by_responsable(self, responsable: str) -> pd.DataFrame:
-        """Get all hitos assigned to a specific responsable"""
-        conn = self.get_connection(use_dict_cursor=False)
+    @_cached
+    def get_all_hitos(
+        self,
+        indicador_id: Union[int, List[int], None] = None,
+        estado: Union[str, List[str], None] = None,
+        responsable: Union[str, List[str], None] = None,
+        fecha_fin_desde: Optional[str] = None,
+        fecha_fin_hasta: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        List hitos across indicators with their latest monthly progress
+        
+        Args:
+            indicador_id: Filter by indicator(s)
+            estado: Filter by status(es)
+            responsable: Filter by responsable(s)
+            fecha_fin_desde / fecha_fin_hasta: Inclusive range on fecha_fin_planificada
+            limit: Page size (None returns every row)
+            cursor: next_cursor of the previous page
+            with_total: Also count every matching row
+            as_records: Return items as a list of dicts instead of a DataFrame
+            uow: Optional unit of work to run in
+        
+        Returns:
+            Dict with 'items' (DataFrame ordered by id), 'next_cursor' and 'total'
+        """
+        where, params = self._hitos_where(
+            indicador_id=indicador_id, estado=estado, responsable=responsable,
+            fecha_fin_desde=fecha_fin_desde, fecha_fin_hasta=fecha_fin_hasta
+        )
+        return self._keyset_page(
+            HITOS_LISTING_FROM, where, params, ("h.id",), 'id',
+            limit=limit, cursor=cursor, with_total=with_total, select=HITOS_LISTING_SELECT,
+            as_records=as_records, uow=uow
+        )
+    
+    def _hitos_where(
+        self,
+        indicador_id=None,
+        estado=None,
+        responsable=None,
+        fecha_fin_desde: Optional[str] = None,
+        fecha_fin_hasta: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """WHERE clause of the hitos listing (see get_all_hitos for the filters)"""
+        return self._where(
+            {'h.indicador_id': indicador_id, 'h.estado': estado, 'h.responsable': responsable},
+            [('h.fecha_fin_planificada', '>=', fecha_fin_desde),
+             ('h.fecha_fin_planificada', '<=', fecha_fin_hasta)]
+        )
+    
+    @_cached
+    def get_all_actividades(
+        self,
+        hito_id: Union[int, List[int], None] = None,
+        indicador_id: Union[int, List[int], None] = None,
+        estado: Union[str, List[str], None] = None,
+        responsable: Union[str, List[str], None] = None,
+        fecha_fin_desde: Optional[str] = None,
+        fecha_fin_hasta: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        as_records: bool = False,
+        uow: Optional[UnitOfWork] = None
+    ) -> Dict:
+        """
+        List actividades across hitos with their latest monthly progress
+        
+        Args:
+            hito_id: Filter by hito(s)
+            indicador_id: Filter by indicator(s) of the parent hito
+            estado: Filter by estado_actividad
+            responsable: Filter by responsable(s)
+            fecha_fin_desde / fecha_fin_hasta: Inclusive range on fecha_fin_plan
+            limit: Page size (None returns every row)
+            cursor: next_cursor of the previous page
+            with_total: Also count every matching row
+            as_records: Return items as a list of dicts instead of a DataFrame
+            uow: Optional unit of work to run in
+        
+        Returns:
+            Dict with 'items' (DataFrame ordered by id), 'next_cursor' and 'total'
+        """
+        where, params = self._actividades_where(
+            hito_id=hito_id, indicador_id=indicador_id, estado=estado, responsable=responsable,
+            fecha_fin_desde=fecha_fin_desde, fecha_fin_hasta=fecha_fin_hasta
+        )
+        return self._keyset_page(
+            ACTIVIDADES_LISTING_FROM, where, params, ("a.id",), 'id',
+            limit=limit, cursor=cursor, with_total=with_total, select=ACTIVIDADES_LISTING_SELECT,
+            as_records=as_records, uow=uow
+        )
+    
+    def _actividades_where(
+        self,
+        hito_id=None,
+        indicador_id=None,
+        estado=None,
+        responsable=None,
+        fecha_fin_desde: Optional[str] = None,
+        fecha_fin_hasta: Optional[str] = None
+    ) -> Tuple[str, List]:
+        """WHERE clause of the actividades listing (see get_all_actividades for the filters)"""
+        return self._where(
+            {'a.hito_id': hito_id, 'h.indicador_id': indicador_id,
+             'a.estado_actividad': estado, 'a.responsable': responsable},
+            [('a.fecha_fin_plan', '>=', fecha_fin_desde),
+             ('a.fecha_fin_plan', '<=', fecha_fin_hasta)]
+        )
+    
+    @_cached
+    def get_hitos_by_responsable(self, responsable: str, as_records: bool = False,
+                               uow: Optional[UnitOfWork] = None) -> Union[pd.DataFrame, List[Dict]]:
+        """
+        Get all hitos assigned to a specific responsable
         
+        Args:
+            responsable: Responsable name
+            as_records: Return a list of dicts (unreported values stay None
+                        instead of becoming NaN) instead of a DataFrame
+            uow: Optional unit of work to run in
+        """
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         
         query = f"""
             SELECT h.*, i.indicador as nombre_indicador,
-                   COALESCE(
-                       (SELECT avance_reportado 
-                        FROM avance_mensual 
-                        WHERE entidad = 'hito' AND id_entidad = h.id 
-                        ORDER BY mes DESC LIMIT 1), 
-                       0
-                   ) as ultimo_avance_reportado
+                   COALESCE(h.ultimo_avance, 0) as ultimo_avance_reportado
             FROM hitos h
             JOIN indicadores i ON h.indicador_id = i.id
             WHERE h.responsable = {placeholder}
             ORDER BY h.id
         """
         
-        df = pd.read_sql_query(query, conn, params=[responsable])
-        conn.close()
-        
-        return df
+        with self._connection(uow) as conn:
+            if as_records:
+                return self._read_records(query, conn, params=[responsable])[1]
+            return self._read_sql(query, conn, params=[responsable])
     
-    def get_actividades_by_responsable(self, responsable: str) -> pd.DataFrame:
-        """Get all actividades assigned to a specific responsable"""
-        conn = self.get_connection(use_dict_cursor=False)
+    @_cached
+    def get_actividades_by_responsable(self, responsable: str, as_records: bool = False,
+                               uow: Optional[UnitOfWork] = None) -> Union[pd.DataFrame, List[Dict]]:
+        """
+        Get all actividades assigned to a specific responsable
         
+        Args:
+            responsable: Responsable name
+            as_records: Return a list of dicts (unreported values stay None
+                        instead of becoming NaN) instead of a DataFrame
+            uow: Optional unit of work to run in
+        """
         placeholder = "%s" if self.db_type == 'postgresql' else "?"
         query = f"""
             SELECT a.*, h.nombre as nombre_hito, i.indicador as nombre_indicador,
-                   COALESCE(
-                       (SELECT avance_reportado 
-                        FROM avance_mensual 
-                        WHERE entidad = 'actividad' AND id_entidad = a.id 
-                        ORDER BY mes DESC LIMIT 1), 
-                       0
-                   ) as ultimo_avance_reportado
+                   COALESCE(a.ultimo_avance, 0) as ultimo_avance_reportado
             FROM actividades a
             JOIN hitos h ON a.hito_id = h.id
             JOIN indicadores i ON h.indicador_id = i.id
@@ -1011,8 +2520,184 @@ class Database:
             ORDER BY a.id
         """
         
-        df = pd.read_sql_query(query, conn, params=[responsable])
-        conn.close()
+        with self._connection(uow) as conn:
+            if as_records:
+                return self._read_records(query, conn, params=[responsable])[1]
+            return self._read_sql(query, conn, params=[responsable])
+    
+    # ==================== STREAMING ====================
+    
+    def _stream_batches(self, query: str, params: List, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Tuple[List[str], List]]:
+        """
+        Yield (columns, rows) batches of a query without materializing the result
         
-        return df
-
+        PostgreSQL reads through a named (server-side) cursor, SQLite steps
+        the statement with fetchmany, so only batch_size rows are held in
+        memory at a time. Rows are tuples. The generator owns its pooled
+        connection and gives it back when exhausted or closed.
+        """
+        # Captured now: the rows are read after the calling method returned
+        return self._fetch_batches(query, params, batch_size, current_method())
+    
+    def _fetch_batches(self, query: str, params: List, batch_size: int, method: Optional[str]):
+        conn = self.get_connection(use_dict_cursor=False)
+        try:
+            if self.db_type == 'postgresql':
+                cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}")
+                cursor.itersize = batch_size
+            else:
+                cursor = conn.cursor()
+            if self.query_stats is not None:
+                cursor.method = method
+            cursor.execute(query, params)
+            
+            columns = None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if columns is None:
+                    # Named cursors only fill description after the first fetch
+                    columns = [col[0] for col in cursor.description]
+                yield columns, rows
+            cursor.close()
+        finally:
+            # Read-only: end the transaction that held the server-side cursor
+            conn.rollback()
+            conn.close()
+    
+    def _stream(self, query: str, params: List, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Dict]:
+        """Yield the rows of a query as dicts, batch_size rows at a time"""
+        return self._rows(self._stream_batches(query, params, batch_size))
+    
+    @staticmethod
+    def _rows(batches) -> Iterator[Dict]:
+        try:
+            for columns, rows in batches:
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            batches.close()
+    
+    def _listing_query(self, entity: str, **filters) -> Tuple[str, List]:
+        """
+        Full listing query (no pagination) of one of LISTING_ENTITIES
+        
+        Same filters, columns and order as the matching get_all_* method.
+        """
+        if entity == 'indicadores':
+            where, params = self._indicadores_where(**filters)
+            query = f"SELECT * FROM indicadores WHERE {where} ORDER BY created_at DESC, id DESC"
+        elif entity == 'hitos':
+            where, params = self._hitos_where(**filters)
+            query = f"SELECT {HITOS_LISTING_SELECT} FROM {HITOS_LISTING_FROM} WHERE {where} ORDER BY h.id"
+        elif entity == 'actividades':
+            where, params = self._actividades_where(**filters)
+            query = f"SELECT {ACTIVIDADES_LISTING_SELECT} FROM {ACTIVIDADES_LISTING_FROM} WHERE {where} ORDER BY a.id"
+        elif entity == 'avance_mensual':
+            where, params = self._avance_mensual_where(**filters)
+            query = f"SELECT * FROM avance_mensual WHERE {where} ORDER BY entidad, id_entidad, mes"
+        else:
+            raise ValueError(f"entity must be one of {', '.join(LISTING_ENTITIES)}")
+        return query, params
+    
+    def stream_indicadores(self, batch_size: int = STREAM_BATCH_SIZE, **filters) -> Iterator[Dict]:
+        """Stream indicadores (same filters and order as get_all_indicadores)"""
+        return self._stream(*self._listing_query('indicadores', **filters), batch_size)
+    
+    def stream_hitos(self, batch_size: int = STREAM_BATCH_SIZE, **filters) -> Iterator[Dict]:
+        """Stream hitos (same filters and order as get_all_hitos)"""
+        return self._stream(*self._listing_query('hitos', **filters), batch_size)
+    
+    def stream_actividades(self, batch_size: int = STREAM_BATCH_SIZE, **filters) -> Iterator[Dict]:
+        """Stream actividades (same filters and order as get_all_actividades)"""
+        return self._stream(*self._listing_query('actividades', **filters), batch_size)
+    
+    def stream_avance_mensual(self, batch_size: int = STREAM_BATCH_SIZE, **filters) -> Iterator[Dict]:
+        """Stream monthly reports (same filters and order as get_all_avances_mensuales)"""
+        return self._stream(*self._listing_query('avance_mensual', **filters), batch_size)
+    
+    # ==================== COLUMNAR EXPORT ====================
+    
+    def export_columns(self, entity: str, batch_size: int = STREAM_BATCH_SIZE, **filters) -> Dict[str, List]:
+        """
+        Export a full listing in columnar form
+        
+        Each cursor batch is transposed straight into per-column lists, so no
+        per-row dicts or DataFrame are built on the way.
+        
+        Args:
+            entity: One of LISTING_ENTITIES
+            batch_size: Rows fetched per round trip
+            **filters: Same filters as the matching get_all_* method
+        
+        Returns:
+            Dict mapping column name to the list of its values (row order kept)
+        """
+        query, params = self._listing_query(entity, **filters)
+        data = None
+        for columns, rows in self._stream_batches(query, params, batch_size):
+            if data is None:
+                data = {col: [] for col in columns}
+            for col, values in zip(columns, zip(*rows)):
+                data[col].extend(values)
+        
+        if data is None:
+            # No rows: still report the column names
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT * FROM ({query}) AS q LIMIT 0", params)
+                data = {col[0]: [] for col in cursor.description}
+        return data
+    
+    def export_arrow_table(self, entity: str, types: Optional[Dict[str, type]] = None,
+                           batch_size: int = STREAM_BATCH_SIZE, **filters):
+        """
+        Export a full listing as a pyarrow.Table
+        
+        Args:
+            entity: One of LISTING_ENTITIES
+            types: Optional column -> Python type (int, float, str, bool, date,
+                datetime). Listed columns get a fixed Arrow type, so the schema
+                does not depend on the data (SQLite stores dates as text and
+                booleans as 0/1); the rest are inferred
+            batch_size: Rows fetched per round trip
+            **filters: Same filters as the matching get_all_* method
+        
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not ARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow/Parquet export. Install with: pip install pyarrow")
+        
+        arrow_types = {
+            bool: pa.bool_(), int: pa.int64(), float: pa.float64(), str: pa.string(),
+            date: pa.date32(), datetime: pa.timestamp('us'),
+        }
+        types = types or {}
+        arrays = {}
+        for col, values in self.export_columns(entity, batch_size, **filters).items():
+            array = pa.array(values)
+            target = arrow_types.get(types.get(col))
+            if target is not None and array.type != target:
+                array = array.cast(target)
+            arrays[col] = array
+        return pa.table(arrays)
+    
+    def export_arrow(self, entity: str, types: Optional[Dict[str, type]] = None,
+                     batch_size: int = STREAM_BATCH_SIZE, **filters) -> bytes:
+        """Export a full listing as an Arrow IPC stream (record batches of batch_size rows)"""
+        table = self.export_arrow_table(entity, types, batch_size, **filters)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=batch_size):
+                writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+    
+    def export_parquet(self, entity: str, types: Optional[Dict[str, type]] = None,
+                       batch_size: int = STREAM_BATCH_SIZE, **filters) -> bytes:
+        """Export a full listing as a Parquet file"""
+        table = self.export_arrow_table(entity, types, batch_size, **filters)
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink)
+        return sink.getvalue().to_pybytes()
@@ -0,0 +1,425 @@
+"""
+Query instrumentation for the Database manager
+Times every query run through a pooled connection and aggregates the
+timings per normalized SQL fingerprint and per API request
+"""
+
+import functools
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Public Database method currently running (outermost call only)
+_current_method = ContextVar('db_method', default=None)
+
+# RequestTiming of the API request being served, if any
+_current_request = ContextVar('db_request', default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUE_LISTS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """
+    Normalize a query so executions that differ only in values group together
+
+    Literals and placeholders become ?, IN lists and multi-row VALUES
+    collapse to (?+) and whitespace is squeezed.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _VALUE_LIST.sub("(?+)", sql)
+    sql = _VALUE_LISTS.sub("(?+), ...", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def redact(params) -> Optional[List]:
+    """Describe query parameters by type and size only (no values)"""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        params = params.values()
+    redacted = []
+    for value in params:
+        if value is None:
+            redacted.append(None)
+        elif isinstance(value, str):
+            redacted.append(f"<str:{len(value)}>")
+        else:
+            redacted.append(f"<{type(value).__name__}>")
+    return redacted
+
+
+def current_method() -> Optional[str]:
+    """Name of the Database method running in this context, if any"""
+    return _current_method.get()
+
+
+class RequestTiming:
+    """
+    Database activity and phase timings of one API request
+
+    Shared by reference with every thread working for the request (the
+    context is copied, the object is not), so the counters are locked.
+    Route phase fields are only written from the event loop.
+    """
+
+    __slots__ = ('_lock', 'db_calls', 'db_ms', 'queries', 'sql_ms', 'connections', 'acquire_ms',
+                 'serialize_ms', 'route_ms', 'route_db_ms', 'endpoint_ms', 'endpoint_db_ms',
+                 'endpoint_serialize_ms')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.db_calls = 0
+        self.db_ms = 0.0          # waiting on Database calls (thread handoff, checkout, queries, row handling)
+        self.queries = 0
+        self.sql_ms = 0.0         # executing statements and fetching their rows
+        self.connections = 0
+        self.acquire_ms = 0.0     # waiting for pooled connections
+        self.serialize_ms = 0.0   # validation/encoding done by the endpoint itself (serializing())
+        self.route_ms = None      # validation + endpoint + serialization
+        self.route_db_ms = 0.0
+        self.endpoint_ms = None
+        self.endpoint_db_ms = 0.0
+        self.endpoint_serialize_ms = 0.0
+
+    def database_call(self, ms: float):
+        with self._lock:
+            self.db_calls += 1
+            self.db_ms += ms
+
+    def query(self, ms: float):
+        with self._lock:
+            self.queries += 1
+            self.sql_ms += ms
+
+    def connection(self, acquire_ms: float):
+        with self._lock:
+            self.connections += 1
+            self.acquire_ms += acquire_ms
+
+    def serialization(self, ms: float):
+        with self._lock:
+            self.serialize_ms += ms
+
+    def phases(self) -> Dict:
+        """
+        Split the route time into endpoint code and validation/serialization
+
+        Returns:
+            Dictionary with app_ms (endpoint time outside Database calls and
+            serializing() blocks) and validation_ms (request validation,
+            dependencies and response serialization, including the
+            serializing() blocks of the endpoint and of a streamed body,
+            outside Database calls); None outside API routes
+        """
+        if self.route_ms is None:
+            return {'app_ms': None, 'validation_ms': None}
+        # Requests rejected by validation never reach the endpoint
+        endpoint_ms = self.endpoint_ms or 0.0
+        app_ms = endpoint_ms - self.endpoint_db_ms - self.endpoint_serialize_ms
+        validation_ms = ((self.route_ms - endpoint_ms) - (self.route_db_ms - self.endpoint_db_ms)
+                         + self.serialize_ms)
+        return {'app_ms': max(app_ms, 0.0), 'validation_ms': max(validation_ms, 0.0)}
+
+
+def current_request() -> Optional[RequestTiming]:
+    """RequestTiming of the API request being served in this context, if any"""
+    return _current_request.get()
+
+
+def begin_request() -> Tuple[RequestTiming, Token]:
+    """Start accounting a request in this context; pass the token to end_request()"""
+    timing = RequestTiming()
+    return timing, _current_request.set(timing)
+
+
+def end_request(token: Token):
+    _current_request.reset(token)
+
+
+@contextmanager
+def serializing():
+    """
+    Account the enclosed block as validation/serialization of the current request
+
+    For endpoints that validate and encode their response themselves (bulk
+    TypeAdapter passes, streamed bodies), so that time is not reported as
+    endpoint code. No-op outside API requests.
+    """
+    request = current_request()
+    if request is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        request.serialization((time.perf_counter() - started) * 1000)
+
+
+def track_methods(cls):
+    """
+    Class decorator labelling the queries of each public method with its name
+
+    Nested calls keep the outermost name, so the queries a method runs on
+    behalf of another are attributed to the caller.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith('_') or not callable(attr) or isinstance(attr, (staticmethod, classmethod)):
+            continue
+        setattr(cls, name, _labelled(name, attr))
+    return cls
+
+
+def _labelled(name: str, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _current_method.get() is not None:
+            return method(*args, **kwargs)
+        token = _current_method.set(name)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _current_method.reset(token)
+    return wrapper
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class _Timings:
+    """Count, total, max and a window of recent samples for percentiles"""
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=window)
+
+    def add(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.samples.append(ms)
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(_percentile(ordered, 0.50), 3),
+            'p95_ms': round(_percentile(ordered, 0.95), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+class QueryStats:
+    """
+    Thread-safe aggregate of query timings
+
+    Keeps per-fingerprint timings (count, p50/p95/max over the last
+    `window` executions), connection-acquire timings and a ring buffer of
+    the last `slow_log_size` queries slower than `slow_ms`, with their
+    parameters redacted.
+
+    Args:
+        slow_ms: Queries at or above this duration go to the slow log
+        slow_log_size: Entries kept in the slow log
+        window: Recent samples kept per fingerprint for percentiles
+    """
+
+    def __init__(self, slow_ms: float = 100.0, slow_log_size: int = 100, window: int = 512):
+        self.slow_ms = slow_ms
+        self.window = window
+        self._lock = threading.Lock()
+        self._queries = {}  # fingerprint -> {'timings', 'rows', 'methods'}
+        self._acquire = _Timings(window)
+        self._slow = deque(maxlen=slow_log_size)
+
+    def record(self, method: Optional[str], sql: str, params, elapsed_ms: float,
+               rows: int, acquire_ms: Optional[float] = None):
+        """Add one executed query (elapsed_ms includes fetching its rows)"""
+        key = fingerprint(sql)
+        method = method or '<direct>'
+        with self._lock:
+            entry = self._queries.get(key)
+            if entry is None:
+                entry = self._queries[key] = {'timings': _Timings(self.window), 'rows': 0, 'methods': {}}
+            entry['timings'].add(elapsed_ms)
+            entry['rows'] += rows
+            entry['methods'][method] = entry['methods'].get(method, 0) + 1
+            if acquire_ms is not None:
+                self._acquire.add(acquire_ms)
+            if elapsed_ms >= self.slow_ms:
+                self._slow.append({
+                    'at': datetime.now().isoformat(timespec='milliseconds'),
+                    'method': method,
+                    'fingerprint': key,
+                    'params': redact(params),
+                    'elapsed_ms': round(elapsed_ms, 3),
+                    'rows': rows,
+                    'acquire_ms': round(acquire_ms, 3) if acquire_ms is not None else None,
+                })
+
+    def snapshot(self, sort: str = 'total_ms', limit: Optional[int] = None) -> Dict:
+        """
+        Aggregated stats
+
+        Args:
+            sort: Key to rank fingerprints by (total_ms, count, p95_ms, max_ms, ...)
+            limit: Keep only the top fingerprints
+
+        Returns:
+            Dictionary with 'queries' (per fingerprint), 'acquire' and 'slow'
+        """
+        with self._lock:
+            queries = []
+            for key, entry in self._queries.items():
+                item = {'fingerprint': key, **entry['timings'].to_dict(), 'rows': entry['rows'],
+                        'methods': dict(entry['methods'])}
+                queries.append(item)
+            acquire = self._acquire.to_dict()
+            slow = list(self._slow)
+
+        if queries and sort not in queries[0]:
+            raise ValueError(f"Unknown sort key: {sort}")
+        queries.sort(key=lambda item: item[sort], reverse=True)
+        return {
+            'queries': queries[:limit] if limit else queries,
+            'acquire': acquire,
+            'slow': slow,
+            'slow_ms': self.slow_ms,
+        }
+
+    def total_queries(self) -> int:
+        with self._lock:
+            return sum(entry['timings'].count for entry in self._queries.values())
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._acquire = _Timings(self.window)
+            self._slow.clear()
+
+
+class InstrumentedCursor:
+    """
+    DB-API cursor proxy that reports each execution to a QueryStats
+
+    A query's time runs from execute() until the next execute(), close(),
+    fetchall() or the cursor being dropped, so rows fetched lazily (SQLite
+    steps the statement while fetching) are included.
+    """
+
+    __slots__ = ('_cursor', '_stats', '_acquire_ms', 'method', '_request', '_pending')
+
+    def __init__(self, cursor, stats: QueryStats, acquire_ms: Optional[float] = None):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_stats', stats)
+        object.__setattr__(self, '_acquire_ms', acquire_ms)
+        # Label fixed at creation (generators run after their method returned)
+        object.__setattr__(self, 'method', current_method())
+        object.__setattr__(self, '_request', current_request())
+        object.__setattr__(self, '_pending', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        if name == 'method':
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def _flush(self):
+        pending = self._pending
+        if pending is None:
+            return
+        object.__setattr__(self, '_pending', None)
+        sql, params, elapsed, rows, fetched, acquire_ms = pending
+        if not fetched:
+            rowcount = getattr(self._cursor, 'rowcount', -1)
+            rows = rowcount if rowcount and rowcount > 0 else 0
+        self._stats.record(self.method or current_method(), sql, params, elapsed * 1000, rows, acquire_ms)
+        if self._request is not None:
+            self._request.query(elapsed * 1000)
+
+    def _run(self, func, sql, params):
+        self._flush()
+        # The connection's checkout wait is reported with its first query
+        acquire_ms = self._acquire_ms
+        object.__setattr__(self, '_acquire_ms', None)
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            object.__setattr__(self, '_pending', [sql, params, time.perf_counter() - started, 0, False, acquire_ms])
+
+    def execute(self, sql, params=None):
+        if params is None:
+            return self._run(lambda: self._cursor.execute(sql), sql, params)
+        return self._run(lambda: self._cursor.execute(sql, params), sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self._run(lambda: self._cursor.executemany(sql, seq_of_params), sql, None)
+
+    def _fetch(self, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - started
+            pending[3] += len(result) if isinstance(result, list) else int(result is not None)
+            pending[4] = True
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        result = self._fetch(self._cursor.fetchall)
+        self._flush()
+        return result
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._flush()
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self._flush()
+        except Exception:
+            pass
@@ -0,0 +1,199 @@
+"""
+In-process metrics for the API in Prometheus text exposition format
+Request counters and latency histograms collected by an ASGI middleware,
+plus renderers for the Database pool, query and cache statistics
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def metric(name: str, kind: str, help_text: str, samples: Iterable[Tuple]) -> List[str]:
+    """
+    Lines of one metric family
+
+    Args:
+        name: Metric name
+        kind: counter, gauge, histogram or summary
+        help_text: HELP line
+        samples: (suffix, labels dict, value) tuples; suffix is appended to name
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        lines.append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+    return lines
+
+
+class RequestMetrics:
+    """
+    Thread-safe request counters, latency histograms and in-flight gauge
+
+    Routes are labelled with their path template (/api/indicadores/{indicador_id}),
+    so label cardinality is bounded by the number of routes.
+
+    Args:
+        buckets: Upper bounds of the latency histogram, in seconds
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._requests = {}   # (method, route, status) -> count
+        self._latency = {}    # (method, route) -> [bucket counts..., +Inf count, sum]
+        self.in_flight = 0
+
+    def started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def finished(self, method: str, route: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            histogram = self._latency.get((method, route))
+            if histogram is None:
+                histogram = self._latency[(method, route)] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram[-1] += seconds
+
+    def render(self) -> List[str]:
+        with self._lock:
+            requests = dict(self._requests)
+            latency = {key: list(value) for key, value in self._latency.items()}
+            in_flight = self.in_flight
+
+        lines = metric(
+            "http_requests_total", "counter", "HTTP requests by route and status",
+            (("", {"method": m, "route": r, "status": s}, n) for (m, r, s), n in sorted(requests.items()))
+        )
+
+        samples = []
+        for (method, route), histogram in sorted(latency.items()):
+            labels = {"method": method, "route": route}
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), histogram[:-1]):
+                cumulative += count
+                samples.append(("_bucket", {**labels, "le": _number(bound)}, cumulative))
+            samples.append(("_sum", labels, round(histogram[-1], 6)))
+            samples.append(("_count", labels, cumulative))
+        lines += metric("http_request_duration_seconds", "histogram", "HTTP request latency", samples)
+
+        lines += metric("http_requests_in_flight", "gauge", "HTTP requests being served", [("", {}, in_flight)])
+        return lines
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding a RequestMetrics
+
+    Latency runs until the last body chunk is sent, so streamed responses
+    are measured in full.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        self.metrics.started()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            self.metrics.finished(scope["method"], path, status[0], time.perf_counter() - started)
+
+
+def render_pool(stats: Dict) -> List[str]:
+    """Metric lines for Database.get_pool_stats()"""
+    labels = {"kind": stats["kind"]}
+    lines = metric("db_pool_connections", "gauge", "Pooled connections by state", [
+        ("", {**labels, "state": "in_use"}, stats["in_use"]),
+        ("", {**labels, "state": "idle"}, stats["idle"]),
+    ])
+    lines += metric("db_pool_size", "gauge", "Open pooled connections", [("", labels, stats["size"])])
+    lines += metric("db_pool_max_size", "gauge", "Pool connection limit (0 = unbounded)", [("", labels, stats["max_size"])])
+    lines += metric("db_pool_waiting", "gauge", "Threads waiting for a connection", [("", labels, stats["waiting"])])
+    lines += metric("db_pool_checkouts_total", "counter", "Connection checkouts", [("", labels, stats["checkouts"])])
+    lines += metric("db_pool_timeouts_total", "counter", "Checkouts that timed out", [("", labels, stats["timeouts"])])
+    lines += metric("db_pool_wait_seconds_total", "counter", "Time spent waiting for connections",
+                    [("", labels, round(stats["total_wait_ms"] / 1000, 6))])
+    return lines
+
+
+def render_queries(stats: Dict) -> List[str]:
+    """Metric lines for Database.get_query_stats()"""
+    if not stats.get("enabled"):
+        return []
+
+    samples, rows = [], []
+    for query in stats["queries"]:
+        labels = {"fingerprint": query["fingerprint"]}
+        samples.append(("", {**labels, "quantile": "0.5"}, query["p50_ms"] / 1000))
+        samples.append(("", {**labels, "quantile": "0.95"}, query["p95_ms"] / 1000))
+        samples.append(("_sum", labels, round(query["total_ms"] / 1000, 6)))
+        samples.append(("_count", labels, query["count"]))
+        rows.append(("", labels, query["rows"]))
+    lines = metric("db_query_duration_seconds", "summary", "Query execution time by SQL fingerprint", samples)
+    lines += metric("db_query_rows_total", "counter", "Rows returned or affected by SQL fingerprint", rows)
+
+    acquire = stats["acquire"]
+    lines += metric("db_connection_acquire_seconds", "summary", "Connection checkout wait", [
+        ("", {"quantile": "0.5"}, acquire["p50_ms"] / 1000),
+        ("", {"quantile": "0.95"}, acquire["p95_ms"] / 1000),
+        ("_sum", {}, round(acquire["total_ms"] / 1000, 6)),
+        ("_count", {}, acquire["count"]),
+    ])
+    return lines
+
+
+def render_cache(stats: Optional[Dict]) -> List[str]:
+    """Metric lines for Database.get_cache_stats() (nothing when the cache is off)"""
+    if stats is None:
+        return []
+    lines = metric("db_read_cache_hits_total", "counter", "Read cache hits", [("", {}, stats["hits"])])
+    lines += metric("db_read_cache_misses_total", "counter", "Read cache misses", [("", {}, stats["misses"])])
+    lines += metric("db_read_cache_hit_ratio", "gauge", "Read cache hits / lookups", [("", {}, stats["hit_rate"])])
+    lines += metric("db_read_cache_evictions_total", "counter", "Entries evicted by the LRU bound", [("", {}, stats["evictions"])])
+    lines += metric("db_read_cache_invalidations_total", "counter", "Full invalidations after writes", [("", {}, stats["invalidations"])])
+    lines += metric("db_read_cache_entries", "gauge", "Cached results", [("", {}, stats["size"])])
+    return lines
@@ -0,0 +1,456 @@
+"""
+Connection pooling for the Database manager
+Bounded pool for PostgreSQL and per-thread persistent connections for SQLite
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Optional
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be checked out before the timeout"""
+    pass
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of pool usage"""
+    kind: str
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    min_size: int
+    max_size: int
+    checkouts: int
+    timeouts: int
+    discarded: int
+    total_wait_ms: float
+    max_wait_ms: float
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['avg_wait_ms'] = round(self.avg_wait_ms, 3)
+        return data
+
+
+class PooledConnection:
+    """
+    Proxy around a raw DB-API connection checked out from a pool
+
+    Behaves like the underlying connection, except that close() hands the
+    connection back to its pool instead of closing the socket/file.
+    """
+
+    __slots__ = ('_pool', '_raw', '_wrap_cursor')
+
+    def __init__(self, pool, raw):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_raw', raw)
+        object.__setattr__(self, '_wrap_cursor', None)
+
+    @property
+    def raw(self):
+        """Underlying DB-API connection"""
+        if self._raw is None:
+            raise RuntimeError("Connection already returned to the pool")
+        return self._raw
+
+    @property
+    def closed(self) -> bool:
+        return self._raw is None
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self.raw.cursor(*args, **kwargs)
+        return self._wrap_cursor(cursor) if self._wrap_cursor is not None else cursor
+
+    def wrap_cursors(self, wrap: Optional[Callable]):
+        """Pass every cursor created from now on through wrap(cursor)"""
+        object.__setattr__(self, '_wrap_cursor', wrap)
+
+    def __setattr__(self, name, value):
+        setattr(self.raw, name, value)
+
+    def close(self):
+        """Return the connection to the pool (idempotent)"""
+        raw = self._raw
+        if raw is None:
+            return
+        object.__setattr__(self, '_raw', None)
+        self._pool.release(raw)
+
+    def discard(self):
+        """Close the underlying connection instead of reusing it"""
+        raw = self._raw
+        if raw is None:
+            return
+        object.__setattr__(self, '_raw', None)
+        self._pool.release(raw, discard=True)
+
+    def __del__(self):
+        # Safety net for code paths that forget to close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _PoolBase:
+    """Shared statistics bookkeeping for both pool flavours"""
+
+    kind = 'base'
+
+    def __init__(self, connect: Callable, reset: Optional[Callable] = None,
+                 check: Optional[Callable] = None, check_interval: float = 30.0):
+        self._connect = connect
+        self._reset = reset
+        self._check = check
+        self._check_interval = check_interval
+        self._lock = threading.Condition()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a connection wrapped in a PooledConnection proxy"""
+        return PooledConnection(self, self.acquire(timeout))
+
+    def _record_wait(self, started: float):
+        waited = time.monotonic() - started
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += waited
+            if waited > self._max_wait:
+                self._max_wait = waited
+
+    def _healthy(self, raw, idle_since: float) -> bool:
+        """Run the health check if the connection has been idle long enough"""
+        if self._check is None:
+            return True
+        if time.monotonic() - idle_since < self._check_interval:
+            return True
+        try:
+            return bool(self._check(raw))
+        except Exception:
+            return False
+
+    def _reset_for_reuse(self, raw) -> bool:
+        """Roll back any open transaction before the connection is reused"""
+        if self._reset is None:
+            return True
+        try:
+            self._reset(raw)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool(_PoolBase):
+    """
+    Bounded, thread-safe connection pool (used for PostgreSQL)
+
+    Args:
+        connect: Callable returning a new raw connection
+        min_size: Connections opened eagerly and kept around
+        max_size: Upper bound on open connections; checkouts beyond it wait
+        timeout: Default seconds to wait for a free connection
+        reset: Callable run on release (e.g. rollback); failures discard the connection
+        check: Health check run on checkout, returns False for broken connections
+        check_interval: Only run the health check if idle for at least this many seconds
+    """
+
+    kind = 'bounded'
+
+    def __init__(self, connect: Callable, min_size: int = 1, max_size: int = 10,
+                 timeout: float = 30.0, reset: Optional[Callable] = None,
+                 check: Optional[Callable] = None, check_interval: float = 30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        super().__init__(connect, reset=reset, check=check, check_interval=check_interval)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = deque()  # (raw, idle_since)
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check out a raw connection
+
+        Raises:
+            PoolTimeout: if no connection becomes available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            raw = None
+            idle_since = None
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    if self._idle:
+                        raw, idle_since = self._idle.pop()
+                        self._in_use += 1
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._in_use += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"No connection available after {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._lock.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if raw is None:
+                try:
+                    raw = self._connect()
+                except Exception:
+                    self._forget()
+                    raise
+                self._record_wait(started)
+                return raw
+
+            if self._healthy(raw, idle_since):
+                self._record_wait(started)
+                return raw
+
+            # Broken connection: drop it and try again
+            self._close_quietly(raw)
+            self._forget(discarded=True)
+
+    def release(self, raw, discard: bool = False):
+        """Return a raw connection to the pool"""
+        if not discard and not self._reset_for_reuse(raw):
+            discard = True
+
+        with self._lock:
+            if discard or self._closed:
+                self._in_use -= 1
+                self._size -= 1
+                if discard:
+                    self._discarded += 1
+            else:
+                self._in_use -= 1
+                self._idle.append((raw, time.monotonic()))
+                raw = None
+            self._lock.notify()
+
+        if raw is not None:
+            self._close_quietly(raw)
+
+    def _forget(self, discarded: bool = False):
+        """Give back a slot reserved for a connection that never made it out"""
+        with self._lock:
+            self._size -= 1
+            self._in_use -= 1
+            if discarded:
+                self._discarded += 1
+            self._lock.notify()
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed on release"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._lock.notify_all()
+        for raw, _ in idle:
+            self._close_quietly(raw)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                kind=self.kind,
+                size=self._size,
+                in_use=self._in_use,
+                idle=len(self._idle),
+                waiting=self._waiting,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                discarded=self._discarded,
+                total_wait_ms=round(self._total_wait * 1000, 3),
+                max_wait_ms=round(self._max_wait * 1000, 3),
+            )
+
+
+class ThreadLocalConnectionPool(_PoolBase):
+    """
+    One persistent connection per thread (used for SQLite)
+
+    A thread that already holds its connection (e.g. inside a unit of work)
+    and asks for another one gets a short-lived overflow connection, so
+    nested checkouts never share a transaction by accident.
+    """
+
+    kind = 'thread_local'
+
+    def __init__(self, connect: Callable, reset: Optional[Callable] = None,
+                 check: Optional[Callable] = None, check_interval: float = 30.0):
+        super().__init__(connect, reset=reset, check=check, check_interval=check_interval)
+        self._conns = {}       # thread ident -> (raw, idle_since)
+        self._busy = set()     # id(raw) of checked-out persistent connections
+        self._owners = {}      # id(raw) -> thread ident
+        self._overflow = 0
+        self._closed = False
+
+    def acquire(self, timeout: Optional[float] = None):
+        started = time.monotonic()
+        ident = threading.get_ident()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            entry = self._conns.get(ident)
+            if entry is not None and id(entry[0]) not in self._busy:
+                raw, idle_since = entry
+                self._busy.add(id(raw))
+            else:
+                raw = idle_since = None
+                persistent = entry is None
+                if not persistent:
+                    self._overflow += 1
+
+        if raw is not None:
+            if self._healthy(raw, idle_since):
+                self._record_wait(started)
+                return raw
+            # Broken persistent connection: replace it
+            self._drop_persistent(ident, raw)
+            self._close_quietly(raw)
+            persistent = True
+
+        try:
+            raw = self._connect()
+        except Exception:
+            if not persistent:
+                with self._lock:
+                    self._overflow -= 1
+            raise
+
+        if persistent:
+            with self._lock:
+                self._prune_dead_threads()
+                self._conns[ident] = (raw, time.monotonic())
+                self._owners[id(raw)] = ident
+                self._busy.add(id(raw))
+
+        self._record_wait(started)
+        return raw
+
+    def release(self, raw, discard: bool = False):
+        key = id(raw)
+        with self._lock:
+            persistent = key in self._owners
+
+        if not persistent:
+            with self._lock:
+                self._overflow -= 1
+            self._close_quietly(raw)
+            return
+
+        if not discard and not self._reset_for_reuse(raw):
+            discard = True
+
+        with self._lock:
+            self._busy.discard(key)
+            ident = self._owners[key]
+            if discard or self._closed:
+                self._owners.pop(key, None)
+                if self._conns.get(ident, (None,))[0] is raw:
+                    del self._conns[ident]
+                if discard:
+                    self._discarded += 1
+            else:
+                self._conns[ident] = (raw, time.monotonic())
+                raw = None
+
+        if raw is not None:
+            self._close_quietly(raw)
+
+    def _drop_persistent(self, ident, raw):
+        with self._lock:
+            self._busy.discard(id(raw))
+            self._owners.pop(id(raw), None)
+            self._conns.pop(ident, None)
+            self._discarded += 1
+
+    def _prune_dead_threads(self):
+        """Close connections owned by threads that no longer exist (lock held)"""
+        alive = {t.ident for t in threading.enumerate()}
+        for ident in list(self._conns):
+            raw, _ = self._conns[ident]
+            if ident not in alive and id(raw) not in self._busy:
+                del self._conns[ident]
+                self._owners.pop(id(raw), None)
+                self._close_quietly(raw)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle = [raw for raw, _ in self._conns.values() if id(raw) not in self._busy]
+            for raw in idle:
+                self._owners.pop(id(raw), None)
+            self._conns = {k: v for k, v in self._conns.items() if id(v[0]) in self._busy}
+        for raw in idle:
+            self._close_quietly(raw)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            persistent = len(self._conns)
+            busy = len(self._busy)
+            return PoolStats(
+                kind=self.kind,
+                size=persistent + self._overflow,
+                in_use=busy + self._overflow,
+                idle=persistent - busy,
+                waiting=0,
+                min_size=0,
+                max_size=0,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                discarded=self._discarded,
+                total_wait_ms=round(self._total_wait * 1000, 3),
+                max_wait_ms=round(self._max_wait * 1000, 3),
+            )
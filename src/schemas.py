@@ -161,6 +161,38 @@ class AvanceMensualCreate(BaseModel):
     avance_reportado: int = Field(..., ge=0, le=100)
     usuario: Optional[str] = None
     mes: Optional[str] = None  # YYYY-MM format, defaults to current month
+    # If the month was already reported: reject, overwrite (admin correction)
+    # or keep_latest (replace unless the stored report has a later fecha_reporte)
+    on_conflict: str = Field("reject", pattern="^(reject|overwrite|keep_latest)$")
+    fecha_reporte: Optional[date] = None  # defaults to today
+
+
+class AvanceMensualItem(BaseModel):
+    """One item of a batch monthly progress report"""
+    entidad: str = Field(..., pattern="^(hito|actividad)$")
+    id_entidad: int
+    avance_reportado: int = Field(..., ge=0, le=100)
+
+
+class AvanceMensualBatchCreate(BaseModel):
+    """Schema for reporting monthly progress of many items at once"""
+    usuario: Optional[str] = None
+    mes: Optional[str] = None  # YYYY-MM format, defaults to current month
+    reportes: List[AvanceMensualItem] = Field(..., min_length=1)
+
+
+class AvanceMensualRef(BaseModel):
+    """Reference to a reported hito/actividad"""
+    entidad: str
+    id_entidad: int
+
+
+class AvanceMensualBatchResponse(BaseModel):
+    """Result of a batch monthly progress report"""
+    mes: str
+    registrados: List[AvanceMensualRef] = []
+    duplicados: List[AvanceMensualRef] = []
+    indicadores_actualizados: List[int] = []
 
 
 class AvanceMensualResponse(BaseModel):
@@ -189,6 +221,21 @@ class DashboardStats(BaseModel):
     avg_avance: float
 
 
+class DashboardFacets(BaseModel):
+    """Distinct values of the dashboard filter columns"""
+    area: List[str] = []
+    año: List[int] = []
+    unidad_organizacional: List[str] = []
+    tipo_indicador: List[str] = []
+    responsable: List[str] = []
+
+
+class DashboardBundle(BaseModel):
+    """Everything the dashboard header needs in one response"""
+    stats: DashboardStats
+    facets: DashboardFacets
+
+
 # ==================== JERARQUIA ====================
 
 class ActividadJerarquia(BaseModel):
@@ -228,6 +275,14 @@ class MessageResponse(BaseModel):
     success: bool = True
 
 
+class AvanceMensualRegistroResponse(MessageResponse):
+    """Result of registering a monthly progress report"""
+    status: str  # inserted, updated or skipped
+    mes: str
+    avance_reportado: int
+    avance_anterior: Optional[int] = None
+
+
 class ErrorResponse(BaseModel):
     """Error response"""
     detail: str
@@ -0,0 +1,162 @@
+"""
+Per-request timing for the API
+Breaks each request down into database, endpoint and validation/serialization
+time and reports it as a Server-Timing header and a JSON log line
+"""
+
+import functools
+import inspect
+import json
+import logging
+import sys
+import time
+from typing import Dict
+
+from fastapi.routing import APIRoute
+
+from src.instrumentation import RequestTiming, begin_request, current_request, end_request
+
+logger = logging.getLogger("indicadores.requests")
+
+
+def log_to_stderr():
+    """Write the request log lines to stderr as bare JSON (one object per line)"""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that times its endpoint apart from validation and serialization
+
+    Use as the router's route_class; requests outside ServerTimingMiddleware
+    are not affected.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        @functools.wraps(handler)
+        async def timed_handler(request):
+            timing = current_request()
+            if timing is None:
+                return await handler(request)
+            db_before = timing.db_ms
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                timing.route_ms = (time.perf_counter() - started) * 1000
+                timing.route_db_ms = timing.db_ms - db_before
+
+        return timed_handler
+
+
+def _timed_endpoint(endpoint):
+    # Only coroutine endpoints: sync ones run on a threadpool FastAPI picks
+    # by inspecting the function, which a wrapper would change
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def timed(*args, **kwargs):
+        timing = current_request()
+        if timing is None:
+            return await endpoint(*args, **kwargs)
+        db_before, serialize_before = timing.db_ms, timing.serialize_ms
+        started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timing.endpoint_ms = (time.perf_counter() - started) * 1000
+            timing.endpoint_db_ms = timing.db_ms - db_before
+            timing.endpoint_serialize_ms = timing.serialize_ms - serialize_before
+
+    return timed
+
+
+def summary(timing: RequestTiming, total_ms: float) -> Dict:
+    """Timing breakdown of a request, in milliseconds"""
+    return {
+        'total_ms': round(total_ms, 3),
+        'db_ms': round(timing.db_ms, 3),
+        'db_calls': timing.db_calls,
+        'sql_ms': round(timing.sql_ms, 3),
+        'queries': timing.queries,
+        'connections': timing.connections,
+        'pool_ms': round(timing.acquire_ms, 3),
+        **{key: round(value, 3) if value is not None else None for key, value in timing.phases().items()},
+    }
+
+
+def header(values: Dict) -> str:
+    """Server-Timing header value for a summary()"""
+    metrics = [
+        f"total;dur={values['total_ms']:.2f}",
+        f'db;dur={values["db_ms"]:.2f};desc="{values["queries"]} queries"',
+        f"sql;dur={values['sql_ms']:.2f}",
+        f'pool;dur={values["pool_ms"]:.2f};desc="{values["connections"]} connections"',
+    ]
+    if values['app_ms'] is not None:
+        metrics.append(f"app;dur={values['app_ms']:.2f}")
+        metrics.append(f"validation;dur={values['validation_ms']:.2f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware adding Server-Timing to every HTTP response
+
+    The header carries what happened before the response started (for
+    streamed responses, the rows fetched while streaming are not included);
+    the log line is written once the body has been sent and covers it all.
+
+    Args:
+        app: ASGI application
+        log: Write a JSON line per request to the indicadores.requests logger
+    """
+
+    def __init__(self, app, log: bool = True):
+        self.app = app
+        self.log = log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing, token = begin_request()
+        status = [500]
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                value = header(summary(timing, (time.perf_counter() - started) * 1000))
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"server-timing", value.encode("latin-1")),
+                    (b"timing-allow-origin", b"*"),
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end_request(token)
+            if self.log and logger.isEnabledFor(logging.INFO):
+                route = scope.get("route")
+                logger.info(json.dumps({
+                    'method': scope["method"],
+                    'path': scope["path"],
+                    'route': getattr(route, "path", None),
+                    'status': status[0],
+                    **summary(timing, (time.perf_counter() - started) * 1000),
+                }))
@@ -0,0 +1,53 @@
+"""
+Shared fixtures: a fresh SQLite Database per test and API clients bound to it
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.async_database import AsyncDatabase
+from src.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(db_path=str(tmp_path / "test.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def api_module(tmp_path, monkeypatch):
+    """The api module, imported from a scratch working directory"""
+    monkeypatch.chdir(tmp_path)
+    import api
+    return api
+
+
+@pytest.fixture
+def serve(api_module, monkeypatch):
+    """
+    Bind the API to a Database: serve(database, **AsyncDatabase kwargs) returns a TestClient
+
+    The database threads of every AsyncDatabase created are stopped and its
+    Database closed at teardown.
+    """
+    served = []
+
+    def bind(database, **kwargs):
+        adb = AsyncDatabase(database, **kwargs)
+        served.append(adb)
+        monkeypatch.setattr(api_module, "db", adb)
+        return TestClient(api_module.app)
+
+    yield bind
+    for adb in served:
+        asyncio.run(adb.close())
+
+
+@pytest.fixture
+def client(db, serve):
+    """TestClient of the API served from the db fixture"""
+    return serve(db)
@@ -0,0 +1,63 @@
+"""
+Concurrent requests against the API: no pooled connection or writer lock
+is held across awaits, so more requests than connections/threads never
+deadlock
+"""
+
+import asyncio
+import sqlite3
+import time
+
+import httpx
+
+from src.pool import ConnectionPool
+
+CONCURRENT = 12
+
+
+def _gather(app, requests):
+    """Send (method, url, kwargs) requests concurrently; returns the responses and elapsed seconds"""
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.request(method, url, **kwargs) for method, url, kwargs in requests
+            ))
+
+    started = time.perf_counter()
+    responses = asyncio.run(scenario())
+    return responses, time.perf_counter() - started
+
+
+def test_more_concurrent_reads_than_pooled_connections(db, serve):
+    indicador_id = db.create_indicador(año=2025, indicador="Indicador", tipo_indicador="Estratégico")
+    db.pool.close()
+    db.pool = ConnectionPool(
+        lambda: sqlite3.connect(db.db_path, check_same_thread=False), min_size=0, max_size=4, timeout=5
+    )
+    app = serve(db, max_workers=db.pool.max_size).app
+
+    responses, elapsed = _gather(app, [
+        ("GET", f"/api/indicadores/{indicador_id}", {}) for _ in range(CONCURRENT)
+    ])
+
+    assert [r.status_code for r in responses] == [200] * CONCURRENT
+    assert elapsed < 5
+    assert db.get_pool_stats()['timeouts'] == 0
+
+
+def test_concurrent_sqlite_writes_do_not_starve_the_writer_lock(db, serve):
+    indicador_id = db.create_indicador(año=2025, indicador="Indicador", tipo_indicador="Estratégico",
+                                       tiene_hitos=True)
+    hitos = [db.create_hito(indicador_id=indicador_id, nombre=f"Hito {n}") for n in range(CONCURRENT)]
+    app = serve(db, max_workers=4).app
+
+    responses, elapsed = _gather(app, [
+        ("POST", "/api/avance-mensual", {"json": {
+            "entidad": "hito", "id_entidad": hito_id, "avance_reportado": 50, "mes": "2025-09"}})
+        for hito_id in hitos
+    ])
+
+    assert [r.status_code for r in responses] == [201] * CONCURRENT, [r.text for r in responses]
+    assert elapsed < 5
+    assert db.get_indicador_by_id(indicador_id)['avance_porcentaje'] == 50
@@ -0,0 +1,41 @@
+"""
+Tests for ETag / If-None-Match handling in api.py
+"""
+
+
+def test_matching_etag_returns_304(client):
+    first = client.get("/api/indicadores")
+    etag = first.headers["ETag"]
+
+    second = client.get("/api/indicadores", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+
+def test_etag_changes_after_a_write(client, db):
+    etag = client.get("/api/dashboard/stats").headers["ETag"]
+
+    db.create_indicador(año=2025, indicador="Nuevo", tipo_indicador="Estratégico")
+
+    response = client.get("/api/dashboard/stats", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["total"] == 1
+
+
+def test_etag_depends_on_query_and_entities(client, db):
+    etag = client.get("/api/indicadores").headers["ETag"]
+    assert client.get("/api/indicadores?area=A", headers={"If-None-Match": etag}).status_code == 200
+
+    # Writes to unrelated entities keep the tag valid
+    indicador_id = db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico")
+    etag = client.get("/api/indicadores").headers["ETag"]
+    db.create_hito(indicador_id=indicador_id, nombre="Hito")
+    assert client.get("/api/indicadores", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_utility_endpoints_are_cacheable(client):
+    response = client.get("/api/areas")
+    assert response.headers["Cache-Control"] == "public, max-age=300"
+    assert client.get("/api/indicadores").headers["Cache-Control"] == "no-cache"
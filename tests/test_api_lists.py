@@ -0,0 +1,65 @@
+"""
+Tests for the fast JSON path of the list endpoints in api.py
+"""
+
+
+def test_list_rows_match_the_response_schema(client, db):
+    indicador_id = db.create_indicador(
+        año=2025, indicador="Uno", tipo_indicador="Estratégico", fecha_inicio="2025-01-15"
+    )
+    db.create_hito(indicador_id=indicador_id, nombre="Con orden", orden=1)
+    db.create_hito(indicador_id=indicador_id, nombre="Sin orden")
+
+    indicadores = client.get("/api/indicadores").json()
+    assert indicadores[0]["fecha_inicio"] == "2025-01-15"
+    assert indicadores[0]["tiene_hitos"] is False
+
+    # NULL integers stay null instead of becoming NaN through pandas
+    response = client.get(f"/api/indicadores/{indicador_id}/hitos")
+    assert response.status_code == 200
+    assert [h["orden"] for h in response.json()] == [None, 1]
+    assert "nombre_indicador" not in client.get("/api/hitos").json()[0]
+
+
+def test_pagination_and_etag_headers_survive_the_fast_path(client, db):
+    for n in range(3):
+        db.create_indicador(año=2025, indicador=f"Ind {n}", tipo_indicador="Estratégico")
+
+    response = client.get("/api/indicadores?limit=2&include_total=true")
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["X-Total-Count"] == "3"
+    assert "X-Next-Cursor" in response.headers
+    assert "ETag" in response.headers
+    assert len(response.json()) == 2
+
+
+def test_seguimiento_keeps_unreported_items_null(client, db):
+    indicador_id = db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico", tiene_hitos=True)
+    reportado = db.create_hito(indicador_id=indicador_id, nombre="Reportado", responsable="Ana")
+    db.create_hito(indicador_id=indicador_id, nombre="Sin reporte", responsable="Ana")
+    db.create_actividad(hito_id=reportado, descripcion_actividad="Sin reporte", responsable="Ana")
+    db.registrar_avance_mensual('hito', reportado, 40, mes="2025-03")
+
+    response = client.get("/api/seguimiento/responsable/Ana")
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert [(h["ultimo_avance"], h["ultimo_avance_mes"]) for h in body["hitos"]] == [(40, "2025-03"), (None, None)]
+    assert body["actividades"][0]["ultimo_avance"] is None
+    assert body["actividades"][0]["ultimo_avance_reportado"] == 0
+    assert body["total_items"] == 3
+
+
+def test_actividades_by_hito_keep_null_columns_null(client, db):
+    indicador_id = db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico", tiene_hitos=True)
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito")
+    reportada = db.create_actividad(hito_id=hito_id, descripcion_actividad="Reportada", fecha_fin_plan="2025-06-30")
+    db.create_actividad(hito_id=hito_id, descripcion_actividad="Sin fecha")
+    db.registrar_avance_mensual('actividad', reportada, 40, mes="2025-03")
+
+    response = client.get(f"/api/hitos/{hito_id}/actividades")
+
+    assert response.status_code == 200, response.text
+    assert "ETag" in response.headers
+    assert [a["fecha_fin_plan"] for a in response.json()] == ["2025-06-30", None]
+    assert [a["ultimo_avance_reportado"] for a in response.json()] == [40, 0]
@@ -0,0 +1,67 @@
+"""
+Tests for src.async_database.AsyncDatabase
+"""
+
+import asyncio
+
+import pytest
+
+from src.async_database import AsyncDatabase
+from src.database import Database
+
+
+@pytest.fixture
+def adb(tmp_path):
+    database = AsyncDatabase(Database(db_path=str(tmp_path / "async.db")))
+    yield database
+    asyncio.run(database.close())
+
+
+def test_methods_are_coroutines_with_the_same_result(adb):
+    async def scenario():
+        indicador_id = await adb.create_indicador(año=2025, indicador="Async", tipo_indicador="Estratégico")
+        return indicador_id, await adb.get_indicador_by_id(indicador_id)
+
+    indicador_id, indicador = asyncio.run(scenario())
+
+    assert indicador == adb.db.get_indicador_by_id(indicador_id)
+    assert adb.db_type == 'sqlite'
+
+
+def test_transaction_commits_and_rolls_back(adb):
+    created = []
+
+    def create(uow, nombre, fail=False):
+        created.append(uow.db.create_indicador(año=2025, indicador=nombre, tipo_indicador="E", uow=uow))
+        if fail:
+            raise RuntimeError("boom")
+        return created[-1]
+
+    async def scenario():
+        kept = await adb.transaction(create, "Kept")
+        with pytest.raises(RuntimeError):
+            await adb.transaction(create, "Dropped", fail=True)
+        return kept
+
+    kept = asyncio.run(scenario())
+
+    assert adb.db.get_indicador_by_id(kept) is not None
+    assert adb.db.get_indicador_by_id(created[-1]) is None
+    assert adb.db.get_pool_stats()['in_use'] == 0
+
+
+def test_unit_of_work_is_not_held_across_awaits(adb):
+    with pytest.raises(AttributeError, match="transaction"):
+        adb.unit_of_work
+
+
+def test_concurrent_calls_run_on_the_database_threads(adb):
+    adb.db.create_indicador(año=2025, indicador="Uno", tipo_indicador="E")
+
+    async def scenario():
+        return await asyncio.gather(*(adb.get_summary_stats() for _ in range(20)))
+
+    results = asyncio.run(scenario())
+
+    assert all(stats['total'] == 1 for stats in results)
+    assert adb.db.get_pool_stats()['in_use'] == 0
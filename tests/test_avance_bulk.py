@@ -0,0 +1,147 @@
+"""
+Tests for Database.registrar_avances_mensuales_bulk
+"""
+
+import pytest
+
+from src import database as database_module
+
+
+def _seed(db):
+    ind_1 = db.create_indicador(año=2025, indicador="Ind 1", tipo_indicador="Regular", tiene_hitos=True)
+    ind_2 = db.create_indicador(año=2025, indicador="Ind 2", tipo_indicador="Regular", tiene_hitos=True)
+    hitos = [
+        db.create_hito(indicador_id=ind_1, nombre="H1", responsable="Ana"),
+        db.create_hito(indicador_id=ind_1, nombre="H2", responsable="Ana"),
+        db.create_hito(indicador_id=ind_2, nombre="H3", responsable="Ana"),
+    ]
+    actividad = db.create_actividad(hito_id=hitos[0], descripcion_actividad="A1", responsable="Ana")
+    return (ind_1, ind_2), hitos, actividad
+
+
+@pytest.mark.parametrize("returning", [True, False], ids=["returning", "rowcount"])
+def test_bulk_registers_all_items(db, monkeypatch, returning):
+    monkeypatch.setattr(database_module, "SQLITE_RETURNING", returning)
+    (ind_1, ind_2), hitos, actividad = _seed(db)
+
+    result = db.registrar_avances_mensuales_bulk(
+        [
+            {'entidad': 'hito', 'id_entidad': hitos[0], 'avance_reportado': 100},
+            {'entidad': 'hito', 'id_entidad': hitos[1], 'avance_reportado': 50},
+            {'entidad': 'hito', 'id_entidad': hitos[2], 'avance_reportado': 0},
+            {'entidad': 'actividad', 'id_entidad': actividad, 'avance_reportado': 40},
+        ],
+        usuario="Ana", mes="2025-05"
+    )
+
+    assert len(result['registrados']) == 4
+    assert result['duplicados'] == []
+    assert result['indicadores_actualizados'] == [ind_1, ind_2]
+
+    hitos_df = db.get_hitos_by_indicador(ind_1)
+    assert list(hitos_df['estado']) == ["Completado", "En progreso"]
+    assert list(hitos_df['ultimo_avance_reportado']) == [100, 50]
+    assert db.get_actividades_by_hito(hitos[0]).iloc[0]['estado_actividad'] == "En progreso"
+
+    indicador = db.get_indicador_by_id(ind_1)
+    assert indicador['avance_porcentaje'] == 75
+    assert db.get_indicador_by_id(ind_2)['estado'] == "Por comenzar"
+
+
+def test_bulk_reports_duplicates_per_item(db):
+    _, hitos, _ = _seed(db)
+    db.registrar_avance_mensual('hito', hitos[0], 10, mes="2025-05")
+
+    result = db.registrar_avances_mensuales_bulk(
+        [
+            {'entidad': 'hito', 'id_entidad': hitos[0], 'avance_reportado': 90},
+            {'entidad': 'hito', 'id_entidad': hitos[1], 'avance_reportado': 20},
+            {'entidad': 'hito', 'id_entidad': hitos[1], 'avance_reportado': 30},
+        ],
+        mes="2025-05"
+    )
+
+    assert result['registrados'] == [{'entidad': 'hito', 'id_entidad': hitos[1]}]
+    assert result['duplicados'] == [
+        {'entidad': 'hito', 'id_entidad': hitos[0]},
+        {'entidad': 'hito', 'id_entidad': hitos[1]},
+    ]
+    assert db.get_avance_mensual_actual('hito', hitos[0])['avance_reportado'] == 10
+    assert db.get_avance_mensual_actual('hito', hitos[1])['avance_reportado'] == 20
+
+
+def test_bulk_reports_rows_dropped_by_a_concurrent_submission(db):
+    (ind_1, _), hitos, _ = _seed(db)
+    # Stands in for a concurrent writer: H2 gets reported between the
+    # duplicate lookup and the INSERT, so ON CONFLICT drops the batch's row
+    conn = db.get_connection()
+    conn.execute(f"""
+        CREATE TRIGGER concurrent_report BEFORE INSERT ON avance_mensual
+        WHEN NEW.id_entidad = {hitos[0]} AND NEW.usuario = 'Ana'
+        BEGIN
+            INSERT INTO avance_mensual (entidad, id_entidad, mes, avance_reportado, usuario)
+            VALUES ('hito', {hitos[1]}, NEW.mes, 90, 'Otro');
+        END
+    """)
+    conn.commit()
+    conn.close()
+
+    result = db.registrar_avances_mensuales_bulk(
+        [
+            {'entidad': 'hito', 'id_entidad': hitos[0], 'avance_reportado': 20},
+            {'entidad': 'hito', 'id_entidad': hitos[1], 'avance_reportado': 40},
+            {'entidad': 'hito', 'id_entidad': hitos[2], 'avance_reportado': 60},
+        ],
+        usuario="Ana", mes="2025-05"
+    )
+
+    assert result['registrados'] == [{'entidad': 'hito', 'id_entidad': hitos[0]},
+                                     {'entidad': 'hito', 'id_entidad': hitos[2]}]
+    assert result['duplicados'] == [{'entidad': 'hito', 'id_entidad': hitos[1]}]
+    assert db.get_avance_mensual_actual('hito', hitos[1])['avance_reportado'] == 90
+    # The dropped item keeps its previous state
+    hito_2 = db.get_hitos_by_indicador(ind_1).iloc[1]
+    assert hito_2['estado'] == "Por comenzar"
+    assert hito_2['ultimo_avance_reportado'] == 0
+
+
+def test_batch_endpoint_maps_validation_errors_to_400(client, db, monkeypatch):
+    def invalid(*args, **kwargs):
+        raise ValueError("avance_reportado must be between 0 and 100")
+    monkeypatch.setattr(db, "registrar_avances_mensuales_bulk", invalid)
+
+    response = client.post("/api/avance-mensual/batch", json={
+        "mes": "2025-05", "reportes": [{"entidad": "hito", "id_entidad": 1, "avance_reportado": 50}]
+    })
+
+    assert response.status_code == 400
+    assert "avance_reportado" in response.json()['detail']
+
+
+def test_bulk_validates_before_writing(db):
+    _, hitos, _ = _seed(db)
+
+    with pytest.raises(ValueError):
+        db.registrar_avances_mensuales_bulk(
+            [
+                {'entidad': 'hito', 'id_entidad': hitos[0], 'avance_reportado': 50},
+                {'entidad': 'hito', 'id_entidad': hitos[1], 'avance_reportado': 150},
+            ],
+            mes="2025-05"
+        )
+
+    assert db.get_avance_mensual_actual('hito', hitos[0]) is None
+
+
+def test_bulk_handles_large_batches(db):
+    (ind_1, _), _, _ = _seed(db)
+    with db.unit_of_work() as uow:
+        hito_ids = [db.create_hito(indicador_id=ind_1, nombre=f"Extra {i}", uow=uow) for i in range(250)]
+
+    result = db.registrar_avances_mensuales_bulk(
+        [{'entidad': 'hito', 'id_entidad': h, 'avance_reportado': 100} for h in hito_ids],
+        mes="2025-06"
+    )
+
+    assert len(result['registrados']) == 250
+    assert (db.get_hitos_by_indicador(ind_1)['estado'] == "Completado").sum() == 250
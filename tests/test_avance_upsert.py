@@ -0,0 +1,74 @@
+"""
+Tests for Database.upsert_avance_mensual and its conflict modes
+"""
+
+import pytest
+
+
+@pytest.fixture
+def hito_id(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Upsert", tipo_indicador="Estratégico", tiene_hitos=True)
+    return db.create_hito(indicador_id=indicador_id, nombre="Hito")
+
+
+def _reportado(db, hito_id, mes="2025-01"):
+    return db.get_historico_avance_page('hito', hito_id)['items'].set_index('mes').loc[mes, 'avance_reportado']
+
+
+def test_reject_skips_a_reported_month(db, hito_id):
+    first = db.upsert_avance_mensual('hito', hito_id, 20, mes="2025-01")
+    again = db.upsert_avance_mensual('hito', hito_id, 50, mes="2025-01")
+
+    assert (first.status, first.avance_anterior) == ('inserted', None)
+    assert (again.status, again.avance_reportado, again.avance_anterior) == ('skipped', 20, 20)
+    assert db.registrar_avance_mensual('hito', hito_id, 50, mes="2025-01") is False
+    assert _reportado(db, hito_id) == 20
+
+
+def test_overwrite_replaces_the_report_and_the_estado(db, hito_id):
+    db.upsert_avance_mensual('hito', hito_id, 20, mes="2025-01")
+
+    result = db.upsert_avance_mensual('hito', hito_id, 100, mes="2025-01", on_conflict='overwrite', usuario="Admin")
+
+    assert (result.status, result.avance_reportado, result.avance_anterior) == ('updated', 100, 20)
+    assert _reportado(db, hito_id) == 100
+    hito = db.get_hitos_by_indicador(1).iloc[0]
+    assert (hito['estado'], hito['ultimo_avance']) == ("Completado", 100)
+
+
+def test_keep_latest_keeps_a_later_report(db, hito_id):
+    db.upsert_avance_mensual('hito', hito_id, 40, mes="2025-01", fecha_reporte="2025-02-03")
+
+    older = db.upsert_avance_mensual('hito', hito_id, 30, mes="2025-01", on_conflict='keep_latest', fecha_reporte="2025-02-01")
+    newer = db.upsert_avance_mensual('hito', hito_id, 45, mes="2025-01", on_conflict='keep_latest', fecha_reporte="2025-02-05")
+
+    assert (older.status, older.avance_reportado) == ('skipped', 40)
+    assert (newer.status, newer.avance_anterior) == ('updated', 40)
+    assert _reportado(db, hito_id) == 45
+
+
+def test_conflict_keeps_the_unit_of_work_usable(db, hito_id):
+    db.upsert_avance_mensual('hito', hito_id, 10, mes="2025-01")
+
+    with db.unit_of_work() as uow:
+        assert db.upsert_avance_mensual('hito', hito_id, 20, mes="2025-01", uow=uow).status == 'skipped'
+        assert db.upsert_avance_mensual('hito', hito_id, 30, mes="2025-02", uow=uow).status == 'inserted'
+
+    assert len(db.get_historico_avance_page('hito', hito_id)['items']) == 2
+
+
+def test_unknown_mode_is_rejected(db, hito_id):
+    with pytest.raises(ValueError):
+        db.upsert_avance_mensual('hito', hito_id, 10, on_conflict='merge')
+
+
+def test_api_reports_the_outcome(client, hito_id):
+    body = {"entidad": "hito", "id_entidad": hito_id, "avance_reportado": 30, "mes": "2025-01"}
+
+    created = client.post("/api/avance-mensual", json=body)
+    assert (created.status_code, created.json()["status"]) == (201, "inserted")
+    assert client.post("/api/avance-mensual", json=body).status_code == 400
+
+    updated = client.post("/api/avance-mensual", json={**body, "avance_reportado": 60, "on_conflict": "overwrite"})
+    assert updated.status_code == 200
+    assert (updated.json()["status"], updated.json()["avance_anterior"]) == ("updated", 30)
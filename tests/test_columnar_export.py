@@ -0,0 +1,73 @@
+"""
+Tests for Database.export_* and the ?format= columnar outputs of api.py
+"""
+
+import pytest
+
+
+def _seed(db):
+    indicador_id = db.create_indicador(
+        año=2025, indicador="Export", tipo_indicador="Estratégico", fecha_inicio="2025-01-15"
+    )
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito", orden=1)
+    db.registrar_avance_mensual('hito', hito_id, 10, mes="2025-01")
+    db.registrar_avance_mensual('hito', hito_id, 40, mes="2025-02")
+    return indicador_id, hito_id
+
+
+def test_export_columns_keeps_listing_order_and_filters(db):
+    _, hito_id = _seed(db)
+
+    columns = db.export_columns('avance_mensual', batch_size=1, entidad='hito', id_entidad=hito_id)
+
+    assert columns['mes'] == ["2025-01", "2025-02"]
+    assert columns['avance_reportado'] == [10, 40]
+    assert db.get_pool_stats()['in_use'] == 0
+
+
+def test_export_columns_without_rows_still_lists_the_columns(db):
+    columns = db.export_columns('actividades')
+
+    assert columns['descripcion_actividad'] == []
+    assert 'nombre_hito' in columns
+
+
+def test_unknown_entity_is_rejected(db):
+    with pytest.raises(ValueError):
+        db.export_columns('usuarios')
+
+
+def test_columnar_json_is_typed_like_the_json_listing(client, db):
+    _seed(db)
+
+    data = client.get("/api/indicadores?format=columnar-json").json()
+
+    assert data['indicador'] == ["Export"]
+    assert data['tiene_hitos'] == [False]
+    assert data['fecha_inicio'] == ["2025-01-15"]
+
+
+def test_arrow_and_parquet_outputs(client, db):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    _, hito_id = _seed(db)
+
+    response = client.get("/api/indicadores?format=arrow")
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.schema.field('fecha_inicio').type == pa.date32()
+    assert table.schema.field('tiene_hitos').type == pa.bool_()
+
+    response = client.get(f"/api/avance-mensual/hito/{hito_id}/historico?format=parquet")
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    table = pq.read_table(pa.BufferReader(response.content))
+    assert table.column('avance_reportado').to_pylist() == [10, 40]
+
+
+def test_arrow_without_pyarrow_is_not_implemented(client, db, monkeypatch):
+    import src.database
+
+    monkeypatch.setattr(src.database, "ARROW_AVAILABLE", False)
+
+    assert client.get("/api/hitos?format=parquet").status_code == 501
+    assert client.get("/api/hitos?format=columnar-json").status_code == 200
@@ -1,16 +1,13 @@
 """
-Script de prueba para crear un indicador y ver el error exacto
+Prueba de creación de un indicador (antes un script para ver el error exacto)
 """
 
-from database import Database
+from src.database import Database
 
-# Crear instancia de database
-db = Database()
 
-print("Intentando crear un indicador de prueba...")
-print()
+def test_create_indicador(tmp_path):
+    db = Database(db_path=str(tmp_path / "create.db"))
 
-try:
     record_id = db.create_indicador(
         año=2026,
         indicador="Test Indicador",
@@ -20,8 +17,9 @@ try:
         tiene_hitos=True,
         tiene_actividades=False
     )
-    print(f"✅ Indicador creado exitosamente con ID: {record_id}")
-except Exception as e:
-    print(f"❌ ERROR: {e}")
-    import traceback
-    traceback.print_exc()
+
+    indicador = db.get_indicador_by_id(record_id)
+    assert indicador['indicador'] == "Test Indicador"
+    assert indicador['responsable'] == "Test User"
+    assert bool(indicador['tiene_hitos']) is True
+    db.close()
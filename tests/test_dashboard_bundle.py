@@ -0,0 +1,44 @@
+"""
+Tests for Database.get_dashboard_bundle()
+"""
+
+from src.database import FACET_COLUMNS
+
+
+def test_bundle_matches_individual_queries(db):
+    for año, area, responsable in [(2025, "B", "Ana"), (2026, "A", None), (2025, "A", "Luis")]:
+        db.create_indicador(año=año, indicador=f"{area}{año}", tipo_indicador="Estratégico",
+                            area=area, responsable=responsable)
+
+    bundle = db.get_dashboard_bundle()
+
+    assert bundle['stats'] == db.get_summary_stats()
+    assert bundle['stats']['total'] == 3
+    for column in FACET_COLUMNS:
+        assert bundle['facets'][column] == db.get_unique_values(column)
+    assert bundle['facets']['año'] == [2025, 2026]
+
+
+def test_bundle_on_empty_database(db):
+    bundle = db.get_dashboard_bundle()
+
+    assert bundle['stats']['total'] == 0
+    assert bundle['stats']['avg_avance'] == 0
+    assert all(values == [] for values in bundle['facets'].values())
+
+
+def test_bundle_uses_two_queries_on_one_connection(db):
+    conn = db.get_connection()
+    raw = conn.raw
+    conn.close()
+    statements = []
+    checkouts_before = db.get_pool_stats()['checkouts']
+
+    raw.set_trace_callback(statements.append)
+    try:
+        db.get_dashboard_bundle()
+    finally:
+        raw.set_trace_callback(None)
+
+    assert db.get_pool_stats()['checkouts'] - checkouts_before == 1
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) == 2
@@ -0,0 +1,51 @@
+"""
+Tests for the data_version counters shared across processes
+"""
+
+import pytest
+
+from src.database import Database, DATA_VERSION_ENTITIES
+
+
+def test_counters_start_at_zero(db):
+    assert db.get_data_version() == {entity: 0 for entity in DATA_VERSION_ENTITIES}
+
+
+def test_writes_bump_their_entities(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico")
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito")
+    db.registrar_avance_mensual('hito', hito_id, 30, mes="2025-01")
+
+    assert db.get_data_version() == {
+        'indicadores': 1,
+        'hitos': 2,
+        'actividades': 1,
+        'avance_mensual': 1,
+    }
+
+
+def test_unit_of_work_bumps_once_and_rolls_back_with_the_write(db):
+    with db.unit_of_work() as uow:
+        for n in range(3):
+            db.create_indicador(año=2025, indicador=f"Ind {n}", tipo_indicador="Estratégico", uow=uow)
+    assert db.get_data_version()['indicadores'] == 1
+
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work() as uow:
+            db.create_indicador(año=2025, indicador="Perdido", tipo_indicador="Estratégico", uow=uow)
+            raise RuntimeError("boom")
+    assert db.get_data_version()['indicadores'] == 1
+
+
+def test_cache_sees_writes_from_another_process(tmp_path):
+    path = str(tmp_path / "shared.db")
+    streamlit = Database(db_path=path, read_cache_size=8)
+    api = Database(db_path=path)
+
+    assert len(streamlit.get_all_indicadores()) == 0
+    api.create_indicador(año=2025, indicador="Desde la API", tipo_indicador="Estratégico")
+
+    assert len(streamlit.get_all_indicadores()) == 1
+    assert streamlit.get_cache_stats()['invalidations'] == 1
+    streamlit.close()
+    api.close()
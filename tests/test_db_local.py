@@ -1,26 +1,34 @@
-from database import Database
+from src.database import Database
 import pandas as pd
 
-def test_local():
+def test_local(tmp_path):
     print("Testing locally with SQLite...")
-    db = Database()
+    db = Database(db_path=str(tmp_path / "local.db"))
+    db.create_indicador(año=2025, indicador="Indicador local", tipo_indicador="Estratégico", area="Área 1")
     
     # Test get_unique_values
     print("\nTesting get_unique_values('area')...")
     areas = db.get_unique_values('area')
     print(f"Areas found: {areas}")
     assert isinstance(areas, list)
+    assert areas == ["Área 1"]
     
     # Test get_all_indicadores
     print("\nTesting get_all_indicadores()...")
     df = db.get_all_indicadores()
     print(f"DataFrame shape: {df.shape}")
     print(f"Columns: {df.columns.tolist()}")
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 1
     
     if not df.empty:
         print(f"First row ID: {df.iloc[0]['id']} (Type: {type(df.iloc[0]['id'])})")
     
+    db.close()
     print("\n✅ Tests passed!")
 
 if __name__ == "__main__":
-    test_local()
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_local(pathlib.Path(tmp))
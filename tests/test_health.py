@@ -0,0 +1,77 @@
+"""
+Tests for the liveness and readiness probes
+"""
+
+from src.database import SCHEMA_VERSION, Database
+
+
+def test_ping_reports_timings_and_schema_version(tmp_path):
+    database = Database(db_path=str(tmp_path / "ping.db"))
+
+    probe = database.ping()
+
+    assert probe['schema_version'] == probe['expected_schema_version'] == SCHEMA_VERSION
+    assert probe['latency_ms'] >= probe['query_ms'] >= 0
+    assert database.get_pool_stats()['in_use'] == 0
+    database.close()
+
+
+def test_liveness_never_touches_the_database(client, db, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("database down")
+    monkeypatch.setattr(db, "ping", broken)
+
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json()['status'] == "alive"
+    assert response.headers['cache-control'] == "no-store"
+
+
+def test_readiness_reports_latency_schema_and_pool(client):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['status'] == "ready"
+    assert body['problems'] == []
+    assert body['schema'] == {"version": SCHEMA_VERSION, "expected": SCHEMA_VERSION}
+    assert body['database']['latency_ms'] <= body['database']['budget_ms']
+    assert body['pool']['in_use'] == 0
+    assert response.headers['cache-control'] == "no-store"
+
+
+def test_readiness_fails_when_database_is_unreachable(client, db, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("database down")
+    monkeypatch.setattr(db, "ping", broken)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert "database down" in response.json()['problems'][0]
+
+    legacy = client.get("/health")
+    assert legacy.status_code == 503
+    assert legacy.json()['status'] == "unhealthy"
+
+
+def test_readiness_fails_over_latency_budget(client, api_module, monkeypatch):
+    monkeypatch.setattr(api_module, "HEALTH_LATENCY_BUDGET_MS", 0.0)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()['status'] == "not_ready"
+
+
+def test_readiness_fails_on_schema_mismatch(client, db):
+    conn = db.get_connection()
+    conn.execute("DELETE FROM schema_version")
+    conn.commit()
+    conn.close()
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()['schema']['version'] is None
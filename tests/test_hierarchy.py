@@ -0,0 +1,61 @@
+"""
+Tests for Database.load_hierarchy
+"""
+
+
+def _seed(db, hitos_por_indicador=3, actividades_por_hito=2):
+    ids = []
+    with db.unit_of_work() as uow:
+        for n in range(2):
+            indicador_id = db.create_indicador(
+                año=2025, indicador=f"Ind {n}", tipo_indicador="Regular", tiene_hitos=True, uow=uow
+            )
+            ids.append(indicador_id)
+            for h in range(hitos_por_indicador):
+                hito_id = db.create_hito(indicador_id=indicador_id, nombre=f"H{n}.{h}", orden=h, uow=uow)
+                for a in range(actividades_por_hito):
+                    db.create_actividad(hito_id=hito_id, descripcion_actividad=f"A{n}.{h}.{a}", uow=uow)
+    return ids
+
+
+def _count_statements(db, func):
+    """Count SQL statements issued on this thread's pooled SQLite connection"""
+    statements = []
+    conn = db.get_connection()
+    raw = conn.raw
+    conn.close()
+    raw.set_trace_callback(statements.append)
+    try:
+        result = func()
+    finally:
+        raw.set_trace_callback(None)
+    return result, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_load_hierarchy_builds_tree(db):
+    ids = _seed(db)
+    hito_id = db.get_hitos_by_indicador(ids[1]).iloc[0]['id']
+    actividad_id = db.get_actividades_by_hito(int(hito_id)).iloc[0]['id']
+    db.registrar_avance_mensual('actividad', int(actividad_id), 35, mes="2025-02")
+
+    tree = db.load_hierarchy([ids[1], ids[0]])
+
+    assert [ind['id'] for ind in tree] == [ids[1], ids[0]]
+    assert [h['nombre'] for h in tree[0]['hitos']] == ["H1.0", "H1.1", "H1.2"]
+    assert len(tree[0]['hitos'][0]['actividades']) == 2
+    assert tree[0]['hitos'][0]['actividades'][0]['ultimo_avance_reportado'] == 35
+
+
+def test_load_hierarchy_query_count_is_constant(db):
+    _seed(db, hitos_por_indicador=2, actividades_por_hito=1)
+    _, small = _count_statements(db, lambda: db.load_hierarchy())
+
+    _seed(db, hitos_por_indicador=15, actividades_por_hito=4)
+    tree, large = _count_statements(db, lambda: db.load_hierarchy())
+
+    assert len(tree) == 4
+    assert len(small) == len(large) == 3
+
+
+def test_load_hierarchy_empty_ids(db):
+    assert db.load_hierarchy([]) == []
@@ -0,0 +1,42 @@
+"""
+Tests for the secondary indexes created by Database.init_db
+"""
+
+from src.database import Database, INDEXES
+
+
+def test_init_db_creates_indexes(tmp_path):
+    db = Database(db_path=str(tmp_path / "indexes.db"))
+
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing = {row['name'] for row in cursor.fetchall()}
+    conn.close()
+
+    assert {name for name, _, _ in INDEXES} <= existing
+
+
+def test_hot_queries_use_their_index(tmp_path):
+    db = Database(db_path=str(tmp_path / "indexes.db"))
+
+    results = db.verify_indexes()
+
+    assert results
+    assert [r['name'] for r in results if not r['used']] == []
+
+
+def test_hitos_keyset_page_is_read_in_index_order(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Ind", tipo_indicador="Regular", tiene_hitos=True)
+    for orden in (2, None, 1, None):
+        db.create_hito(indicador_id=indicador_id, nombre=f"Hito {orden}", orden=orden)
+
+    plans = {r['name']: r['plan'] for r in db.verify_indexes()}
+    first = db.get_hitos_page(indicador_id, limit=2, as_records=True)
+    rest = db.get_hitos_page(indicador_id, limit=2, cursor=first['next_cursor'], as_records=True)
+    paged = first['items'] + rest['items']
+
+    assert "TEMP B-TREE" not in plans['hitos_pagina']
+    assert [hito['orden'] for hito in paged] == [None, None, 1, 2]
+    # Unpaginated reads order NULL orden the same way on every backend
+    assert list(db.get_hitos_by_indicador(indicador_id)['id']) == [hito['id'] for hito in paged]
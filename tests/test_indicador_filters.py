@@ -0,0 +1,47 @@
+"""
+Tests for the SQL filters of Database.get_all_indicadores()
+"""
+
+import pytest
+
+
+@pytest.fixture
+def db(db):
+    rows = [
+        ("A", 2024, "Ana", "2024-01-10", "2024-06-30"),
+        ("A", 2025, "Luis", "2025-02-01", "2025-12-31"),
+        ("B", 2025, "Ana", "2025-03-15", "2025-09-30"),
+        ("C", 2025, "Eva", "2025-04-01", "2026-03-31"),
+    ]
+    for area, año, responsable, inicio, fin in rows:
+        db.create_indicador(
+            año=año, indicador=f"{area}-{responsable}", tipo_indicador="Estratégico",
+            area=area, responsable=responsable,
+            fecha_inicio=inicio, fecha_fin_original=fin, fecha_fin_actual=fin
+        )
+    return db
+
+
+def test_filters_by_responsable(db):
+    df = db.get_all_indicadores(responsable="Ana")
+    assert sorted(df['indicador']) == ["A-Ana", "B-Ana"]
+
+
+def test_list_filters_become_in_clauses(db):
+    df = db.get_all_indicadores(area=["A", "C"], año=[2025])
+    assert sorted(df['indicador']) == ["A-Luis", "C-Eva"]
+
+    assert len(db.get_all_indicadores(area=[])) == 4
+
+
+def test_date_ranges(db):
+    df = db.get_all_indicadores(fecha_fin_desde="2025-01-01", fecha_fin_hasta="2025-12-31")
+    assert sorted(df['indicador']) == ["A-Luis", "B-Ana"]
+
+    df = db.get_all_indicadores(fecha_inicio_desde="2025-03-01")
+    assert sorted(df['indicador']) == ["B-Ana", "C-Eva"]
+
+
+def test_estado_sets(db):
+    assert len(db.get_all_indicadores(estado=["Por comenzar", "Completado"])) == 4
+    assert len(db.get_all_indicadores(estado=["Completado"])) == 0
@@ -0,0 +1,76 @@
+"""
+Tests for src/metrics.py and the /metrics endpoint
+"""
+
+import pytest
+
+from src.database import Database
+from src.metrics import RequestMetrics, metric
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(db_path=str(tmp_path / "metrics.db"), read_cache_size=8)
+    yield database
+    database.close()
+
+
+def _samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#"))
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        metrics.started()
+        metrics.finished("GET", "/x", 200, seconds)
+
+    samples = _samples("\n".join(metrics.render()))
+
+    assert samples['http_request_duration_seconds_bucket{method="GET",route="/x",le="0.1"}'] == "2"
+    assert samples['http_request_duration_seconds_bucket{method="GET",route="/x",le="1"}'] == "3"
+    assert samples['http_request_duration_seconds_bucket{method="GET",route="/x",le="+Inf"}'] == "4"
+    assert samples['http_requests_in_flight'] == "0"
+
+
+def test_label_values_are_escaped():
+    lines = metric("q", "gauge", "help", [("", {"fingerprint": 'WHERE a = "x"\n'}, 1)])
+
+    assert lines[-1] == 'q{fingerprint="WHERE a = \\"x\\"\\n"} 1'
+
+
+def test_metrics_endpoint_covers_requests_pool_queries_and_cache(client, db):
+    indicador_id = db.create_indicador(año=2025, indicador="Metrics", tipo_indicador="Estratégico")
+    route = '/api/indicadores/{indicador_id}'
+    ok = f'http_requests_total{{method="GET",route="{route}",status="200"}}'
+    not_found = f'http_requests_total{{method="GET",route="{route}",status="404"}}'
+    before = _samples(client.get("/metrics").text)
+
+    client.get(f"/api/indicadores/{indicador_id}")
+    client.get("/api/indicadores/999999")
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+    assert int(samples[ok]) - int(before.get(ok, 0)) == 1
+    assert int(samples[not_found]) - int(before.get(not_found, 0)) == 1
+    assert samples['http_requests_in_flight'] == "1"  # the /metrics request itself
+    assert any(key.startswith('db_pool_connections{kind="thread_local",state="in_use"}') for key in samples)
+    assert 'db_query_duration_seconds_count{fingerprint="SELECT * FROM indicadores WHERE id = ?"}' in samples
+    assert 'db_read_cache_hit_ratio' in samples
+
+
+def test_metrics_do_not_queue_behind_the_database_threads(client, api_module, monkeypatch):
+    queued = []
+    run = api_module.db._run
+
+    async def recorded(func, *args, **kwargs):
+        queued.append(func)
+        return await run(func, *args, **kwargs)
+    monkeypatch.setattr(api_module.db, "_run", recorded)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert queued == []
+    assert "db_pool_checkouts_total" in response.text
@@ -0,0 +1,100 @@
+"""
+Tests for keyset pagination in Database and the list endpoints
+"""
+
+import pytest
+
+
+def _seed_indicadores(db, count):
+    return [
+        db.create_indicador(año=2025, indicador=f"Indicador {i}", tipo_indicador="Estratégico",
+                            area="A" if i % 2 else "B")
+        for i in range(count)
+    ]
+
+
+def _walk(fetch):
+    """Follow next_cursor until the last page, returning all items and the page count"""
+    items, pages, cursor = [], 0, None
+    while True:
+        page = fetch(cursor)
+        items.extend(page['items'].to_dict('records'))
+        pages += 1
+        cursor = page['next_cursor']
+        if cursor is None:
+            return items, pages
+
+
+def test_indicadores_pages_cover_every_row_once(db):
+    ids = _seed_indicadores(db, 7)
+
+    items, pages = _walk(lambda cursor: db.get_indicadores_page(limit=3, cursor=cursor))
+
+    assert pages == 3
+    assert [row['id'] for row in items] == list(db.get_all_indicadores()['id'])
+    assert sorted(row['id'] for row in items) == sorted(ids)
+
+
+def test_indicadores_page_with_filters_and_total(db):
+    _seed_indicadores(db, 6)
+
+    page = db.get_indicadores_page(limit=2, sort='id', descending=False, with_total=True, area="A")
+    assert page['total'] == 3
+    assert list(page['items']['id']) == sorted(page['items']['id'])
+    assert set(page['items']['area']) == {"A"}
+
+    rest = db.get_indicadores_page(limit=2, cursor=page['next_cursor'], sort='id', descending=False, area="A")
+    assert len(rest['items']) == 1
+    assert rest['next_cursor'] is None
+
+
+def test_cursor_is_bound_to_its_sort(db):
+    _seed_indicadores(db, 3)
+    page = db.get_indicadores_page(limit=1)
+
+    with pytest.raises(ValueError):
+        db.get_indicadores_page(limit=1, cursor=page['next_cursor'], sort='id')
+    with pytest.raises(ValueError):
+        db.get_indicadores_page(limit=1, cursor="not-a-cursor")
+
+
+def test_hitos_and_historico_pages(db):
+    indicador_id = _seed_indicadores(db, 1)[0]
+    hito_ids = [db.create_hito(indicador_id=indicador_id, nombre=f"Hito {i}", orden=i) for i in range(5)]
+    for month in range(1, 6):
+        db.registrar_avance_mensual('hito', hito_ids[0], month * 10, mes=f"2025-{month:02d}")
+
+    hitos, pages = _walk(lambda cursor: db.get_hitos_page(indicador_id, limit=2, cursor=cursor))
+    assert pages == 3
+    assert [row['id'] for row in hitos] == hito_ids
+    assert hitos[0]['ultimo_avance_reportado'] == 50
+
+    historico, _ = _walk(lambda cursor: db.get_historico_avance_page('hito', hito_ids[0], limit=2, cursor=cursor))
+    assert [row['mes'] for row in historico] == [f"2025-{m:02d}" for m in range(1, 6)]
+
+
+def test_all_hitos_and_actividades_listings(db):
+    first, second = _seed_indicadores(db, 2)
+    hito_a = db.create_hito(indicador_id=first, nombre="Hito A", responsable="Ana",
+                            fecha_fin_planificada="2025-03-31")
+    hito_b = db.create_hito(indicador_id=second, nombre="Hito B", responsable="Luis",
+                            fecha_fin_planificada="2025-09-30")
+    for hito_id in (hito_a, hito_b):
+        db.create_actividad(hito_id=hito_id, descripcion_actividad="Actividad", responsable="Ana")
+    db.registrar_avance_mensual('hito', hito_b, 60, mes="2025-01")
+
+    todos = db.get_all_hitos(with_total=True)
+    assert todos['total'] == 2
+    assert list(todos['items']['id']) == [hito_a, hito_b]
+
+    hitos = db.get_all_hitos(fecha_fin_desde="2025-06-01")['items']
+    assert list(hitos['id']) == [hito_b]
+    assert hitos['ultimo_avance_reportado'].iloc[0] == 60
+    assert hitos['estado'].iloc[0] == "En progreso"
+
+    assert len(db.get_all_hitos(responsable=["Ana", "Luis"], limit=1)['items']) == 1
+
+    actividades = db.get_all_actividades(indicador_id=second)['items']
+    assert list(actividades['hito_id']) == [hito_b]
+    assert actividades['nombre_hito'].iloc[0] == "Hito B"
+    assert len(db.get_all_actividades(responsable="Ana")['items']) == 2
@@ -0,0 +1,107 @@
+"""
+Tests for the connection pools in src/pool.py
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.database import Database
+from src.pool import ConnectionPool, ThreadLocalConnectionPool, PoolTimeout
+
+
+def _sqlite_connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def test_bounded_pool_reuses_connections():
+    pool = ConnectionPool(_sqlite_connect, min_size=1, max_size=2, timeout=0.1)
+
+    first = pool.connection()
+    raw = first.raw
+    first.close()
+
+    second = pool.connection()
+    assert second.raw is raw
+    second.close()
+
+    stats = pool.stats()
+    assert stats.size == 1
+    assert stats.in_use == 0
+    assert stats.idle == 1
+    assert stats.checkouts == 2
+
+
+def test_bounded_pool_times_out_when_exhausted():
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=1, timeout=0.05)
+    held = pool.connection()
+
+    with pytest.raises(PoolTimeout):
+        pool.connection()
+
+    assert pool.stats().timeouts == 1
+    held.close()
+    pool.connection().close()
+
+
+def test_bounded_pool_wakes_up_waiters():
+    pool = ConnectionPool(_sqlite_connect, min_size=0, max_size=1, timeout=2)
+    held = pool.connection()
+    acquired = []
+
+    def worker():
+        conn = pool.connection()
+        acquired.append(conn.raw)
+        conn.close()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    held.close()
+    thread.join(2)
+
+    assert len(acquired) == 1
+    assert pool.stats().size == 1
+
+
+def test_bounded_pool_discards_unhealthy_connections():
+    pool = ConnectionPool(
+        _sqlite_connect, min_size=1, max_size=1, timeout=0.1,
+        check=lambda conn: False, check_interval=0
+    )
+    conn = pool.connection()
+    conn.close()
+
+    assert pool.stats().discarded >= 1
+    assert pool.stats().size == 1
+
+
+def test_thread_local_pool_overflows_on_nested_checkout():
+    pool = ThreadLocalConnectionPool(_sqlite_connect)
+
+    outer = pool.connection()
+    inner = pool.connection()
+    assert inner.raw is not outer.raw
+    assert pool.stats().in_use == 2
+
+    inner.close()
+    outer.close()
+
+    again = pool.connection()
+    assert again.raw is not None
+    assert pool.stats().in_use == 1
+    again.close()
+    assert pool.stats().idle == 1
+
+
+def test_database_connections_are_pooled(tmp_path):
+    db = Database(db_path=str(tmp_path / "pool.db"))
+
+    db.get_all_indicadores()
+    db.get_unique_values('area')
+    db.get_summary_stats()
+
+    stats = db.get_pool_stats()
+    assert stats['kind'] == 'thread_local'
+    assert stats['in_use'] == 0
+    assert stats['size'] == 1
@@ -0,0 +1,177 @@
+"""
+Query budgets for the API: SQL statements and pooled connections per request
+
+Every route must declare a budget here, and reads must issue the same number
+of statements whatever the amount of data (N+1 guard).
+"""
+
+import pytest
+from fastapi.routing import APIRoute
+
+from src.database import Database
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+# (method, route, url, request kwargs, max statements, max connections)
+# url placeholders and callable kwargs are filled with the seeded IDs.
+# No connection is held across awaits: the ETag check of conditional GETs
+# and the read itself check out one connection each.
+REQUESTS = [
+    ("GET", "/", "/", {}, 0, 0),
+    ("GET", "/api/indicadores", "/api/indicadores", {}, 2, 2),
+    ("GET", "/api/indicadores", "/api/indicadores", {"headers": NDJSON}, 2, 2),
+    ("GET", "/api/indicadores/{indicador_id}", "/api/indicadores/{indicador_id}", {}, 2, 2),
+    ("GET", "/api/indicadores/{indicador_id}/jerarquia", "/api/indicadores/{indicador_id}/jerarquia", {}, 4, 2),
+    ("GET", "/api/hitos", "/api/hitos", {}, 2, 2),
+    ("GET", "/api/indicadores/{indicador_id}/hitos", "/api/indicadores/{indicador_id}/hitos", {}, 2, 2),
+    ("GET", "/api/actividades", "/api/actividades", {}, 2, 2),
+    ("GET", "/api/hitos/{hito_id}/actividades", "/api/hitos/{hito_id}/actividades", {}, 2, 2),
+    ("GET", "/api/avance-mensual", "/api/avance-mensual", {}, 2, 2),
+    ("GET", "/api/avance-mensual", "/api/avance-mensual", {"headers": NDJSON}, 2, 2),
+    ("GET", "/api/avance-mensual/{entidad}/{id_entidad}", "/api/avance-mensual/hito/{hito_id}", {}, 2, 2),
+    ("GET", "/api/avance-mensual/{entidad}/{id_entidad}/historico",
+     "/api/avance-mensual/hito/{hito_id}/historico", {}, 2, 2),
+    ("GET", "/api/dashboard", "/api/dashboard", {}, 3, 2),
+    ("GET", "/api/dashboard/stats", "/api/dashboard/stats", {}, 2, 2),
+    ("GET", "/api/seguimiento/responsable/{responsable}", "/api/seguimiento/responsable/Responsable 0", {}, 3, 2),
+    ("GET", "/api/responsables", "/api/responsables", {}, 2, 2),
+    ("GET", "/api/areas", "/api/areas", {}, 2, 2),
+    ("GET", "/api/unidades-organizacionales", "/api/unidades-organizacionales", {}, 2, 2),
+    ("GET", "/api/años", "/api/años", {}, 2, 2),
+    ("GET", "/api/tipos-indicador", "/api/tipos-indicador", {}, 2, 2),
+    ("POST", "/api/indicadores", "/api/indicadores", {"json": lambda ids: {
+        "año": 2025, "indicador": "Nuevo", "tipo_indicador": "Estratégico", "tiene_hitos": True}}, 3, 1),
+    ("POST", "/api/hitos", "/api/hitos", {"json": lambda ids: {
+        "indicador_id": ids['indicador_id'], "nombre": "Nuevo hito"}}, 3, 1),
+    ("POST", "/api/actividades", "/api/actividades", {"json": lambda ids: {
+        "hito_id": ids['hito_id'], "descripcion_actividad": "Nueva actividad"}}, 3, 1),
+    ("POST", "/api/avance-mensual", "/api/avance-mensual", {"json": lambda ids: {
+        "entidad": "actividad", "id_entidad": ids['actividad_id'], "avance_reportado": 40, "mes": "2025-09"}}, 4, 1),
+    ("POST", "/api/avance-mensual/batch", "/api/avance-mensual/batch", {"json": lambda ids: {
+        "mes": "2025-10",
+        "reportes": [{"entidad": "hito", "id_entidad": hito_id, "avance_reportado": 50} for hito_id in ids['hitos']]
+                    + [{"entidad": "actividad", "id_entidad": actividad_id, "avance_reportado": 50}
+                       for actividad_id in ids['actividades']]}}, 11, 1),
+    ("DELETE", "/api/indicadores/{indicador_id}", "/api/indicadores/{indicador_id}", {}, 3, 1),
+    ("DELETE", "/api/hitos/{hito_id}", "/api/hitos/{hito_id}", {}, 7, 1),
+    ("DELETE", "/api/actividades/{actividad_id}", "/api/actividades/{actividad_id}", {}, 3, 1),
+    ("GET", "/health/live", "/health/live", {}, 0, 0),
+    ("GET", "/health/ready", "/health/ready", {}, 3, 1),
+    ("GET", "/health", "/health", {}, 3, 1),
+    ("GET", "/metrics", "/metrics", {}, 0, 0),
+    ("GET", "/debug/queries", "/debug/queries", {}, 0, 0),
+    ("DELETE", "/debug/queries", "/debug/queries", {}, 0, 0),
+]
+
+
+def _request_id(request):
+    method, route, url, kwargs = request[:4]
+    return f"{method} {url}" + (" (ndjson)" if kwargs.get("headers") == NDJSON else "")
+
+
+def _seed(db, indicadores=2, hitos=2, actividades=1, meses=1):
+    """Synthetic hierarchy; returns the first IDs and every hito/actividad ID"""
+    ids = {'hitos': [], 'actividades': []}
+    with db.unit_of_work() as uow:
+        for n in range(indicadores):
+            indicador_id = db.create_indicador(
+                año=2025, indicador=f"Indicador {n}", tipo_indicador="Estratégico", area=f"Área {n % 2}",
+                unidad_organizacional="Unidad", responsable=f"Responsable {n % 2}", tiene_hitos=True, uow=uow
+            )
+            ids.setdefault('indicador_id', indicador_id)
+            for h in range(hitos):
+                hito_id = db.create_hito(indicador_id=indicador_id, nombre=f"Hito {n}.{h}", orden=h, uow=uow)
+                ids['hitos'].append(hito_id)
+                for a in range(actividades):
+                    ids['actividades'].append(db.create_actividad(
+                        hito_id=hito_id, descripcion_actividad=f"Actividad {n}.{h}.{a}",
+                        responsable=f"Responsable {n % 2}", uow=uow
+                    ))
+    ids['hito_id'], ids['actividad_id'] = ids['hitos'][0], ids['actividades'][0]
+    for m in range(meses):
+        db.registrar_avance_mensual('hito', ids['hito_id'], 10 * (m + 1), mes=f"2025-{m + 1:02d}")
+    return ids
+
+
+def _client(serve, path, **sizes):
+    database = Database(db_path=str(path), query_stats=True)
+    return serve(database), database, _seed(database, **sizes)
+
+
+def _measure(client, database, ids, method, url, kwargs):
+    """Send a request; returns (response, SQL statements, connection checkouts)"""
+    kwargs = {key: value(ids) if callable(value) else value for key, value in kwargs.items()}
+    queries = database.query_stats.total_queries()
+    checkouts = database.get_pool_stats()['checkouts']
+
+    response = client.request(method, url.format(**ids), **kwargs)
+
+    after = database.query_stats.total_queries()
+    # DELETE /debug/queries resets the counter mid-request
+    statements = after - queries if after >= queries else after
+    return response, statements, database.get_pool_stats()['checkouts'] - checkouts
+
+
+def test_every_route_has_a_budget(api_module):
+    routes = {
+        (method, route.path)
+        for route in api_module.app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+    assert routes == {(method, route) for method, route, *_ in REQUESTS}
+
+
+@pytest.mark.parametrize("request_", REQUESTS, ids=[_request_id(r) for r in REQUESTS])
+def test_request_stays_within_budget(serve, tmp_path, request_):
+    method, route, url, kwargs, max_statements, max_connections = request_
+    client, database, ids = _client(serve, tmp_path / "budget.db")
+
+    response, statements, connections = _measure(client, database, ids, method, url, kwargs)
+
+    assert response.status_code < 400, response.text
+    assert statements <= max_statements, f"{statements} SQL statements (budget {max_statements})"
+    assert connections <= max_connections, f"{connections} connections (budget {max_connections})"
+
+
+def test_reads_do_not_grow_with_data(serve, tmp_path):
+    reads = [r for r in REQUESTS if r[0] == "GET"]
+    counts = {}
+    for name, sizes in (("small", dict(indicadores=2, hitos=2, actividades=1, meses=1)),
+                        ("large", dict(indicadores=12, hitos=8, actividades=3, meses=6))):
+        client, database, ids = _client(serve, tmp_path / f"{name}.db", **sizes)
+        for method, route, url, kwargs, *_ in reads:
+            _, statements, connections = _measure(client, database, ids, method, url, kwargs)
+            counts.setdefault(_request_id((method, route, url, kwargs)), []).append((statements, connections))
+
+    grown = {request: (small, large) for request, (small, large) in counts.items() if small != large}
+    assert grown == {}
+
+
+def test_jerarquia_is_constant_in_hito_count(serve, tmp_path):
+    statements = []
+    for hitos in (1, 40):
+        client, database, ids = _client(serve, tmp_path / f"jerarquia_{hitos}.db",
+                                         indicadores=1, hitos=hitos, actividades=3)
+        response, count, connections = _measure(
+            client, database, ids, "GET", "/api/indicadores/{indicador_id}/jerarquia", {}
+        )
+        assert len(response.json()['hitos']) == hitos
+        assert connections == 2
+        statements.append(count)
+
+    assert statements[0] == statements[1]
+
+
+def test_batch_report_is_constant_in_item_count(serve, tmp_path):
+    """Set-based up to one chunk (100 items); indicators are recomputed together"""
+    batch = next(r for r in REQUESTS if r[2] == "/api/avance-mensual/batch")
+    statements = []
+    for indicadores in (1, 10):
+        client, database, ids = _client(serve, tmp_path / f"batch_{indicadores}.db",
+                                         indicadores=indicadores, hitos=5, actividades=1)
+        response, count, _ = _measure(client, database, ids, "POST", batch[2], batch[3])
+        assert len(response.json()['indicadores_actualizados']) == indicadores
+        statements.append(count)
+
+    assert statements[0] == statements[1]
@@ -0,0 +1,80 @@
+"""
+Tests for the query instrumentation (src/instrumentation.py and Database.get_query_stats)
+"""
+
+import pytest
+
+from src.database import Database
+from src.instrumentation import fingerprint, redact
+
+
+@pytest.fixture
+def db(db):
+    db.reset_query_stats()
+    return db
+
+
+def _seed(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Stats", tipo_indicador="Estratégico")
+    db.create_hito(indicador_id=indicador_id, nombre="Hito")
+    return indicador_id
+
+
+def test_fingerprint_groups_queries_that_differ_only_in_values():
+    assert fingerprint("SELECT *  FROM t\n WHERE id = ? AND x IN (?, ?, ?)") == "SELECT * FROM t WHERE id = ? AND x IN (?+)"
+    assert fingerprint("SELECT * FROM t WHERE id = %s AND x IN (%s)") == "SELECT * FROM t WHERE id = ? AND x IN (?+)"
+    assert fingerprint("INSERT INTO t VALUES (?, ?), (?, ?), (?, ?)") == "INSERT INTO t VALUES (?+), ..."
+    assert fingerprint("SELECT * FROM t WHERE name = 'Ana' LIMIT 10") == "SELECT * FROM t WHERE name = ? LIMIT ?"
+
+
+def test_parameters_are_redacted():
+    assert redact(["secreto", 42, None, 1.5]) == ["<str:7>", "<int>", None, "<float>"]
+
+
+def test_queries_are_labelled_with_the_calling_method(db):
+    indicador_id = _seed(db)
+    db.reset_query_stats()
+
+    db.get_indicador_by_id(indicador_id)
+    list(db.stream_hitos())
+
+    queries = {q['fingerprint']: q for q in db.get_query_stats()['queries']}
+    by_id = queries["SELECT * FROM indicadores WHERE id = ?"]
+    assert (by_id['count'], by_id['rows'], by_id['methods']) == (1, 1, {'get_indicador_by_id': 1})
+    streamed = [q for q in queries.values() if q['methods'] == {'stream_hitos': 1}]
+    assert streamed and streamed[0]['rows'] == 1
+
+
+def test_slow_queries_are_logged_without_values(tmp_path, monkeypatch):
+    monkeypatch.setenv('DB_SLOW_QUERY_MS', '0')
+    monkeypatch.setenv('DB_SLOW_QUERY_LOG_SIZE', '3')
+    database = Database(db_path=str(tmp_path / "slow.db"))
+
+    database.get_all_indicadores(responsable="Ana María")
+
+    stats = database.get_query_stats(sort='count')
+    assert len(stats['slow']) == 3
+    assert stats['slow'][-1]['method'] == 'get_all_indicadores'
+    assert stats['slow'][-1]['params'] == ["<str:9>"]
+    assert stats['acquire']['count'] >= 1
+    database.close()
+
+
+def test_instrumentation_can_be_disabled(tmp_path):
+    database = Database(db_path=str(tmp_path / "off.db"), query_stats=False)
+    _seed(database)
+
+    assert database.get_query_stats() == {'enabled': False, 'queries': [], 'acquire': {}, 'slow': []}
+    database.close()
+
+
+def test_debug_endpoint(client, db):
+    _seed(db)
+
+    stats = client.get("/debug/queries?sort=count&limit=2").json()
+    assert stats['enabled'] is True
+    assert len(stats['queries']) == 2
+    assert stats['queries'][0]['count'] >= stats['queries'][1]['count']
+
+    client.delete("/debug/queries")
+    assert client.get("/debug/queries").json()['queries'] == []
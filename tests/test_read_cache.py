@@ -0,0 +1,82 @@
+"""
+Tests for the Database read cache (src/cache.py)
+"""
+
+import pytest
+
+from src.cache import ReadCache
+from src.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(db_path=str(tmp_path / "cache.db"), read_cache_size=8)
+    yield database
+    database.close()
+
+
+def test_repeated_reads_hit_the_cache(db):
+    db.create_indicador(año=2025, indicador="Cacheado", tipo_indicador="Estratégico", area="A")
+
+    first = db.get_all_indicadores(area=["A"])
+    second = db.get_all_indicadores(area=["A"])
+
+    assert first.equals(second)
+    stats = db.get_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_writes_invalidate_cached_reads(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico")
+    assert len(db.get_all_indicadores()) == 1
+
+    db.create_indicador(año=2025, indicador="Dos", tipo_indicador="Estratégico")
+    assert len(db.get_all_indicadores()) == 2
+
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito")
+    assert db.get_indicador_by_id(indicador_id)['avance_porcentaje'] in (0, None)
+    db.registrar_avance_mensual('hito', hito_id, 80, mes="2025-01")
+    db.update_indicador_from_hitos(indicador_id)
+    assert db.get_indicador_by_id(indicador_id)['avance_porcentaje'] == 80
+
+
+def test_unit_of_work_invalidates_on_commit_only(db):
+    db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico")
+    assert db.get_summary_stats()['total'] == 1
+    version = db.get_data_version()
+
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work() as uow:
+            db.create_indicador(año=2025, indicador="Dos", tipo_indicador="Estratégico", uow=uow)
+            raise RuntimeError("boom")
+    assert db.get_data_version() == version
+
+    with db.unit_of_work() as uow:
+        db.create_indicador(año=2025, indicador="Tres", tipo_indicador="Estratégico", uow=uow)
+        # Reads inside the unit of work bypass the cache
+        assert db.get_summary_stats(uow=uow)['total'] == 2
+    assert db.get_data_version()['indicadores'] == version['indicadores'] + 1
+    assert db.get_summary_stats()['total'] == 2
+
+
+def test_cached_values_are_copies(db):
+    db.create_indicador(año=2025, indicador="Uno", tipo_indicador="Estratégico")
+    df = db.get_all_indicadores()
+    df['indicador'] = "modificado"
+
+    assert db.get_all_indicadores()['indicador'].iloc[0] == "Uno"
+
+
+def test_lru_eviction():
+    cache = ReadCache(version=lambda: 0, max_entries=2)
+    cache.get_or_load('a', lambda: 1)
+    cache.get_or_load('b', lambda: 2)
+    cache.get_or_load('a', lambda: 1)   # 'a' becomes most recently used
+    cache.get_or_load('c', lambda: 3)   # evicts 'b'
+
+    assert cache.get_or_load('b', lambda: 'reloaded') == 'reloaded'
+    stats = cache.stats()
+    assert stats['evictions'] == 2
+    assert stats['size'] == 2
+    assert stats['hits'] == 1
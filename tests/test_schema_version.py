@@ -0,0 +1,49 @@
+"""
+Tests for the schema version check in Database.init_db()
+"""
+
+from src.database import Database, SCHEMA_VERSION
+
+
+def _index_names(db):
+    with db._connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row['name'] for row in cursor.fetchall()}
+
+
+def test_schema_version_is_stored(tmp_path):
+    db = Database(db_path=str(tmp_path / "schema.db"))
+
+    with db._connection() as conn:
+        assert db._schema_version(conn.cursor()) == SCHEMA_VERSION
+    db.close()
+
+
+def test_up_to_date_schema_skips_ddl(tmp_path):
+    path = str(tmp_path / "schema.db")
+    first = Database(db_path=path)
+    with first._connection() as conn:
+        conn.execute("DROP INDEX idx_hitos_responsable")
+    first.close()
+
+    # Version matches: the DDL is not re-run, so the dropped index stays missing
+    second = Database(db_path=path)
+    assert 'idx_hitos_responsable' not in _index_names(second)
+
+    second.init_db(force=True)
+    assert 'idx_hitos_responsable' in _index_names(second)
+    second.close()
+
+
+def test_outdated_schema_is_reapplied(tmp_path):
+    path = str(tmp_path / "schema.db")
+    first = Database(db_path=path)
+    with first._connection() as conn:
+        conn.execute("DROP INDEX idx_hitos_responsable")
+        conn.execute("UPDATE schema_version SET version = version - 1")
+    first.close()
+
+    second = Database(db_path=path)
+    assert 'idx_hitos_responsable' in _index_names(second)
+    second.close()
@@ -0,0 +1,129 @@
+"""
+Tests for src/server_timing.py (Server-Timing header and request log)
+"""
+
+import json
+import logging
+import time
+
+
+from src import server_timing
+from src.instrumentation import RequestTiming
+
+
+def _timings(value):
+    """Parse a Server-Timing header into {name: (dur, desc)}"""
+    parsed = {}
+    for metric in value.split(", "):
+        name, *params = metric.split(";")
+        params = dict(param.split("=", 1) for param in params)
+        parsed[name] = (float(params["dur"]), params.get("desc", "").strip('"'))
+    return parsed
+
+
+def test_phases_exclude_database_time():
+    timing = RequestTiming()
+    timing.route_ms, timing.route_db_ms = 10.0, 5.0
+    timing.endpoint_ms, timing.endpoint_db_ms = 7.0, 4.0
+
+    assert timing.phases() == {'app_ms': 3.0, 'validation_ms': 2.0}
+
+
+def test_phases_count_endpoint_serialization_as_validation():
+    timing = RequestTiming()
+    timing.route_ms, timing.route_db_ms = 10.0, 5.0
+    timing.endpoint_ms, timing.endpoint_db_ms = 7.0, 4.0
+    timing.serialize_ms = timing.endpoint_serialize_ms = 1.5
+
+    assert timing.phases() == {'app_ms': 1.5, 'validation_ms': 3.5}
+
+
+class _SlowAdapter:
+    """TypeAdapter stand-in whose encoding takes a known time"""
+
+    def __init__(self, adapter, delay):
+        self.adapter, self.delay = adapter, delay
+
+    def validate_python(self, items):
+        return self.adapter.validate_python(items)
+
+    def dump_json(self, value):
+        time.sleep(self.delay)
+        return self.adapter.dump_json(value)
+
+
+def test_paginated_encoding_is_reported_as_validation(client, db, api_module, monkeypatch):
+    db.create_indicador(año=2025, indicador="Indicador", tipo_indicador="Estratégico")
+    monkeypatch.setattr(api_module, "INDICADOR_LIST", _SlowAdapter(api_module.INDICADOR_LIST, 0.05))
+
+    response = client.get("/api/indicadores")
+
+    assert response.status_code == 200
+    timings = _timings(response.headers["server-timing"])
+    assert timings["validation"][0] >= 50
+    assert timings["app"][0] < 50
+
+
+def test_streamed_encoding_is_logged_as_validation(client, db, api_module, monkeypatch, caplog):
+    db.create_indicador(año=2025, indicador="Indicador", tipo_indicador="Estratégico")
+    monkeypatch.setattr(server_timing.logger, "propagate", True)
+    model = api_module.IndicadorResponse
+
+    class SlowModel:
+        @staticmethod
+        def model_validate(row):
+            time.sleep(0.05)
+            return model.model_validate(row)
+
+    monkeypatch.setattr(api_module, "IndicadorResponse", SlowModel)
+
+    with caplog.at_level(logging.INFO, logger=server_timing.logger.name):
+        response = client.get("/api/indicadores", headers={"Accept": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["validation_ms"] >= 50
+    assert line["app_ms"] < 50
+
+
+def test_header_reports_queries_and_phases(client, db):
+    indicador_id = db.create_indicador(
+        año=2025, indicador="Indicador", tipo_indicador="Estratégico", area="Área",
+        responsable="Responsable", tiene_hitos=True
+    )
+
+    response = client.get(f"/api/indicadores/{indicador_id}")
+
+    assert response.status_code == 200
+    timings = _timings(response.headers["server-timing"])
+    assert set(timings) == {"total", "db", "sql", "pool", "app", "validation"}
+    assert timings["db"][1].endswith(" queries") and int(timings["db"][1].split()[0]) >= 1
+    assert timings["pool"][1] == "2 connections"
+    assert timings["total"][0] >= timings["db"][0] >= timings["sql"][0]
+    assert response.headers["timing-allow-origin"] == "*"
+
+
+def test_log_line_includes_streamed_queries(client, db, monkeypatch, caplog):
+    db.create_indicador(
+        año=2025, indicador="Indicador", tipo_indicador="Estratégico", area="Área",
+        responsable="Responsable", tiene_hitos=True
+    )
+    monkeypatch.setattr(server_timing.logger, "propagate", True)
+
+    with caplog.at_level(logging.INFO, logger=server_timing.logger.name):
+        response = client.get("/api/indicadores", headers={"Accept": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    header = _timings(response.headers["server-timing"])
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["route"] == "/api/indicadores"
+    assert line["status"] == 200
+    # The rows are fetched while streaming, after the header was sent
+    assert line["queries"] > int(header["db"][1].split()[0])
+
+
+def test_unmatched_paths_have_no_route_phases(client):
+    response = client.get("/no-existe")
+
+    assert response.status_code == 404
+    assert "app" not in _timings(response.headers["server-timing"])
@@ -0,0 +1,84 @@
+"""
+Tests for the SQLite connection profile and the single-writer queue
+"""
+
+import threading
+
+import pytest
+
+from src.database import Database
+
+
+def _pragma(db, name):
+    conn = db.get_connection(use_dict_cursor=False)
+    try:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_profile_is_applied_to_every_connection(db):
+    assert _pragma(db, 'journal_mode') == 'wal'
+    assert _pragma(db, 'synchronous') == 1  # NORMAL
+    assert _pragma(db, 'foreign_keys') == 1
+    assert _pragma(db, 'busy_timeout') == 5000
+    assert _pragma(db, 'temp_store') == 2  # MEMORY
+
+
+def test_profile_can_be_overridden(tmp_path, monkeypatch):
+    monkeypatch.setenv('SQLITE_SYNCHRONOUS', 'FULL')
+    database = Database(db_path=str(tmp_path / "custom.db"), sqlite_pragmas={'busy_timeout': 250, 'mmap_size': None})
+
+    assert _pragma(database, 'synchronous') == 2  # FULL
+    assert _pragma(database, 'busy_timeout') == 250
+    assert 'mmap_size' not in database.sqlite_pragmas
+    database.close()
+
+
+def test_foreign_keys_cascade_deletes(db):
+    indicador_id = db.create_indicador(año=2025, indicador="FK", tipo_indicador="Estratégico")
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito")
+    db.create_actividad(hito_id=hito_id, descripcion_actividad="Actividad")
+
+    db.delete_indicador(indicador_id)
+
+    assert db.get_all_hitos()['items'].empty
+    assert db.get_all_actividades()['items'].empty
+
+
+def test_writer_lock_is_released_by_commit_and_rollback(db):
+    with db.unit_of_work() as uow:
+        db.create_indicador(año=2025, indicador="Uno", tipo_indicador="E", uow=uow)
+        assert db._write_lock.locked()
+        uow.commit()
+        assert not db._write_lock.locked()
+
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work() as uow:
+            db.create_indicador(año=2025, indicador="Dos", tipo_indicador="E", uow=uow)
+            raise RuntimeError("boom")
+
+    assert not db._write_lock.locked()
+    assert len(db.get_all_indicadores()) == 1
+
+
+def test_concurrent_writers_are_serialized_instead_of_failing(db):
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(25):
+                with db.unit_of_work() as uow:
+                    indicador_id = db.create_indicador(año=2025, indicador=f"W{n}-{i}", tipo_indicador="E", uow=uow)
+                    db.create_hito(indicador_id=indicador_id, nombre="Hito", uow=uow)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(db.get_all_indicadores()) == 200
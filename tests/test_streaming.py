@@ -0,0 +1,78 @@
+"""
+Tests for the streaming readers and the NDJSON list endpoints
+"""
+
+import json
+
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def _seed(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Stream", tipo_indicador="Estratégico")
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito", orden=1)
+    for mes, avance in (("2025-01", 10), ("2025-02", 30), ("2025-03", 60)):
+        db.registrar_avance_mensual('hito', hito_id, avance, mes=mes)
+    return indicador_id, hito_id
+
+
+def test_stream_yields_every_row_in_small_batches(db):
+    _, hito_id = _seed(db)
+
+    rows = list(db.stream_avance_mensual(batch_size=2, entidad='hito', id_entidad=hito_id))
+
+    assert [r['mes'] for r in rows] == ["2025-01", "2025-02", "2025-03"]
+    assert db.get_pool_stats()['in_use'] == 0
+
+
+def test_abandoned_stream_returns_its_connection(db):
+    _seed(db)
+
+    stream = db.stream_avance_mensual(batch_size=1)
+    next(stream)
+    assert db.get_pool_stats()['in_use'] == 1
+    stream.close()
+
+    assert db.get_pool_stats()['in_use'] == 0
+
+
+def test_stream_applies_the_list_filters(db):
+    indicador_id, _ = _seed(db)
+    db.create_indicador(año=2026, indicador="Otro", tipo_indicador="Estratégico")
+
+    assert [r['id'] for r in db.stream_indicadores(año=2025)] == [indicador_id]
+    assert [r['mes'] for r in db.stream_avance_mensual(mes_desde="2025-02")] == ["2025-02", "2025-03"]
+
+
+def test_ndjson_endpoint_streams_one_row_per_line(client, db):
+    _, hito_id = _seed(db)
+
+    response = client.get("/api/avance-mensual", headers=NDJSON)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)['avance_reportado'] for line in lines] == [10, 30, 60]
+
+    historico = client.get(f"/api/avance-mensual/hito/{hito_id}/historico", headers=NDJSON)
+    assert len(historico.text.splitlines()) == 3
+
+
+def test_full_history_endpoint_paginates_as_json(client, db):
+    _seed(db)
+
+    first = client.get("/api/avance-mensual?limit=2")
+    assert [r['mes'] for r in first.json()] == ["2025-01", "2025-02"]
+
+    rest = client.get("/api/avance-mensual", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+    assert [r['mes'] for r in rest.json()] == ["2025-03"]
+
+
+def test_json_and_ndjson_have_different_etags(client, db):
+    _seed(db)
+
+    as_json = client.get("/api/indicadores")
+    as_ndjson = client.get("/api/indicadores", headers=NDJSON)
+
+    assert as_json.headers["ETag"] != as_ndjson.headers["ETag"]
+    assert client.get("/api/indicadores", headers={**NDJSON, "If-None-Match": as_ndjson.headers["ETag"]}).status_code == 304
@@ -0,0 +1,78 @@
+"""
+Tests for the denormalized ultimo_avance columns on hitos and actividades
+"""
+
+import sqlite3
+
+
+from src.database import Database
+
+
+def _seed(db):
+    indicador_id = db.create_indicador(año=2025, indicador="Ind", tipo_indicador="Regular", tiene_hitos=True)
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito", responsable="Ana")
+    actividad_id = db.create_actividad(hito_id=hito_id, descripcion_actividad="Act", responsable="Ana")
+    return indicador_id, hito_id, actividad_id
+
+
+def test_registrar_updates_ultimo_avance(db):
+    indicador_id, hito_id, actividad_id = _seed(db)
+
+    db.registrar_avance_mensual('hito', hito_id, 20, mes="2025-01")
+    db.registrar_avance_mensual('hito', hito_id, 60, mes="2025-03")
+    # A late report for an older month must not replace the latest one
+    db.registrar_avance_mensual('hito', hito_id, 40, mes="2025-02")
+    db.registrar_avance_mensual('actividad', actividad_id, 75, mes="2025-02")
+
+    hitos = db.get_hitos_by_responsable("Ana")
+    actividades = db.get_actividades_by_hito(hito_id)
+
+    assert hitos.iloc[0]['ultimo_avance_reportado'] == 60
+    assert hitos.iloc[0]['ultimo_avance_mes'] == "2025-03"
+    assert actividades.iloc[0]['ultimo_avance_reportado'] == 75
+
+    db.update_indicador_from_hitos(indicador_id)
+    assert db.get_indicador_by_id(indicador_id)['avance_porcentaje'] == 60
+
+
+def test_rebuild_recomputes_from_history(db):
+    _, hito_id, actividad_id = _seed(db)
+    db.registrar_avance_mensual('hito', hito_id, 30, mes="2025-01")
+    db.registrar_avance_mensual('actividad', actividad_id, 50, mes="2025-04")
+
+    conn = db.get_connection()
+    conn.execute("UPDATE hitos SET ultimo_avance = NULL, ultimo_avance_mes = NULL")
+    conn.execute("UPDATE actividades SET ultimo_avance = 99")
+    conn.commit()
+    conn.close()
+
+    assert db.rebuild_ultimo_avance() == {'hitos': 1, 'actividades': 1}
+    assert db.get_hitos_by_responsable("Ana").iloc[0]['ultimo_avance_reportado'] == 30
+    assert db.get_actividades_by_responsable("Ana").iloc[0]['ultimo_avance_reportado'] == 50
+
+
+def test_init_db_adds_and_backfills_columns(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.executescript("""
+        CREATE TABLE hitos (id INTEGER PRIMARY KEY AUTOINCREMENT, indicador_id INTEGER NOT NULL,
+                            nombre TEXT NOT NULL, avance_porcentaje INTEGER DEFAULT 0, estado TEXT,
+                            orden INTEGER, responsable TEXT);
+        CREATE TABLE actividades (id INTEGER PRIMARY KEY AUTOINCREMENT, hito_id INTEGER NOT NULL,
+                                  descripcion_actividad TEXT NOT NULL, responsable TEXT,
+                                  estado_actividad TEXT);
+        CREATE TABLE avance_mensual (id INTEGER PRIMARY KEY AUTOINCREMENT, entidad TEXT NOT NULL,
+                                     id_entidad INTEGER NOT NULL, mes TEXT NOT NULL,
+                                     avance_reportado INTEGER NOT NULL, fecha_reporte DATE, usuario TEXT,
+                                     created_at TIMESTAMP, UNIQUE(entidad, id_entidad, mes));
+        INSERT INTO hitos (indicador_id, nombre) VALUES (1, 'Legacy');
+        INSERT INTO avance_mensual (entidad, id_entidad, mes, avance_reportado) VALUES ('hito', 1, '2024-12', 80);
+    """)
+    legacy.close()
+
+    db = Database(db_path=path)
+    conn = db.get_connection()
+    row = conn.execute("SELECT ultimo_avance, ultimo_avance_mes FROM hitos WHERE id = 1").fetchone()
+    conn.close()
+
+    assert (row['ultimo_avance'], row['ultimo_avance_mes']) == (80, '2024-12')
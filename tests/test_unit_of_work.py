@@ -0,0 +1,58 @@
+"""
+Tests for Database.unit_of_work()
+"""
+
+import pytest
+
+
+def _seed(db, uow=None):
+    indicador_id = db.create_indicador(
+        año=2025, indicador="Indicador UoW", tipo_indicador="Estratégico",
+        tiene_hitos=True, uow=uow
+    )
+    hito_id = db.create_hito(indicador_id=indicador_id, nombre="Hito 1", responsable="Ana", uow=uow)
+    return indicador_id, hito_id
+
+
+def test_unit_of_work_commits_on_success(db):
+    with db.unit_of_work() as uow:
+        indicador_id, _ = _seed(db, uow)
+        # Visible inside the same unit of work before commit
+        assert db.get_indicador_by_id(indicador_id, uow=uow) is not None
+
+    assert db.get_indicador_by_id(indicador_id) is not None
+
+
+def test_unit_of_work_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work() as uow:
+            indicador_id, _ = _seed(db, uow)
+            raise RuntimeError("boom")
+
+    assert db.get_indicador_by_id(indicador_id) is None
+
+
+def test_unit_of_work_uses_a_single_connection(db):
+    indicador_id, hito_id = _seed(db)
+    checkouts_before = db.get_pool_stats()['checkouts']
+
+    with db.unit_of_work() as uow:
+        db.registrar_avance_mensual('hito', hito_id, 40, usuario="Ana", mes="2025-01", uow=uow)
+        db.update_indicador_from_hitos(indicador_id, uow=uow)
+        db.get_indicador_by_id(indicador_id, uow=uow)
+
+    assert db.get_pool_stats()['checkouts'] - checkouts_before == 1
+    assert db.get_indicador_by_id(indicador_id)['avance_porcentaje'] == 40
+
+
+def test_duplicate_report_keeps_earlier_work(db):
+    indicador_id, hito_id = _seed(db)
+    db.registrar_avance_mensual('hito', hito_id, 10, mes="2025-01")
+
+    with db.unit_of_work() as uow:
+        otro_hito = db.create_hito(indicador_id=indicador_id, nombre="Hito 2", uow=uow)
+        assert db.registrar_avance_mensual('hito', hito_id, 50, mes="2025-01", uow=uow) is False
+        assert db.registrar_avance_mensual('hito', otro_hito, 50, mes="2025-01", uow=uow) is True
+
+    assert len(db.get_hitos_by_indicador(indicador_id)) == 2
+    assert db.get_avance_mensual_actual('hito', otro_hito)['avance_reportado'] == 50